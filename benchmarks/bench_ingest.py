@@ -0,0 +1,143 @@
+"""Benchmark product ingest: legacy dict -> Product re-validation vs. single-pass conversion.
+
+Usage:
+    python benchmarks/bench_ingest.py [--products 10000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.core.product import Product
+from utils.services.data_loader import car_data_loader
+
+BRANDS = {1: 'Tesla', 2: 'BYD', 3: 'Hyundai', 4: 'Kia', 5: 'Nissan'}
+CATEGORIES = {1: 'Sedan', 2: 'SUV', 3: 'Hatchback'}
+
+def generate_products(count: int) -> list:
+    """Generate raw /Product rows shaped like the inventory API response"""
+    rng = random.Random(42)
+    return [
+        {
+            'id': i,
+            'brandId': rng.choice(list(BRANDS)),
+            'categoryId': rng.choice(list(CATEGORIES)),
+            'model': f"Model {rng.choice(['X', 'Y', 'Atto 3', 'Ioniq 5', 'Leaf'])} {rng.randint(2015, 2025)}",
+            'price': round(rng.uniform(8000, 90000), 2),
+            'eCurrencyType': 'USD',
+            'description': 'Well kept EV with full service history. ' * rng.randint(1, 4),
+            'image': f"products/{i}.jpg",
+            'gallery': f"products/{i}_1.jpg, products/{i}_2.jpg,",
+            'location': rng.choice(['Phnom Penh', 'Siem Reap', 'Battambang']),
+            'color': rng.choice(['Red', 'White', 'Black', 'Blue']),
+            'condition': rng.choice(['New', 'Used']),
+            'phoneNumber': '012 345 678',
+            'isFeatured': rng.random() < 0.1,
+            'sku': f"SKU-{i:06d}"
+        }
+        for i in range(count)
+    ]
+
+def legacy_convert(loader, product: dict) -> dict:
+    """The pre-single-pass conversion: build an intermediate dict with an ISO timestamp"""
+    brand_id = product.get('brandId') or product.get('brand_id')
+    category_id = product.get('categoryId') or product.get('category_id')
+    return {
+        'id': product.get('id', hash(str(product)) % 100000),
+        'user_id': None,
+        'brand': loader.brands_cache.get(brand_id, product.get('brand', 'Unknown')),
+        'model': product.get('model', product.get('title', 'Unknown Model')),
+        'year': loader._extract_year(product.get('model', '')),
+        'price': float(product.get('price', 0)),
+        'currency': product.get('eCurrencyType', 'USD'),
+        'description': loader._get_description(product),
+        'image_url': loader._get_dynamic_image_url(product.get('image')),
+        'gallery': loader._process_gallery(product.get('gallery')),
+        'location': product.get('location', 'Phnom Penh'),
+        'color': product.get('color', 'Unknown'),
+        'condition': product.get('condition', 'Good'),
+        'phone_number': product.get('phoneNumber', '097 80 24 246'),
+        'category': loader.categories_cache.get(category_id, product.get('category', 'Sedan')),
+        'is_featured': product.get('isFeatured', False),
+        'sku': product.get('sku', ''),
+        'status': 'available',
+        'created_at': datetime.now().isoformat(),
+        'source': 'api',
+        'brand_id': brand_id,
+        'category_id': category_id
+    }
+
+def legacy_ingest(loader, raw_products: list) -> list:
+    """Legacy two-pass ingest: dicts first, then re-validation into Product"""
+    listings = [legacy_convert(loader, product) for product in raw_products]
+    built = []
+    for listing in listings:
+        try:
+            built.append(Product(
+                id=listing["id"],
+                user_id=listing.get("user_id"),
+                brand=listing["brand"],
+                model=listing["model"],
+                year=listing.get("year"),
+                price=Decimal(str(listing["price"])),
+                currency=listing.get("currency", "USD"),
+                description=listing.get("description"),
+                image_url=listing.get("image_url"),
+                gallery=listing.get("gallery", []),
+                location=listing.get("location"),
+                color=listing.get("color"),
+                condition=listing.get("condition"),
+                phone_number=listing.get("phone_number"),
+                category=listing.get("category"),
+                is_featured=listing.get("is_featured", False),
+                sku=listing.get("sku"),
+                status=listing.get("status", "available"),
+                created_at=datetime.fromisoformat(listing["created_at"]),
+                source=listing.get("source")
+            ))
+        except Exception:
+            pass
+    return built
+
+def single_pass_ingest(loader, raw_products: list) -> list:
+    """Current ingest: raw rows validated straight into Product"""
+    loader._reset_ingest_stats()
+    converted = (loader._convert_product_to_car(product) for product in raw_products)
+    return [car for car in converted if car is not None]
+
+def best_of(func, repeat: int) -> float:
+    """Best wall time in seconds over `repeat` runs"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    car_data_loader.brands_cache = BRANDS
+    car_data_loader.categories_cache = CATEGORIES
+    car_data_loader._staged_lookups = (BRANDS, CATEGORIES)
+    raw_products = generate_products(args.products)
+
+    legacy = best_of(lambda: legacy_ingest(car_data_loader, raw_products), args.repeat)
+    single_pass = best_of(lambda: single_pass_ingest(car_data_loader, raw_products), args.repeat)
+    scale = 10000 / args.products
+
+    print(f"Products: {args.products} (best of {args.repeat})")
+    print(f"  legacy two-pass : {legacy * scale * 1000:8.1f} ms per 10k products")
+    print(f"  single-pass     : {single_pass * scale * 1000:8.1f} ms per 10k products")
+    print(f"  speedup         : {legacy / single_pass:8.2f}x")
+
+if __name__ == '__main__':
+    main()
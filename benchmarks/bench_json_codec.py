@@ -0,0 +1,112 @@
+"""Benchmark JSON decoding of API-sized payloads: stdlib json vs. the configured fast codec.
+
+Usage:
+    python benchmarks/bench_json_codec.py [--products 10000] [--stations 500] [--garages 500] [--repeat 5]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_ingest import generate_products
+from utils.services.json_codec import STDLIB_CODEC, ORJSON_CODEC
+from utils.services.json_stream import iter_json_array_items
+
+def generate_stations(count: int) -> list:
+    """Raw /ChargingStation rows"""
+    rng = random.Random(7)
+    return [
+        {
+            'id': i,
+            'name': f"EV Station {i}",
+            'type': rng.choice(['DC Fast', 'AC Level 2']),
+            'capacity': f"{rng.randint(2, 12)} chargers",
+            'powerValue': rng.choice([22, 60, 120, 180]),
+            'pricePerKwh': round(rng.uniform(0.2, 0.5), 2),
+            'phoneNumber': '012 345 678',
+            'rating': round(rng.uniform(3, 5), 1),
+            'availability': rng.random() < 0.8,
+            'location': rng.choice(['Phnom Penh', 'Siem Reap', 'Battambang']),
+            'mapLink': f"https://www.google.com/maps/@11.{rng.randint(1000, 9999)},104.{rng.randint(1000, 9999)},17z",
+            'connectorTypes': rng.sample(['CCS2', 'Type 2', 'CHAdeMO', 'GB/T'], 2),
+            'imageUrl': f"stations/{i}.jpg"
+        }
+        for i in range(count)
+    ]
+
+def generate_garages(count: int) -> list:
+    """Raw /Garage rows"""
+    rng = random.Random(11)
+    return [
+        {
+            'id': i,
+            'garageName': f"EV Garage {i}",
+            'location': rng.choice(['Phnom Penh', 'Siem Reap', 'Battambang']),
+            'rating': round(rng.uniform(3, 5), 1),
+            'phoneNumber': '012 345 678',
+            'garageService': rng.choice(['Battery Service', 'Tyres', 'General Repair']),
+            'imageUrl': f"garages/{i}.jpg",
+            'priceRange': '$$',
+            'contactInfo': 'Telegram @garage',
+            'operatingHours': '08:00 - 18:00',
+            'mapLink': f"https://www.google.com/maps/@11.{rng.randint(1000, 9999)},104.{rng.randint(1000, 9999)},17z"
+        }
+        for i in range(count)
+    ]
+
+def best_of(func, repeat: int) -> float:
+    """Best wall time in seconds over `repeat` runs"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def stream_decode(body: bytes) -> list:
+    """The stdlib incremental path used for /Product when no fast codec is installed"""
+    async def chunks():
+        for offset in range(0, len(body), 64 * 1024):
+            yield body[offset:offset + 64 * 1024]
+
+    async def collect():
+        return [item async for item in iter_json_array_items(chunks(), 'data')]
+
+    return asyncio.run(collect())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, default=10000)
+    parser.add_argument('--stations', type=int, default=500)
+    parser.add_argument('--garages', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    payloads = {
+        '/Product': generate_products(args.products),
+        '/ChargingStation': generate_stations(args.stations),
+        '/Garage': generate_garages(args.garages),
+    }
+
+    if ORJSON_CODEC is None:
+        print("orjson is not installed; only the stdlib timings are shown")
+
+    print(f"{'endpoint':<18} {'size':>9} {'stdlib':>10} {'stdlib stream':>14} {'orjson':>10} {'speedup':>8}")
+    for endpoint, rows in payloads.items():
+        body = json.dumps({'data': rows, 'totalItems': len(rows)}).encode('utf-8')
+        stdlib = best_of(lambda: STDLIB_CODEC.loads(body), args.repeat)
+        streamed = best_of(lambda: stream_decode(body), args.repeat) if endpoint == '/Product' else None
+        fast = best_of(lambda: ORJSON_CODEC.loads(body), args.repeat) if ORJSON_CODEC else None
+
+        streamed_text = f"{streamed * 1000:11.1f}ms" if streamed is not None else f"{'-':>13}"
+        fast_text = f"{fast * 1000:8.1f}ms" if fast is not None else f"{'-':>10}"
+        speedup_text = f"{stdlib / fast:7.1f}x" if fast else f"{'-':>8}"
+        print(f"{endpoint:<18} {len(body) / 1024:7.0f}KB {stdlib * 1000:8.1f}ms {streamed_text}  {fast_text} {speedup_text}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""Fail if service calls used by handlers do blocking socket I/O on the event loop thread.
+
+Starts a small in-process API stub, points the services at it and runs each call
+with the blocking I/O guard in 'raise' mode. Exits with status 1 on any violation.
+
+Usage:
+    python benchmarks/check_blocking_io.py
+"""
+import asyncio
+import os
+import socket
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('TELEGRAM_TOKEN', 'blocking-io-check')
+
+from aiohttp import web
+
+from utils.config import settings
+from utils.services.api_client import api_client
+from utils.services.blocking_io import blocking_io_guard, BlockingCallOnLoopError
+from utils.services.garage_service import GarageService
+from utils.services.charging_station_service import ChargingStationService
+from utils.services.accessory_service import AccessoryService
+from utils.services.user_api_service import user_api_service
+from utils.ui.language import language_handler
+
+def build_stub() -> web.Application:
+    """Minimal inventory API: list endpoints plus a fake short map link that redirects"""
+    garages = [{'id': 1, 'garageName': 'Stub Garage', 'location': 'Phnom Penh', 'mapLink': '/maps.app.goo.gl/garage'}]
+    stations = [{'id': 1, 'name': 'Stub Station', 'location': 'Phnom Penh', 'mapLink': '/maps.app.goo.gl/station'}]
+    accessories = [{'id': 1, 'name': 'Stub Charger', 'price': 99, 'category': 'Chargers'}]
+
+    def listing(items):
+        async def handler(request):
+            # Map links point back at this stub so the short-link expansion stays local
+            origin = str(request.url.origin())
+            data = [dict(item, mapLink=f"{origin}{item['mapLink']}") if 'mapLink' in item else item for item in items]
+            return web.json_response({'data': data, 'totalItems': len(data)})
+        return handler
+
+    async def short_link(request):
+        raise web.HTTPFound('/maps/place/@11.5564,104.9282,17z')
+
+    async def place(request):
+        return web.Response(text='ok')
+
+    async def telegram_user(request):
+        return web.json_response({'telegramId': int(request.match_info['telegram_id']), 'language': 'en'})
+
+    app = web.Application()
+    app.add_routes([
+        web.get('/Garage', listing(garages)),
+        web.get('/ChargingStation', listing(stations)),
+        web.get('/Accessory', listing(accessories)),
+        web.route('*', '/maps.app.goo.gl/{code}', short_link),
+        web.route('*', '/maps/place/{rest:.*}', place),
+        web.get('/User/GetTelegramUser/{telegram_id}', telegram_user),
+    ])
+    return app
+
+async def raw_blocking_call(base_url: str) -> None:
+    """Deliberately blocking call, used to prove the guard catches what `requests` would do"""
+    host, port = base_url.split('//')[1].split(':')
+    with socket.create_connection((host, int(port)), timeout=5):
+        pass
+
+async def run_checks(base_url: str) -> int:
+    garage_service = GarageService(f"{base_url}/Garage")
+    station_service = ChargingStationService(f"{base_url}/ChargingStation")
+    accessory_service = AccessoryService()
+    accessory_service.base_url = base_url
+    user_api_service.api_base_url = base_url
+    settings.API_BASE_URL = base_url
+
+    checks = [
+        ('garage fetch_all_garages', garage_service.fetch_all_garages),
+        ('garage get_total_pages', garage_service.get_total_pages),
+        ('garage get_nearby_garages', lambda: garage_service.get_nearby_garages(11.55, 104.92)),
+        ('station fetch_all_stations', station_service.fetch_all_stations),
+        ('station get_total_pages', station_service.get_total_pages),
+        ('station short map link', lambda: station_service.extract_coordinates_from_map_link(f"{base_url}/maps.app.goo.gl/station")),
+        ('accessory fetch_all_accessories', accessory_service.fetch_all_accessories),
+        ('accessory get_total_pages', accessory_service.get_total_pages),
+        ('user api get_user', lambda: user_api_service.get_user(424242)),
+        ('language pre-handler', lambda: language_handler.resolve_user_language(434343)),
+        ('language lookup (get_text)', lambda: asyncio.sleep(0, language_handler.get_text('back_to_menu', 424242))),
+    ]
+
+    failures = 0
+    await api_client.start()
+    try:
+        # Sanity check: the guard itself must catch a plain blocking connect
+        with blocking_io_guard('raise'):
+            try:
+                await raw_blocking_call(base_url)
+                print("✗ guard self-test: blocking connect was not detected")
+                failures += 1
+            except BlockingCallOnLoopError:
+                print("✓ guard self-test: blocking connect detected")
+
+        for name, check in checks:
+            with blocking_io_guard('raise') as found:
+                try:
+                    await check()
+                except BlockingCallOnLoopError:
+                    pass
+            if found:
+                failures += 1
+                print(f"✗ {name}: {found[0]}")
+            else:
+                print(f"✓ {name}")
+    finally:
+        await api_client.close()
+
+    return failures
+
+async def main() -> int:
+    runner = web.AppRunner(build_stub(), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    try:
+        failures = await run_checks(f"http://127.0.0.1:{port}")
+    finally:
+        await runner.cleanup()
+
+    print(f"\n{failures} blocking call(s) found" if failures else "\nNo blocking calls on the event loop")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,141 @@
+"""Count the user-endpoint requests behind common user flows and fail on regressions.
+
+Runs the stub inventory API in-process and checks, per flow, which requests
+get_or_create_user and the language pre-handler send:
+
+- a new user's first updates: one lookup (the 404 is remembered) and one create
+- a new user who picks a language on /start: created in that language
+- a create that races another worker: the 409 carries the user, so no follow-up GET
+- the same race against an API whose 409 has no body: exactly one follow-up GET
+- a returning user whose stored language differs from Telegram's: no PUT
+
+Usage:
+    python benchmarks/check_user_roundtrips.py
+"""
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('TELEGRAM_TOKEN', 'user-roundtrip-check')
+
+from aiohttp import web
+
+from benchmarks.stub_api import StubInventoryApi, parse_args
+from utils.services import update_scope
+from utils.services.api_client import api_client
+from utils.services.profile_store import profile_store
+from utils.services.profile_writer import profile_writer
+from utils.services.user_api_service import user_api_service
+from utils.ui.language import language_handler
+from handlers.base import get_or_create_user
+from handlers.settings.settings import handle_initial_language_selection
+
+def telegram_user(telegram_id: int, language_code: str = 'en') -> SimpleNamespace:
+    return SimpleNamespace(id=telegram_id, first_name='Check', last_name='', username='', language_code=language_code)
+
+def user_requests(stub: StubInventoryApi) -> dict:
+    return {name: count for name, count in stub.hits.items() if name.endswith(' User')}
+
+async def new_user(stub: StubInventoryApi) -> dict:
+    # Two updates before /start: the pre-handler looks the user up for each
+    for update_id in (1, 2):
+        update_scope.begin_update_scope(update_id)
+        await language_handler.resolve_user_language(9001)
+    await user_api_service.get_or_create_user(telegram_user(9001))
+    return {'GET User': 1, 'POST User': 1}
+
+async def new_user_picks_language(stub: StubInventoryApi) -> dict:
+    # /start finds no user and offers the language choice; the user picks Khmer
+    user = telegram_user(9005, 'en')
+    update_scope.begin_update_scope(7)
+    await language_handler.resolve_user_language(9005)
+    await start_handler_lookup(9005)
+
+    async def noop(*args, **kwargs):
+        return None
+    message = SimpleNamespace(edit_text=noop, reply_text=noop)
+    query = SimpleNamespace(data='initial_lang_kh', answer=noop, message=message)
+    update_scope.begin_update_scope(8)
+    await language_handler.resolve_user_language(9005)
+    await handle_initial_language_selection(SimpleNamespace(callback_query=query, effective_user=user), None)
+
+    # Then opens the main menu, which creates the user
+    update_scope.begin_update_scope(9)
+    await language_handler.resolve_user_language(9005)
+    await get_or_create_user(user)
+    await profile_writer.flush()
+    assert language_handler.get_user_language(9005) == 'kh', 'bot language'
+    assert stub.users['9005']['language'] == 'kh', 'stored language'
+    return {'GET User': 1, 'POST User': 1}
+
+async def start_handler_lookup(telegram_id: int) -> None:
+    """What /start does for an unknown user before offering the language choice"""
+    if profile_store.get_complete(telegram_id) is None:
+        await user_api_service.get_user(telegram_id)
+
+async def create_race(stub: StubInventoryApi) -> dict:
+    # Looked up (404) just before another worker created the user
+    update_scope.begin_update_scope(3)
+    await user_api_service.get_user(9002)
+    stub.users['9002'] = {'telegramId': '9002', 'firstName': 'Check', 'language': 'kh'}
+    profile = await user_api_service.get_or_create_user(telegram_user(9002))
+    assert profile['language'] == 'kh', profile
+    return {'GET User': 1, 'POST User': 1}
+
+async def create_race_without_body(stub: StubInventoryApi) -> dict:
+    stub.conflict_body = False
+    update_scope.begin_update_scope(4)
+    await user_api_service.get_user(9003)
+    stub.users['9003'] = {'telegramId': '9003', 'firstName': 'Check', 'language': 'kh'}
+    await user_api_service.get_or_create_user(telegram_user(9003))
+    stub.conflict_body = True
+    return {'GET User': 2, 'POST User': 1}
+
+async def returning_user(stub: StubInventoryApi) -> dict:
+    # Chose Khmer in the bot while Telegram stays English; the profile then expires
+    stub.users['9004'] = {'telegramId': '9004', 'firstName': 'Check', 'language': 'kh'}
+    update_scope.begin_update_scope(5)
+    await user_api_service.get_or_create_user(telegram_user(9004))
+    profile_store.forget(9004)
+    update_scope.begin_update_scope(6)
+    profile = await user_api_service.get_or_create_user(telegram_user(9004))
+    await profile_writer.close()
+    assert profile['language'] == 'kh', profile
+    return {'GET User': 2}
+
+async def main() -> int:
+    stub = StubInventoryApi(parse_args(['--products', '1', '--conflict-body']))
+    app = web.Application(middlewares=[stub.middleware])
+    app.add_routes(stub.routes())
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    user_api_service.api_base_url = f"http://127.0.0.1:{port}"
+
+    failures = 0
+    await api_client.start()
+    try:
+        for check in (new_user, new_user_picks_language, create_race, create_race_without_body, returning_user):
+            stub.hits.clear()
+            try:
+                expected = await check(stub)
+                sent = user_requests(stub)
+                ok = sent == expected
+                detail = sent if ok else f"sent {sent}, expected {expected}"
+            except AssertionError as e:
+                ok, detail = False, f"wrong profile: {e}"
+            failures += not ok
+            print(f"{'✓' if ok else '✗'} {check.__name__}: {detail}")
+    finally:
+        await api_client.close()
+        await runner.cleanup()
+
+    print(f"\n{failures} check(s) failed" if failures else "\nUser round-trips as expected")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
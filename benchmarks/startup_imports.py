@@ -0,0 +1,52 @@
+"""Break down bot import time by module using `python -X importtime`.
+
+Usage:
+    python benchmarks/startup_imports.py [--top 25] [--module main]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def collect_import_times(module: str) -> list:
+    """Return (cumulative_us, self_us, module_name) rows for a fresh import of `module`"""
+    env = dict(os.environ, TELEGRAM_TOKEN=os.getenv('TELEGRAM_TOKEN', 'benchmark'))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--top', type=int, default=25)
+    parser.add_argument('--module', default='main')
+    args = parser.parse_args()
+
+    rows = collect_import_times(args.module)
+    if not rows:
+        print(f"No import timings collected for {args.module}")
+        return
+
+    total_us = max(cumulative for cumulative, _, _ in rows)
+    print(f"Importing {args.module}: {total_us / 1000:.1f} ms total, {len(rows)} modules")
+    print(f"{'cumulative':>12} {'self':>10}  module")
+    for cumulative, self_us, name in sorted(rows, reverse=True)[:args.top]:
+        print(f"{cumulative / 1000:10.1f}ms {self_us / 1000:8.1f}ms {name}")
+
+    project_modules = [row for row in rows if row[2].strip().split('.')[0] in ('handlers', 'models', 'utils')]
+    print(f"\nProject modules imported at startup: {len(project_modules)}")
+    for cumulative, self_us, name in sorted(project_modules, reverse=True):
+        print(f"{cumulative / 1000:10.1f}ms {self_us / 1000:8.1f}ms {name}")
+
+if __name__ == '__main__':
+    main()
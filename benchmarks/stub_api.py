@@ -0,0 +1,274 @@
+"""Local stand-in for the inventory API and the image bucket, for benchmarks and offline runs.
+
+Serves generated products, categories, brands, garages, charging stations and
+accessories, the Telegram user and favorites endpoints (kept in memory), and PNG
+image bytes for any path under /img/. Latency and payload sizes are configurable.
+List endpoints answer with an ETag and honour If-None-Match.
+
+Usage:
+    python benchmarks/stub_api.py [--port 8080] [--products 2000] [--latency 50] [--jitter 20]
+
+Then run the bot or a benchmark against it:
+    API_BASE_URL=http://127.0.0.1:8080 API_BASE_URL_IMG=http://127.0.0.1:8080/img python main.py
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import struct
+import sys
+import zlib
+from collections import Counter
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import web
+
+from benchmarks.bench_ingest import BRANDS, CATEGORIES, generate_products
+from benchmarks.bench_json_codec import generate_garages, generate_stations
+from utils.services.json_codec import json_codec
+
+ACCESSORY_CATEGORIES = ['Chargers', 'Cables', 'Floor Mats', 'Dash Cams', 'Tyres']
+
+def generate_accessories(count: int) -> list:
+    """Raw /Accessory rows"""
+    rng = random.Random(13)
+    return [
+        {
+            'id': i,
+            'name': f"{rng.choice(['Portable', 'Wall', 'Premium', 'Compact'])} {rng.choice(ACCESSORY_CATEGORIES)[:-1]} {i}",
+            'description': 'Compatible with most EV models. ' * rng.randint(1, 3),
+            'image': f"accessories/{i}.jpg",
+            'price': round(rng.uniform(10, 900), 2),
+            'phoneNumber': '012 345 678',
+            'rating': round(rng.uniform(3, 5), 1),
+            'reviewCount': rng.randint(0, 250),
+            'weight': f"{rng.uniform(0.2, 12):.1f} kg",
+            'color': rng.choice(['Black', 'White', 'Grey']),
+            'categoryId': rng.randint(1, len(ACCESSORY_CATEGORIES)),
+            'category': rng.choice(ACCESSORY_CATEGORIES),
+            'brandId': rng.choice(list(BRANDS)),
+            'brand': rng.choice(list(BRANDS.values())),
+            'location': rng.choice(['Phnom Penh', 'Siem Reap', 'Battambang']),
+            'sku': f"ACC-{i:05d}",
+            'compatibleModels': rng.sample(['Model 3', 'Model Y', 'Atto 3', 'Ioniq 5', 'Leaf'], 2)
+        }
+        for i in range(count)
+    ]
+
+def make_png(target_bytes: int) -> bytes:
+    """A valid RGB PNG of random pixels, roughly `target_bytes` long"""
+    side = max(1, int((max(target_bytes, 64) / 3) ** 0.5))
+    rng = random.Random(17)
+    raw = b''.join(b'\x00' + rng.randbytes(side * 3) for _ in range(side))
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    header = struct.pack('>IIBBBBB', side, side, 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', zlib.compress(raw, 1)) + chunk(b'IEND', b'')
+
+class StubInventoryApi:
+    """Generated inventory data and in-memory users behind aiohttp routes"""
+
+    def __init__(self, args: argparse.Namespace):
+        self.latency = args.latency / 1000
+        self.jitter = args.jitter / 1000
+        self.fail_rate = args.fail_rate
+        self.conflict_body = args.conflict_body
+        padding = 'x' * args.pad_bytes
+
+        def padded(rows: list) -> list:
+            # An extra field the bot ignores, so payload size grows without changing behaviour
+            if padding:
+                for row in rows:
+                    row['notes'] = padding
+            return rows
+
+        self.listings = {
+            'Product': padded(generate_products(args.products)),
+            'Garage': padded(generate_garages(args.garages)),
+            'ChargingStation': padded(generate_stations(args.stations)),
+            'Accessory': padded(generate_accessories(args.accessories)),
+        }
+        self.categories = [{'id': category_id, 'name': name} for category_id, name in CATEGORIES.items()]
+        self.brands = [{'id': brand_id, 'name': name} for brand_id, name in BRANDS.items()]
+        self.image = make_png(args.image_bytes)
+        self.image_etag = f'"{hashlib.md5(self.image).hexdigest()}"'
+
+        # telegramId (string, as the real API stores it) -> user, and -> favorite rows
+        self.users = {}
+        self.favorites = {}
+        self.hits = Counter()
+
+    def routes(self) -> list:
+        return [
+            web.get('/Product', self.listing('Product')),
+            web.get('/Garage', self.listing('Garage')),
+            web.get('/ChargingStation', self.listing('ChargingStation')),
+            web.get('/Accessory', self.listing('Accessory')),
+            web.get('/Accessory/{item_id}', self.accessory_by_id),
+            web.get('/Category', self.fixed({'data': self.categories})),
+            web.get('/Brand', self.fixed(self.brands)),
+            web.get('/User/GetTelegramUser/{telegram_id}', self.get_user),
+            web.post('/User/CreateTelegramUser', self.create_user),
+            web.put('/User/UpdateTelegramUser/{telegram_id}', self.update_user),
+            web.get('/User/{telegram_id}/favorites', self.get_favorites),
+            web.post('/User/{telegram_id}/favorites', self.add_favorite),
+            web.delete('/User/{telegram_id}/favorites/{car_id}', self.remove_favorite),
+            web.get('/img/{path:.+}', self.image_bytes),
+            web.get('/stats', self.stats),
+        ]
+
+    @web.middleware
+    async def middleware(self, request: web.Request, handler):
+        """Count requests, add the configured latency and inject failures"""
+        if request.path != '/stats':
+            self.hits[f"{request.method} {request.path.split('/')[1]}"] += 1
+            if self.latency or self.jitter:
+                await asyncio.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+            if self.fail_rate and random.random() < self.fail_rate:
+                self.hits['injected_failures'] += 1
+                return web.Response(status=503, text='injected failure')
+        return await handler(request)
+
+    @staticmethod
+    def json_response(request: web.Request, payload, status: int = 200) -> web.Response:
+        """Encode a payload, answering 304 when the client already has this exact body"""
+        body = json_codec.dumps(payload)
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if status == 200 and request.headers.get('If-None-Match') == etag:
+            return web.Response(status=304, headers={'ETag': etag})
+        return web.Response(body=body, status=status, content_type='application/json', headers={'ETag': etag})
+
+    def listing(self, name: str):
+        rows = self.listings[name]
+
+        async def handler(request: web.Request) -> web.Response:
+            try:
+                page = max(1, int(request.query.get('page', 1)))
+                page_size = max(1, int(request.query.get('pageSize', len(rows) or 1)))
+            except ValueError:
+                return web.json_response({'error': 'page and pageSize must be integers'}, status=400)
+            start = (page - 1) * page_size
+            return self.json_response(request, {
+                'data': rows[start:start + page_size],
+                'totalItems': len(rows),
+                'page': page,
+                'pageSize': page_size
+            })
+        return handler
+
+    def fixed(self, payload):
+        async def handler(request: web.Request) -> web.Response:
+            return self.json_response(request, payload)
+        return handler
+
+    async def accessory_by_id(self, request: web.Request) -> web.Response:
+        item_id = request.match_info['item_id']
+        for row in self.listings['Accessory']:
+            if str(row['id']) == item_id:
+                return self.json_response(request, row)
+        return web.json_response({'error': 'not found'}, status=404)
+
+    async def get_user(self, request: web.Request) -> web.Response:
+        user = self.users.get(request.match_info['telegram_id'])
+        if user is None:
+            return web.json_response({'error': 'user not found'}, status=404)
+        return self.json_response(request, user)
+
+    async def create_user(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        telegram_id = str(data.get('telegramId') or '')
+        if not telegram_id:
+            return web.json_response({'error': 'telegramId is required'}, status=400)
+        if telegram_id in self.users:
+            if self.conflict_body:
+                return web.json_response({'error': 'user already exists', 'data': self.users[telegram_id]}, status=409)
+            return web.json_response({'error': 'user already exists'}, status=409)
+
+        now = datetime.now().isoformat()
+        self.users[telegram_id] = {
+            'telegramId': telegram_id,
+            'username': data.get('username') or '',
+            'firstName': data.get('firstName') or '',
+            'lastName': data.get('lastName') or '',
+            'language': data.get('language') or 'en',
+            'isActive': True,
+            'createdAt': now,
+            'updatedAt': now
+        }
+        return web.json_response({'data': self.users[telegram_id]}, status=201)
+
+    async def update_user(self, request: web.Request) -> web.Response:
+        user = self.users.get(request.match_info['telegram_id'])
+        if user is None:
+            return web.json_response({'error': 'user not found'}, status=404)
+        user.update(await request.json())
+        user['updatedAt'] = datetime.now().isoformat()
+        return web.json_response(user)
+
+    async def get_favorites(self, request: web.Request) -> web.Response:
+        return web.json_response({'data': self.favorites.get(request.match_info['telegram_id'], [])})
+
+    async def add_favorite(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        favorites = self.favorites.setdefault(request.match_info['telegram_id'], [])
+        if not any(favorite['carId'] == data.get('carId') for favorite in favorites):
+            favorites.append({'carId': data.get('carId'), 'addedAt': data.get('addedAt')})
+        return web.json_response({'data': favorites}, status=201)
+
+    async def remove_favorite(self, request: web.Request) -> web.Response:
+        car_id = request.match_info['car_id']
+        favorites = self.favorites.get(request.match_info['telegram_id'], [])
+        self.favorites[request.match_info['telegram_id']] = [
+            favorite for favorite in favorites if str(favorite['carId']) != car_id
+        ]
+        return web.Response(status=204)
+
+    async def image_bytes(self, request: web.Request) -> web.Response:
+        """The same generated PNG for every image path (HEAD is answered too)"""
+        if request.headers.get('If-None-Match') == self.image_etag:
+            return web.Response(status=304, headers={'ETag': self.image_etag})
+        return web.Response(body=self.image, content_type='image/png',
+                            headers={'ETag': self.image_etag, 'Cache-Control': 'public, max-age=3600'})
+
+    async def stats(self, request: web.Request) -> web.Response:
+        """Request counts per method and endpoint"""
+        return web.json_response(dict(self.hits))
+
+def build_app(args: argparse.Namespace) -> web.Application:
+    stub = StubInventoryApi(args)
+    app = web.Application(middlewares=[stub.middleware])
+    app.add_routes(stub.routes())
+    return app
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--products', type=int, default=2000)
+    parser.add_argument('--garages', type=int, default=200)
+    parser.add_argument('--stations', type=int, default=200)
+    parser.add_argument('--accessories', type=int, default=300)
+    parser.add_argument('--pad-bytes', type=int, default=0, help='extra bytes of text per generated row')
+    parser.add_argument('--image-bytes', type=int, default=30000, help='approximate size of served images')
+    parser.add_argument('--latency', type=float, default=0, help='added delay per request in milliseconds')
+    parser.add_argument('--jitter', type=float, default=0, help='random +/- spread of the delay in milliseconds')
+    parser.add_argument('--fail-rate', type=float, default=0, help='fraction of requests answered with 503')
+    parser.add_argument('--conflict-body', action='store_true',
+                        help='answer a duplicate user create (409) with the existing user in "data"')
+    return parser.parse_args(argv)
+
+def main():
+    args = parse_args()
+    origin = f"http://{args.host}:{args.port}"
+    print(f"🧪 Stub inventory API on {origin} "
+          f"({args.products} products, {args.garages} garages, {args.stations} stations, {args.accessories} accessories)")
+    print(f"   API_BASE_URL={origin} API_BASE_URL_IMG={origin}/img")
+    web.run_app(build_app(args), host=args.host, port=args.port, print=None)
+
+if __name__ == '__main__':
+    main()
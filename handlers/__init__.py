@@ -1,216 +1,185 @@
-from .base import start, main_menu, settings_command, unknown_message
-from .car_catalog.car_catalog import view_cars, handle_brand_selected, handle_more_cars
-from .settings.settings import settings, change_language, handle_language_change, handle_initial_language_selection, handle_english_selection, handle_khmer_selection
-from .support.support import contact_support
-from .favorites.favorites import view_favourites, handle_favourite_car, handle_unfavourite_car, handle_favourite_accessory, handle_unfavourite_accessory
-from .contact.contact import handle_contact_seller, handle_copy_phone
+"""Feature handlers, loaded lazily.
 
+Every name exported here is a thin async callback that imports its handler module on
+first dispatch, so starting the bot does not pay for feature modules (and the services,
+models and translations they pull in) until a user actually opens that feature. Code
+that needs the real function should import it from its submodule directly.
+"""
+from .lazy import lazy_handler
 
-from .help.help import (
-    view_help, help_browse_cars, help_explore, help_search, help_favourites, help_contact, help_settings,
-    help_charging_stations, help_garage
-)
-from .search.search import (
-    handle_search_cars, handle_advanced_search, handle_price_search, handle_year_search,
-    handle_location_search, handle_brand_search, handle_color_search, handle_category_search,
-    handle_price_range_selection, handle_year_range_selection, handle_location_selection,
-    handle_brand_selection, handle_color_selection, handle_category_selection,
-    handle_clear_filters, apply_search_filters, handle_more_search_results,
-    handle_search_type_selection, handle_car_search_filters
-)
-from .search.charging_station_search import (
-    handle_charging_station_search_filters,
-    handle_charging_price_search,
-    handle_charging_power_search,
-    handle_charging_location_search,
-    handle_charging_connector_search,
-    handle_charging_price_range_selection,
-    handle_charging_power_range_selection,
-    handle_charging_location_selection,
-    handle_charging_connector_selection,
-    handle_clear_charging_filters,
-    apply_charging_station_filters,
-    handle_more_charging_results,
-    handle_more_charging_search_results
-)
-from .search.garage_search import (
-    handle_garage_search_filters,
-    handle_garage_location_search,
-    handle_garage_service_search,
+# Exported name -> (module, attribute)
+_HANDLER_EXPORTS = {
+    # handlers.base
+    'start': ('handlers.base', 'start'),
+    'main_menu': ('handlers.base', 'main_menu'),
+    'settings_command': ('handlers.base', 'settings_command'),
+    'unknown_message': ('handlers.base', 'unknown_message'),
+    # handlers.car_catalog.car_catalog
+    'view_cars': ('handlers.car_catalog.car_catalog', 'view_cars'),
+    'handle_brand_selected': ('handlers.car_catalog.car_catalog', 'handle_brand_selected'),
+    'handle_more_cars': ('handlers.car_catalog.car_catalog', 'handle_more_cars'),
+    # handlers.settings.settings
+    'settings': ('handlers.settings.settings', 'settings'),
+    'change_language': ('handlers.settings.settings', 'change_language'),
+    'handle_language_change': ('handlers.settings.settings', 'handle_language_change'),
+    'handle_initial_language_selection': ('handlers.settings.settings', 'handle_initial_language_selection'),
+    'handle_english_selection': ('handlers.settings.settings', 'handle_english_selection'),
+    'handle_khmer_selection': ('handlers.settings.settings', 'handle_khmer_selection'),
+    # handlers.support.support
+    'contact_support': ('handlers.support.support', 'contact_support'),
+    # handlers.favorites.favorites
+    'view_favourites': ('handlers.favorites.favorites', 'view_favourites'),
+    'handle_favourite_car': ('handlers.favorites.favorites', 'handle_favourite_car'),
+    'handle_unfavourite_car': ('handlers.favorites.favorites', 'handle_unfavourite_car'),
+    'handle_favourite_accessory': ('handlers.favorites.favorites', 'handle_favourite_accessory'),
+    'handle_unfavourite_accessory': ('handlers.favorites.favorites', 'handle_unfavourite_accessory'),
+    # handlers.contact.contact
+    'handle_contact_seller': ('handlers.contact.contact', 'handle_contact_seller'),
+    'handle_copy_phone': ('handlers.contact.contact', 'handle_copy_phone'),
+    # handlers.help.help
+    'view_help': ('handlers.help.help', 'view_help'),
+    'help_browse_cars': ('handlers.help.help', 'help_browse_cars'),
+    'help_explore': ('handlers.help.help', 'help_explore'),
+    'help_search': ('handlers.help.help', 'help_search'),
+    'help_favourites': ('handlers.help.help', 'help_favourites'),
+    'help_contact': ('handlers.help.help', 'help_contact'),
+    'help_settings': ('handlers.help.help', 'help_settings'),
+    'help_charging_stations': ('handlers.help.help', 'help_charging_stations'),
+    'help_garage': ('handlers.help.help', 'help_garage'),
+    # handlers.search.search
+    'handle_search_cars': ('handlers.search.search', 'handle_search_cars'),
+    'handle_advanced_search': ('handlers.search.search', 'handle_advanced_search'),
+    'handle_price_search': ('handlers.search.search', 'handle_price_search'),
+    'handle_year_search': ('handlers.search.search', 'handle_year_search'),
+    'handle_location_search': ('handlers.search.search', 'handle_location_search'),
+    'handle_brand_search': ('handlers.search.search', 'handle_brand_search'),
+    'handle_color_search': ('handlers.search.search', 'handle_color_search'),
+    'handle_category_search': ('handlers.search.search', 'handle_category_search'),
+    'handle_price_range_selection': ('handlers.search.search', 'handle_price_range_selection'),
+    'handle_year_range_selection': ('handlers.search.search', 'handle_year_range_selection'),
+    'handle_location_selection': ('handlers.search.search', 'handle_location_selection'),
+    'handle_brand_selection': ('handlers.search.search', 'handle_brand_selection'),
+    'handle_color_selection': ('handlers.search.search', 'handle_color_selection'),
+    'handle_category_selection': ('handlers.search.search', 'handle_category_selection'),
+    'handle_clear_filters': ('handlers.search.search', 'handle_clear_filters'),
+    'apply_search_filters': ('handlers.search.search', 'apply_search_filters'),
+    'handle_more_search_results': ('handlers.search.search', 'handle_more_search_results'),
+    'handle_search_type_selection': ('handlers.search.search', 'handle_search_type_selection'),
+    'handle_car_search_filters': ('handlers.search.search', 'handle_car_search_filters'),
+    # handlers.search.charging_station_search
+    'handle_charging_station_search_filters': ('handlers.search.charging_station_search', 'handle_charging_station_search_filters'),
+    'handle_charging_price_search': ('handlers.search.charging_station_search', 'handle_charging_price_search'),
+    'handle_charging_power_search': ('handlers.search.charging_station_search', 'handle_charging_power_search'),
+    'handle_charging_location_search': ('handlers.search.charging_station_search', 'handle_charging_location_search'),
+    'handle_charging_connector_search': ('handlers.search.charging_station_search', 'handle_charging_connector_search'),
+    'handle_charging_price_range_selection': ('handlers.search.charging_station_search', 'handle_charging_price_range_selection'),
+    'handle_charging_power_range_selection': ('handlers.search.charging_station_search', 'handle_charging_power_range_selection'),
+    'handle_charging_location_selection': ('handlers.search.charging_station_search', 'handle_charging_location_selection'),
+    'handle_charging_connector_selection': ('handlers.search.charging_station_search', 'handle_charging_connector_selection'),
+    'handle_clear_charging_filters': ('handlers.search.charging_station_search', 'handle_clear_charging_filters'),
+    'apply_charging_station_filters': ('handlers.search.charging_station_search', 'apply_charging_station_filters'),
+    'handle_more_charging_results': ('handlers.search.charging_station_search', 'handle_more_charging_results'),
+    'handle_more_charging_search_results': ('handlers.search.charging_station_search', 'handle_more_charging_search_results'),
+    # handlers.search.garage_search
+    'handle_garage_search_filters': ('handlers.search.garage_search', 'handle_garage_search_filters'),
+    'handle_garage_location_search': ('handlers.search.garage_search', 'handle_garage_location_search'),
+    'handle_garage_service_search': ('handlers.search.garage_search', 'handle_garage_service_search'),
+    'handle_garage_location_selection': ('handlers.search.garage_search', 'handle_garage_location_selection'),
+    'handle_garage_service_selection': ('handlers.search.garage_search', 'handle_garage_service_selection'),
+    'handle_clear_garage_filters': ('handlers.search.garage_search', 'handle_clear_garage_filters'),
+    'apply_garage_filters': ('handlers.search.garage_search', 'apply_garage_filters'),
+    'handle_garage_more_search_results': ('handlers.search.garage_search', 'handle_more_search_results'),
+    # handlers.search.accessory_search
+    'handle_accessory_search_filters': ('handlers.search.accessory_search', 'handle_accessory_search_filters'),
+    'handle_accessory_price_search': ('handlers.search.accessory_search', 'handle_accessory_price_search'),
+    'handle_accessory_location_search': ('handlers.search.accessory_search', 'handle_accessory_location_search'),
+    'handle_accessory_brand_search': ('handlers.search.accessory_search', 'handle_accessory_brand_search'),
+    'handle_accessory_category_search': ('handlers.search.accessory_search', 'handle_accessory_category_search'),
+    'handle_accessory_location_selection': ('handlers.search.accessory_search', 'handle_accessory_location_selection'),
+    'handle_accessory_category_selection': ('handlers.search.accessory_search', 'handle_accessory_category_selection'),
+    'handle_apply_accessory_filters': ('handlers.search.accessory_search', 'handle_apply_accessory_filters'),
+    'handle_clear_accessory_filters': ('handlers.search.accessory_search', 'handle_clear_accessory_filters'),
+    'handle_more_accessory_results': ('handlers.search.accessory_search', 'handle_more_accessory_results'),
+    # handlers.car_info.explore
+    'explore_cars': ('handlers.car_info.explore', 'explore_cars'),
+    'explore_types': ('handlers.car_info.explore', 'explore_types'),
+    'explore_advantages': ('handlers.car_info.explore', 'explore_advantages'),
+    'explore_features': ('handlers.car_info.explore', 'explore_features'),
+    'explore_safety': ('handlers.car_info.explore', 'explore_safety'),
+    'explore_eco': ('handlers.car_info.explore', 'explore_eco'),
+    # handlers.car_info.safety
+    'handle_safety_maintenance': ('handlers.car_info.safety', 'handle_safety_maintenance'),
+    'handle_safety_tips': ('handlers.car_info.safety', 'handle_safety_tips'),
+    'handle_safety_warnings': ('handlers.car_info.safety', 'handle_safety_warnings'),
+    'handle_safety_emergency': ('handlers.car_info.safety', 'handle_safety_emergency'),
+    'handle_safety_seasonal': ('handlers.car_info.safety', 'handle_safety_seasonal'),
+    'handle_safety_diy': ('handlers.car_info.safety', 'handle_safety_diy'),
+    # handlers.car_info.car_types
+    'handle_type_sports': ('handlers.car_info.car_types', 'handle_type_sports'),
+    'handle_type_suv': ('handlers.car_info.car_types', 'handle_type_suv'),
+    'handle_type_sedan': ('handlers.car_info.car_types', 'handle_type_sedan'),
+    'handle_type_hatchback': ('handlers.car_info.car_types', 'handle_type_hatchback'),
+    'handle_type_truck': ('handlers.car_info.car_types', 'handle_type_truck'),
+    'handle_type_convertible': ('handlers.car_info.car_types', 'handle_type_convertible'),
+    'handle_type_wagon': ('handlers.car_info.car_types', 'handle_type_wagon'),
+    'handle_type_minivan': ('handlers.car_info.car_types', 'handle_type_minivan'),
+    # handlers.car_info.benefits
+    'handle_benefits_work': ('handlers.car_info.benefits', 'handle_benefits_work'),
+    'handle_benefits_family': ('handlers.car_info.benefits', 'handle_benefits_family'),
+    'handle_benefits_financial': ('handlers.car_info.benefits', 'handle_benefits_financial'),
+    'handle_benefits_social': ('handlers.car_info.benefits', 'handle_benefits_social'),
+    'handle_benefits_comparison': ('handlers.car_info.benefits', 'handle_benefits_comparison'),
+    'handle_benefits_freedom': ('handlers.car_info.benefits', 'handle_benefits_freedom'),
+    # handlers.car_info.features
+    'handle_features_safety': ('handlers.car_info.features', 'handle_features_safety'),
+    'handle_features_tech': ('handlers.car_info.features', 'handle_features_tech'),
+    'handle_features_comfort': ('handlers.car_info.features', 'handle_features_comfort'),
+    'handle_features_performance': ('handlers.car_info.features', 'handle_features_performance'),
+    'handle_features_electric': ('handlers.car_info.features', 'handle_features_electric'),
+    'handle_features_entertainment': ('handlers.car_info.features', 'handle_features_entertainment'),
+    # handlers.car_info.eco
+    'handle_eco_electric': ('handlers.car_info.eco', 'handle_eco_electric'),
+    'handle_eco_hybrid': ('handlers.car_info.eco', 'handle_eco_hybrid'),
+    'handle_eco_fuel': ('handlers.car_info.eco', 'handle_eco_fuel'),
+    'handle_eco_impact': ('handlers.car_info.eco', 'handle_eco_impact'),
+    'handle_eco_savings': ('handlers.car_info.eco', 'handle_eco_savings'),
+    'handle_eco_charging': ('handlers.car_info.eco', 'handle_eco_charging'),
+    # handlers.charging_station.charging_station
+    'view_charging_stations': ('handlers.charging_station.charging_station', 'view_charging_stations'),
+    'view_location_stations': ('handlers.charging_station.charging_station', 'view_location_stations'),
+    'view_station_navigation': ('handlers.charging_station.charging_station', 'view_station_navigation'),
+    'handle_show_by_location': ('handlers.charging_station.charging_station', 'handle_show_by_location'),
+    'handle_show_nearby': ('handlers.charging_station.charging_station', 'handle_show_nearby'),
+    'handle_more_stations': ('handlers.charging_station.charging_station', 'handle_more_stations'),
+    'handle_more_location_stations': ('handlers.charging_station.charging_station', 'handle_more_location_stations'),
+    # handlers.garage.garage
+    'view_garages': ('handlers.garage.garage', 'view_garages'),
+    'view_location_garages': ('handlers.garage.garage', 'view_location_garages'),
+    'garage_handle_show_by_location': ('handlers.garage.garage', 'handle_show_by_location'),
+    'garage_handle_show_nearby': ('handlers.garage.garage', 'handle_show_nearby'),
+    'handle_more_garages': ('handlers.garage.garage', 'handle_more_garages'),
+    # handlers.accessory.accessory
+    'view_accessories': ('handlers.accessory.accessory', 'view_accessories'),
+    'handle_accessory_type_selection': ('handlers.accessory.accessory', 'handle_accessory_type_selection'),
+    'handle_more_accessories': ('handlers.accessory.accessory', 'handle_more_accessories'),
+    'handle_contact_accessory_seller': ('handlers.accessory.accessory', 'handle_contact_accessory_seller'),
+    'handle_copy_accessory_phone': ('handlers.accessory.accessory', 'handle_copy_accessory_phone'),
+    # handlers.location.location
+    'request_location': ('handlers.location.location', 'request_location'),
+    'handle_location_received': ('handlers.location.location', 'handle_location_received'),
+    'handle_nearby_charging_stations': ('handlers.location.location', 'handle_nearby_charging_stations'),
+    'handle_nearby_garages': ('handlers.location.location', 'handle_nearby_garages'),
+    'show_location_settings': ('handlers.location.location', 'show_location_settings'),
+    'handle_clear_location': ('handlers.location.location', 'handle_clear_location'),
+}
 
-    handle_garage_location_selection,
-    handle_garage_service_selection,
+def __getattr__(name):
+    """Resolve exported handlers to lazy callbacks on first access"""
+    if name not in _HANDLER_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-    handle_clear_garage_filters,
-    apply_garage_filters,
-    handle_more_search_results as handle_garage_more_search_results
-)
-from .search.accessory_search import (
-    handle_accessory_search_filters, handle_accessory_price_search, handle_accessory_location_search,
-    handle_accessory_brand_search, handle_accessory_category_search, handle_accessory_location_selection,
-    handle_accessory_category_selection, handle_apply_accessory_filters, handle_clear_accessory_filters,
-    handle_more_accessory_results
-)
+    callback = lazy_handler(*_HANDLER_EXPORTS[name])
+    globals()[name] = callback
+    return callback
 
-# Add these imports to the existing imports from .explore
-from .car_info.explore import (
-    explore_cars, explore_types, explore_advantages, explore_features, 
-    explore_safety, explore_eco,
-)
-from .car_info.safety import(
-        # Safety handler
-    handle_safety_maintenance,
-    handle_safety_tips, 
-    handle_safety_warnings,
-    handle_safety_emergency,
-    handle_safety_seasonal,
-    handle_safety_diy,
-)
-from .car_info.car_types import (
-    handle_type_sports, handle_type_suv, handle_type_sedan, handle_type_hatchback,
-    handle_type_truck, handle_type_convertible, handle_type_wagon, handle_type_minivan,
-)
-from .car_info.benefits import (
-    handle_benefits_work, handle_benefits_family, handle_benefits_financial, 
-    handle_benefits_social, handle_benefits_comparison, handle_benefits_freedom,
-)
-from .car_info.features import(
-    handle_features_safety, handle_features_tech, handle_features_comfort,
-    handle_features_performance, handle_features_electric, handle_features_entertainment,
-)
-from .car_info.eco import (
-    handle_eco_electric,
-    handle_eco_hybrid,
-    handle_eco_fuel,
-    handle_eco_impact,
-    handle_eco_savings,
-    handle_eco_charging
-)
-from .charging_station.charging_station import (
-    view_charging_stations, view_location_stations, view_station_navigation,
-    handle_show_by_location, handle_show_nearby, handle_more_stations, handle_more_location_stations
-)
-from .garage.garage import (
-    view_garages, view_location_garages,
-    handle_show_by_location as garage_handle_show_by_location,
-    handle_show_nearby as garage_handle_show_nearby,
-    handle_more_garages
-)
-from .accessory.accessory import (
-    view_accessories, handle_accessory_type_selection, handle_more_accessories,
-    handle_contact_accessory_seller, handle_copy_accessory_phone
-)
-
-# Add these to the __all__ list
-__all__ = [
-    'start',
-    'main_menu',
-    'settings_command',
-    'unknown_message', 
-    'view_cars',
-    'handle_brand_selected',
-    'handle_more_cars',
-    'settings',
-    'change_language',
-
-
-    'handle_language_change',
-    'handle_english_selection',
-    'handle_khmer_selection',
-    'handle_initial_language_selection',
-    'contact_support',
-    'view_favourites',
-    'handle_favourite_car',
-    'handle_unfavourite_car',
-    'handle_favourite_accessory',
-    'handle_unfavourite_accessory',
-    'handle_contact_seller',
-    'view_accessories',
-    'handle_accessory_type_selection',
-    'handle_more_accessories',
-    'handle_contact_accessory_seller',
-    'handle_copy_accessory_phone',
-    'view_help',
-    'help_browse_cars',
-    'help_explore',
-    'help_search',
-    'help_favourites',
-    'help_contact',
-    'help_settings',
-    'help_charging_stations',
-    'help_garage',
-    'handle_advanced_search',
-    'handle_price_search', 
-    'handle_year_search',
-    'handle_location_search',
-    'handle_price_range_selection',
-    'handle_year_range_selection',
-    'handle_location_selection',
-    'handle_clear_filters',
-    'apply_search_filters',
-    'handle_more_search_results',
-    'explore_cars',
-    'explore_types', 
-    'explore_advantages',
-    'explore_features',
-    'explore_safety',
-    'explore_eco',
-    'handle_type_sports', 'handle_type_suv', 'handle_type_sedan', 'handle_type_hatchback',
-    'handle_type_truck', 'handle_type_convertible', 'handle_type_wagon', 'handle_type_minivan',
-    'handle_safety_maintenance',
-    'handle_safety_tips', 
-    'handle_safety_warnings',
-    'handle_safety_emergency',
-    'handle_safety_seasonal',
-    'handle_safety_diy',
-    'handle_eco_electric',
-    'handle_eco_hybrid',
-    'handle_eco_fuel',
-    'handle_eco_impact',
-    'handle_eco_savings',
-    'handle_eco_charging',
-    'handle_brand_search', 
-    'handle_color_search', 'handle_category_search',
-    'handle_brand_selection', 'handle_color_selection', 'handle_category_selection',
-    'handle_search_type_selection', 'handle_car_search_filters', 'handle_accessory_search_filters',
-    'handle_accessory_price_search', 'handle_accessory_location_search', 'handle_accessory_brand_search',
-    'handle_accessory_category_search', 'handle_accessory_location_selection', 'handle_accessory_category_selection',
-    'handle_apply_accessory_filters', 'handle_clear_accessory_filters', 'handle_more_accessory_results',
-    'handle_benefits_work', 'handle_benefits_family', 'handle_benefits_financial',
-    'handle_benefits_social', 'handle_benefits_comparison', 'handle_benefits_freedom',
-    'handle_features_safety', 'handle_features_tech', 'handle_features_comfort',
-    'handle_features_performance', 'handle_features_electric', 'handle_features_entertainment',
-    'handle_copy_phone',
-    'view_charging_stations',
-    'view_location_stations',
-    'view_station_navigation',
-    'view_garages',
-    'view_location_garages',
-    # Charging station search functions
-    'handle_charging_station_search_filters',
-    'handle_charging_price_search',
-    'handle_charging_power_search',
-    'handle_charging_location_search',
-    'handle_charging_connector_search',
-    'handle_charging_rating_search',
-    'handle_charging_price_range_selection',
-    'handle_charging_power_range_selection',
-    'handle_charging_location_selection',
-    'handle_charging_connector_selection',
-    'handle_charging_rating_selection',
-    'handle_clear_charging_filters',
-    'apply_charging_station_filters',
-    'handle_more_charging_results',
-    'handle_more_charging_search_results',
-    # Garage search functions
-    'handle_garage_search_filters',
-    'handle_garage_location_search',
-    'handle_garage_service_search',
-
-    'handle_garage_location_selection',
-    'handle_garage_service_selection',
-
-    'handle_clear_garage_filters',
-    'apply_garage_filters',
-    'handle_garage_more_search_results'
-]
\ No newline at end of file
+__all__ = list(_HANDLER_EXPORTS)
\ No newline at end of file
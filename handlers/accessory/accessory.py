@@ -3,10 +3,11 @@ from telegram.ext import ContextTypes
 from datetime import datetime
 from typing import List
 from models.core.accessory import Accessory
-from utils.services.accessory_service import AccessoryService
+from utils.services.accessory_service import accessory_service
 from utils.ui.keyboards import Keyboards
 from utils.ui.language import language_handler
 import aiohttp
+from utils.services.api_client import api_client
 
 async def is_valid_image_url(url: str) -> bool:
     """Check if URL points to a valid image by attempting to download first few bytes"""
@@ -18,7 +19,7 @@ async def is_valid_image_url(url: str) -> bool:
         if not (url.startswith('http://') or url.startswith('https://')):
             return False
             
-        async with aiohttp.ClientSession() as session:
+        async with api_client.session() as session:
             # Try to get first 1024 bytes to check if it's an image
             headers = {'Range': 'bytes=0-1023'}
             async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=10)) as response:
@@ -128,7 +129,7 @@ async def view_accessories(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     query = update.callback_query
     await query.answer(language_handler.get_text("loading_accessories", update.effective_user.id))
     
-    service = AccessoryService()
+    service = accessory_service
     
     try:
         # Get all unique accessory types
@@ -172,7 +173,7 @@ async def handle_accessory_type_selection(update: Update, context: ContextTypes.
     accessory_type = query.data.replace("accessory_type_", "")
     await query.answer(language_handler.get_text("loading_type_accessories", update.effective_user.id, type=accessory_type))
     
-    service = AccessoryService()
+    service = accessory_service
     
     try:
         # Get accessories for this type
@@ -210,7 +211,7 @@ async def show_type_accessories_page(update: Update, context: ContextTypes.DEFAU
     """Display a page of accessories for the selected type"""
     query = update.callback_query if update.callback_query else None
     
-    service = AccessoryService()
+    service = accessory_service
     
     accessory_type = context.user_data.get('current_accessory_type')
     type_accessories = context.user_data.get('type_accessories', [])
@@ -315,7 +316,7 @@ async def show_type_accessories_page(update: Update, context: ContextTypes.DEFAU
                         # For R2 URLs, try downloading first then fallback to direct URL
                         if "r2.dev" in image_url or "cloudflare" in image_url:
                             try:
-                                async with aiohttp.ClientSession() as session:
+                                async with api_client.session() as session:
                                     async with session.get(image_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
                                         if response.status == 200:
                                             image_data = await response.read()
@@ -428,7 +429,7 @@ async def handle_contact_accessory_seller(update: Update, context: ContextTypes.
     query = update.callback_query
     accessory_id = int(query.data.replace("contact_accessory_", ""))
     
-    service = AccessoryService()
+    service = accessory_service
     
     try:
         # Get accessory details
@@ -468,7 +469,7 @@ async def handle_copy_accessory_phone(update: Update, context: ContextTypes.DEFA
     query = update.callback_query
     accessory_id = int(query.data.replace("copy_accessory_phone_", ""))
     
-    service = AccessoryService()
+    service = accessory_service
     
     try:
         # Get accessory details
@@ -6,28 +6,22 @@ from models.data.message import Message, messages
 from utils.ui.keyboards import Keyboards
 from utils.ui.language import language_handler
 from utils.services.user_api_service import user_api_service
+from utils.services.profile_store import profile_store
 import asyncio
 import json
 import os
 
-# Local cache for users to reduce API calls (memory-only)
-user_cache = {}
-
 def clear_user_cache(telegram_id=None):
-    """Clear user cache for specific user or all users"""
-    global user_cache
+    """Clear the cached profile (and any remembered "not found") for specific user or all users"""
+    profile_store.forget(telegram_id or None)
     if telegram_id:
-        if telegram_id in user_cache:
-            del user_cache[telegram_id]
-            pass
+        user_api_service.not_found.pop(telegram_id, None)
     else:
-        user_cache.clear()
-        pass
+        user_api_service.not_found.clear()
 
 async def force_refresh_user(telegram_id):
     """Force refresh user data from API by clearing cache"""
     clear_user_cache(telegram_id)
-    print(f"DEBUG: Forced refresh for user {telegram_id}")
     
     # Create a mock telegram user object for API call
     class MockTelegramUser:
@@ -43,23 +37,12 @@ async def force_refresh_user(telegram_id):
     return user_data
 
 async def get_or_create_user(telegram_user):
-    """Get or create user using API service with local caching"""
+    """Get or create user using API service (answered from the shared profile store when possible)"""
     telegram_id = telegram_user.id
     
-    # Check local cache first
-    if telegram_id in user_cache:
-        return user_cache[telegram_id]
-    
-    # Get user from API
+    # Get user from the profile store or the API
     try:
-        user_data = await user_api_service.get_or_create_user(telegram_user)
-        
-        # Debug: Print the language from API
-        print(f"DEBUG: User {telegram_id} language from API: {user_data.get('language', 'NOT_SET')}")
-        
-        # Cache the user data
-        user_cache[telegram_id] = user_data
-        return user_data
+        return await user_api_service.get_or_create_user(telegram_user)
         
     except Exception as e:
         print(f"Error getting user from API: {e}")
@@ -80,17 +63,15 @@ async def get_or_create_user(telegram_user):
             'language': default_language,
             'source': 'local_fallback'
         }
-        user_cache[telegram_id] = fallback_user
-        return fallback_user
+        return profile_store.put(telegram_id, fallback_user)
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_id = update.effective_user.id
     pass
     
     # Check if user already exists first (check cache and API)
-    existing_user = None
-    if telegram_id in user_cache:
-        existing_user = user_cache[telegram_id]
+    existing_user = profile_store.get_complete(telegram_id)
+    if existing_user:
         pass
     else:
         pass
@@ -100,8 +81,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
             if existing_user:
                 pass
                 # Convert API format to local format and cache it
-                existing_user = user_api_service._convert_api_user_to_local(existing_user)
-                user_cache[telegram_id] = existing_user
+                existing_user = user_api_service.remember_profile(telegram_id, existing_user)
                 pass
             else:
                 pass
@@ -3,7 +3,7 @@ import telegram
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, InputMediaPhoto, error
 from telegram.ext import ContextTypes
 from datetime import datetime
-from models.core.product import Product, products  # Changed from Car, cars
+from models.core.product import Product, products, is_catalog_ready  # Changed from Car, cars
 from utils.ui.keyboards import Keyboards
 from utils.ui.language import language_handler
 # Add this import
@@ -12,6 +12,14 @@ async def view_cars(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer(language_handler.get_text("loading_cars", update.effective_user.id))
     
+    # The catalog is still loading in the background; don't report an empty inventory
+    if not is_catalog_ready():
+        await query.message.reply_text(
+            language_handler.get_text("catalog_warming_up", update.effective_user.id),
+            reply_markup=Keyboards.get_catalog_warming_keyboard(update.effective_user.id, query.data)
+        )
+        return
+    
     # Check if this is a refresh action
     is_refreshed = query.data == "refresh_cars" if query.data else False
     
@@ -38,6 +46,14 @@ async def handle_brand_selected(update: Update, context: ContextTypes.DEFAULT_TY
     brand = query.data.replace("brand_", "")
     await query.answer(language_handler.get_text("loading_brand_cars", update.effective_user.id, brand=brand))
     
+    # The catalog is still loading in the background; don't report an empty inventory
+    if not is_catalog_ready():
+        await query.message.reply_text(
+            language_handler.get_text("catalog_warming_up", update.effective_user.id),
+            reply_markup=Keyboards.get_catalog_warming_keyboard(update.effective_user.id, query.data)
+        )
+        return
+    
     brand_cars = [car for car in products if car.brand == brand and car.status == "available"]
     
     if not brand_cars:
@@ -217,6 +233,14 @@ async def handle_more_cars(update: Update, context: ContextTypes.DEFAULT_TYPE):
         
         await query.answer(f"Loading more {brand} cars...")
         
+        # The catalog is still loading in the background; don't report an empty inventory
+        if not is_catalog_ready():
+            await query.message.reply_text(
+                language_handler.get_text("catalog_warming_up", update.effective_user.id),
+                reply_markup=Keyboards.get_catalog_warming_keyboard(update.effective_user.id, query.data)
+            )
+            return
+        
         # Show next page of cars
         await show_brand_cars_page(update, context, offset)
     else:
@@ -6,11 +6,12 @@ from utils.services.charging_station_service import charging_station_service
 from models.core.charging_station import ChargingStation
 from typing import List
 import aiohttp
+from utils.services.api_client import api_client
 
 async def is_valid_image_url(url: str) -> bool:
     """Check if URL points to a valid image"""
     try:
-        async with aiohttp.ClientSession() as session:
+        async with api_client.session() as session:
             async with session.head(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
                 if response.status == 200:
                     content_type = response.headers.get('content-type', '').lower()
@@ -327,7 +328,7 @@ async def show_stations_page(update: Update, context: ContextTypes.DEFAULT_TYPE,
                     if "r2.dev" in image_url or "cloudflare" in image_url:
                         try:
                             import aiohttp
-                            async with aiohttp.ClientSession() as session:
+                            async with api_client.session() as session:
                                 async with session.get(image_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
                                     if response.status == 200:
                                         image_data = await response.read()
@@ -547,7 +548,7 @@ async def show_location_stations_page(update: Update, context: ContextTypes.DEFA
                     if "r2.dev" in image_url or "cloudflare" in image_url:
                         try:
                             import aiohttp
-                            async with aiohttp.ClientSession() as session:
+                            async with api_client.session() as session:
                                 async with session.get(image_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
                                     if response.status == 200:
                                         image_data = await response.read()
@@ -801,7 +802,7 @@ async def _show_station_details(query, stations, station_index, location, telegr
                 if "r2.dev" in image_url or "cloudflare" in image_url:
                     try:
                         import aiohttp
-                        async with aiohttp.ClientSession() as session:
+                        async with api_client.session() as session:
                             async with session.get(image_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
                                 if response.status == 200:
                                     image_data = await response.read()
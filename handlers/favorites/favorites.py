@@ -1,9 +1,9 @@
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, InputMediaPhoto
 from telegram.ext import ContextTypes
-from models.core.user import User, users
+from models.core.user import User
 from models.core.product import products
 from models.core.accessory import Accessory
-from utils.services.accessory_service import AccessoryService
+from utils.services.accessory_service import accessory_service
 from models.data.favourite import Favourite, favourites
 from utils.ui.keyboards import Keyboards
 from utils.ui.language import language_handler
@@ -55,7 +55,6 @@ async def view_favourites(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     # Handle both API format (dict) and local format (object)
     # Get accessories from API for favorites
-    accessory_service = AccessoryService()
     all_accessories = await accessory_service.fetch_all_accessories()
     
     if user_favourites and isinstance(user_favourites[0], dict):
@@ -510,7 +509,6 @@ async def handle_favourite_accessory(update: Update, context: ContextTypes.DEFAU
     favourites.append(favourite)
     
     # Get accessory from API
-    accessory_service = AccessoryService()
     all_accessories = await accessory_service.fetch_all_accessories()
     accessory = next((acc for acc in all_accessories if acc.id == accessory_id), None)
     if accessory:
@@ -625,7 +623,6 @@ async def handle_unfavourite_accessory(update: Update, context: ContextTypes.DEF
     
     # Show brief confirmation and redirect to favorites view
     # Get accessory from API
-    accessory_service = AccessoryService()
     all_accessories = await accessory_service.fetch_all_accessories()
     accessory = next((acc for acc in all_accessories if acc.id == accessory_id), None)
     if accessory:
@@ -3,17 +3,18 @@ from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, CallbackQueryHandler
 from telegram.error import BadRequest
 
-from utils.services.garage_service import GarageService
+from utils.services.garage_service import garage_service
 from models.core.garage import Garage
 from utils.ui.language import LanguageHandler
 import aiohttp
+from utils.services.api_client import api_client
 
 language_handler = LanguageHandler()
 
 async def is_valid_image_url(url: str) -> bool:
     """Check if URL points to a valid image"""
     try:
-        async with aiohttp.ClientSession() as session:
+        async with api_client.session() as session:
             async with session.head(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
                 if response.status == 200:
                     content_type = response.headers.get('content-type', '').lower()
@@ -171,7 +172,7 @@ async def handle_show_by_location(update: Update, context: ContextTypes.DEFAULT_
     await query.answer()
     
     telegram_id = update.effective_user.id
-    service = GarageService()
+    service = garage_service
     
     # Show loading message
     loading_message = language_handler.get_text("garage_loading", telegram_id)
@@ -230,7 +231,7 @@ async def show_garages_page(update: Update, context: ContextTypes.DEFAULT_TYPE,
     """Display a page of garages in card format"""
     query = update.callback_query if update.callback_query else None
     telegram_id = update.effective_user.id
-    service = GarageService()
+    service = garage_service
     
     # Get garages based on display type
     if display_type == "nearby":
@@ -307,7 +308,7 @@ async def show_garages_page(update: Update, context: ContextTypes.DEFAULT_TYPE,
                     if "r2.dev" in image_url or "cloudflare" in image_url:
                         try:
                             import aiohttp
-                            async with aiohttp.ClientSession() as session:
+                            async with api_client.session() as session:
                                 async with session.get(image_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
                                     if response.status == 200:
                                         image_data = await response.read()
@@ -442,7 +443,7 @@ async def view_location_garages(update: Update, context: ContextTypes.DEFAULT_TY
     await query.answer()
     
     telegram_id = update.effective_user.id
-    service = GarageService()
+    service = garage_service
     
     # Extract location from callback data
     callback_data = query.data
@@ -0,0 +1,48 @@
+import importlib
+import sys
+import time
+from typing import Callable, Dict
+
+# Seconds spent importing each lazily loaded handler module (including its dependencies)
+module_load_times: Dict[str, float] = {}
+
+def load_module(module_path: str):
+    """Import a handler module, recording how long the first import took"""
+    module = sys.modules.get(module_path)
+    if module is not None:
+        return module
+
+    start = time.perf_counter()
+    module = importlib.import_module(module_path)
+    elapsed = time.perf_counter() - start
+    module_load_times[module_path] = elapsed
+    print(f"⏱️ Loaded {module_path} in {elapsed * 1000:.1f} ms")
+    return module
+
+def lazy_handler(module_path: str, attr: str) -> Callable:
+    """Return a callback that imports `module_path` on first dispatch and then delegates to `attr`"""
+    target = None
+
+    async def callback(update, context):
+        nonlocal target
+        if target is None:
+            target = getattr(load_module(module_path), attr)
+        return await target(update, context)
+
+    callback.__name__ = attr
+    callback.__qualname__ = attr
+    callback.__module__ = module_path
+    return callback
+
+def format_startup_report(phases: Dict[str, float]) -> str:
+    """Render startup phase timings plus any handler modules loaded so far"""
+    lines = ["⏱️ Startup time report:"]
+    for phase, seconds in phases.items():
+        lines.append(f"   {phase:<32} {seconds * 1000:8.1f} ms")
+
+    if module_load_times:
+        lines.append("   Handler modules loaded:")
+        for module_path, seconds in sorted(module_load_times.items(), key=lambda item: item[1], reverse=True):
+            lines.append(f"     {module_path:<46} {seconds * 1000:8.1f} ms")
+
+    return "\n".join(lines)
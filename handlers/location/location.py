@@ -2,7 +2,7 @@ from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, ReplyKe
 from telegram.ext import ContextTypes
 from utils.services.user_api_service import user_api_service
 from utils.services.charging_station_service import charging_station_service
-from utils.services.garage_service import GarageService
+from utils.services.garage_service import garage_service
 from utils.ui.language import language_handler
 from utils.ui.keyboards import Keyboards
 from datetime import datetime
@@ -94,10 +94,8 @@ async def handle_location_received(update: Update, context: ContextTypes.DEFAULT
                 
                 # Automatically show nearby garages
                 from handlers.garage.garage import show_garages_page
-                from utils.services.garage_service import GarageService
                 
-                service = GarageService()
-                garages = await service.get_nearby_garages(latitude, longitude, limit=50)
+                garages = await garage_service.get_nearby_garages(latitude, longitude, limit=50)
                 
                 if garages:
                     context.user_data['nearby_garages'] = garages
@@ -211,9 +209,6 @@ async def handle_nearby_garages(update: Update, context: ContextTypes.DEFAULT_TY
     if location:
         latitude, longitude = location
         
-        # Import and use the existing garage service
-        from utils.services.garage_service import garage_service
-        
         try:
             garages = await garage_service.get_nearby_garages(
                 user_lat=latitude,
@@ -313,8 +308,8 @@ async def handle_clear_location(update: Update, context: ContextTypes.DEFAULT_TY
     user_data = await user_api_service.get_or_create_user(user)
     lang = user_data.get('language', 'en')
     
-    # Clear location by setting to None
-    success = await user_api_service.update_user(
+    # Clear location by setting to None (queued behind any location share still being sent)
+    success = user_api_service.queue_user_update(
         user.id, 
         {'latitude': None, 'longitude': None, 'locationUpdatedAt': None}
     )
@@ -3,8 +3,9 @@ from telegram.ext import ContextTypes
 from utils.ui.language import language_handler
 from utils.ui.keyboards import Keyboards
 from utils.ui.filter_helpers import FilterHelpers
-from utils.services.accessory_service import AccessoryService
+from utils.services.accessory_service import accessory_service
 from typing import List, Dict, Any
+from utils.services.api_client import api_client
 
 class AccessorySearchFilters:
     """Accessory search filters data structure"""
@@ -130,7 +131,7 @@ async def handle_accessory_brand_search(update: Update, context: ContextTypes.DE
     
     # Get available accessory brands
     available_brands = set()
-    service = AccessoryService()
+    service = accessory_service
     accessories = await service.fetch_all_accessories()
     for accessory in accessories:
         if hasattr(accessory, 'brand') and accessory.brand:
@@ -215,7 +216,7 @@ async def handle_apply_accessory_filters(update: Update, context: ContextTypes.D
     accessory_filters = context.user_data.get('accessory_search_filters', {})
     
     # Filter accessories based on applied filters
-    service = AccessoryService()
+    service = accessory_service
     accessories = await service.fetch_all_accessories()
     filtered_accessories = []
     
@@ -334,7 +335,7 @@ async def show_accessory_search_results_page(update: Update, context: ContextTyp
         try:
             chat_id = update.effective_chat.id
             bot = context.bot
-            service = AccessoryService()
+            service = accessory_service
             
             photo_sent = False
             
@@ -369,7 +370,7 @@ async def show_accessory_search_results_page(update: Update, context: ContextTyp
                             # Try with different user agent or headers
                             import aiohttp
                             try:
-                                async with aiohttp.ClientSession() as session:
+                                async with api_client.session() as session:
                                     async with session.get(image_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
                                         if response.status == 200:
                                             image_data = await response.read()
@@ -1,6 +1,6 @@
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, InputMediaPhoto
 from telegram.ext import ContextTypes
-from models.core.product import products  # Changed from cars
+from models.core.product import products, is_catalog_ready  # Changed from cars
 from utils.ui.keyboards import Keyboards
 from utils.ui.language import language_handler
 from utils.ui.filter_helpers import FilterHelpers
@@ -339,6 +339,14 @@ async def apply_search_filters(update: Update, context: ContextTypes.DEFAULT_TYP
     query = update.callback_query
     await query.answer("Searching...")
     
+    # The catalog is still loading in the background; don't report an empty inventory
+    if not is_catalog_ready():
+        await query.message.reply_text(
+            language_handler.get_text("catalog_warming_up", update.effective_user.id),
+            reply_markup=Keyboards.get_catalog_warming_keyboard(update.effective_user.id, query.data)
+        )
+        return
+    
     filters = context.user_data.get('search_filters', SearchFilters().to_dict())
     
     # Filter products based on criteria
@@ -528,6 +536,14 @@ async def handle_more_search_results(update: Update, context: ContextTypes.DEFAU
         
         await query.answer("Loading more search results...")
         
+        # The catalog is still loading in the background; don't report an empty inventory
+        if not is_catalog_ready():
+            await query.message.reply_text(
+                language_handler.get_text("catalog_warming_up", update.effective_user.id),
+                reply_markup=Keyboards.get_catalog_warming_keyboard(update.effective_user.id, query.data)
+            )
+            return
+        
         # Show next page of search results
         await show_search_results_page(update, context, offset)
     else:
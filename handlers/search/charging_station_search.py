@@ -7,11 +7,12 @@ from utils.ui.language import language_handler
 from typing import List, Dict, Any
 import re
 import aiohttp
+from utils.services.api_client import api_client
 
 async def is_valid_image_url(url: str) -> bool:
     """Check if URL points to a valid image"""
     try:
-        async with aiohttp.ClientSession() as session:
+        async with api_client.session() as session:
             async with session.head(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
                 if response.status == 200:
                     content_type = response.headers.get('content-type', '').lower()
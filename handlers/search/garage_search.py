@@ -1,17 +1,18 @@
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from models.core.garage import Garage
-from utils.services.garage_service import GarageService
+from utils.services.garage_service import garage_service
 from utils.ui.keyboards import Keyboards
 from utils.ui.language import language_handler
 from typing import List, Dict, Any
 import re
 import aiohttp
+from utils.services.api_client import api_client
 
 async def is_valid_image_url(url: str) -> bool:
     """Check if URL points to a valid image"""
     try:
-        async with aiohttp.ClientSession() as session:
+        async with api_client.session() as session:
             async with session.head(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
                 if response.status == 200:
                     content_type = response.headers.get('content-type', '').lower()
@@ -79,7 +80,6 @@ async def handle_garage_location_search(update: Update, context: ContextTypes.DE
         )
         
         # Fetch unique locations from garage service
-        garage_service = GarageService()
         locations = await garage_service.get_unique_locations()
         
         if not locations:
@@ -119,7 +119,6 @@ async def handle_garage_service_search(update: Update, context: ContextTypes.DEF
     await query.answer()
     
     # Fetch available services from API
-    garage_service = GarageService()
     services = await garage_service.get_unique_services()
     
     message = f"{language_handler.get_text('select_service_type', update.effective_user.id)}\n\n"
@@ -216,7 +215,6 @@ async def apply_garage_filters(update: Update, context: ContextTypes.DEFAULT_TYP
     
     try:
         # Get garages from service
-        garage_service = GarageService()
         all_garages = await garage_service.fetch_all_garages()
         
         # Apply filters
@@ -291,8 +289,7 @@ async def show_garage_search_results_page(update: Update, context: ContextTypes.
     telegram_id = update.effective_user.id
     
     # Initialize garage service
-    from utils.services.garage_service import GarageService
-    service = GarageService()
+    service = garage_service
     
     # Display each garage in card format
     for i, garage in enumerate(page_garages, start_idx + 1):
@@ -1,6 +1,6 @@
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
-from models.core.user import users
+from utils.services.profile_store import profile_store
 from utils.ui.language import language_handler
 from utils.ui.keyboards import Keyboards
 
@@ -39,23 +39,10 @@ async def handle_language_change(update: Update, context: ContextTypes.DEFAULT_T
     try:
         # Import the API service
         from utils.services.user_api_service import user_api_service
-        from handlers.base import user_cache
         
-        # Update language via API
+        # Record the choice in the profile now; the API is updated in the background
         update_data = {'language': language_code}
-        updated_user = await user_api_service.update_user(telegram_id, update_data)
-        
-        if updated_user:
-            # Update local cache with fresh API data
-            if telegram_id in user_cache:
-                user_cache[telegram_id].update(user_api_service._convert_api_user_to_local(updated_user))
-                pass
-        else:
-            # API update failed, but update local cache anyway
-            if telegram_id in user_cache:
-                user_cache[telegram_id]['language'] = language_code
-        
-        # Always update local language handler (fallback)
+        user_api_service.queue_user_update(telegram_id, update_data)
         language_handler.set_user_language(telegram_id, language_code)
         
         # Send confirmation message
@@ -69,12 +56,7 @@ async def handle_language_change(update: Update, context: ContextTypes.DEFAULT_T
     except Exception as e:
         pass
         
-        # Fallback: update local cache only
-        from handlers.base import user_cache
-        if telegram_id in user_cache:
-            user_cache[telegram_id]['language'] = language_code
-        
-        # Always update local language handler (fallback)
+        # Fallback: update the local profile only
         language_handler.set_user_language(telegram_id, language_code)
         
         await query.message.reply_text(
@@ -103,20 +85,21 @@ async def handle_initial_language_selection(update: Update, context: ContextType
     telegram_id = update.effective_user.id
     language_code = query.data.split('_')[2]  # Extract from 'initial_lang_en' or 'initial_lang_kh'
     
-    # Set user's language preference
+    # Set user's language preference; a user not created yet is created in this language
+    # by get_or_create_user, an existing one is updated in the background
     language_handler.set_user_language(telegram_id, language_code)
+    if profile_store.is_complete(telegram_id):
+        from utils.services.user_api_service import user_api_service
+        user_api_service.queue_user_update(telegram_id, {'language': language_code})
     
     # Mark user as no longer first-time
-    from models.core.user import users
-    user = next((u for u in users if u.telegram_id == telegram_id), None)
-    if user:
-        user.is_first_time = False
+    profile = profile_store.update(telegram_id, is_first_time=False)
     
     # Show welcome message in selected language
     welcome_message = language_handler.get_text(
         "welcome_message", 
         telegram_id, 
-        name=user.first_name if user else "there"
+        name=profile.get('first_name') or update.effective_user.first_name or "there"
     )
     
     await query.message.edit_text(
@@ -2,19 +2,16 @@ from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from datetime import datetime
 from models.data.message import Message, messages
-from models.core.user import users
+from utils.services.profile_store import profile_store
 from utils.ui.language import language_handler
 
 async def contact_support(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
     
-    user = next((user for user in users if user.telegram_id == update.effective_user.id), None)
-    if not user:
-        # If user not found, create a default user_id or handle gracefully
-        user_id = update.effective_user.id  # Use telegram_id as fallback
-    else:
-        user_id = user.id
+    profile = profile_store.get(update.effective_user.id) or {}
+    # Use telegram_id as fallback when the profile has no user id
+    user_id = profile.get('id') or update.effective_user.id
     message = Message(
         id=len(messages) + 1,
         user_id=user_id,
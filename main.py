@@ -1,6 +1,9 @@
 # Keep only these imports at the top:
+import time
+_startup_started = time.perf_counter()
 import logging
-from telegram.ext import Application, CommandHandler, CallbackQueryHandler, MessageHandler, filters
+from telegram import Update
+from telegram.ext import Application, CommandHandler, CallbackQueryHandler, MessageHandler, TypeHandler, ContextTypes, filters
 from utils.config.settings import validate_required_env_vars
 from handlers import (
     start, main_menu, settings_command, unknown_message,
@@ -73,35 +76,105 @@ from handlers import (
     handle_more_accessories,
     handle_contact_accessory_seller,
     handle_copy_accessory_phone,
-)
-from handlers.location.location import (
     request_location,
     handle_location_received,
     handle_nearby_charging_stations,
     handle_nearby_garages,
     show_location_settings,
-    handle_clear_location
+    handle_clear_location,
+)
+from handlers.lazy import format_startup_report, lazy_handler
+from utils.config.settings import (
+    TELEGRAM_TOKEN, CATALOG_REFRESH_INTERVAL, BLOCKING_IO_CHECK, API_BASE_URL, API_BASE_URL_IMG,
+    HTTP_KEEPALIVE_PING_INTERVAL
 )
-from utils.config.settings import TELEGRAM_TOKEN
-from models.core.product import initialize_product_data  # Changed from initialize_car_data
+from models.core.product import initialize_product_data_async, load_product_snapshot
 from models.core.user import initialize_user_data
-from utils.services.data_loader import car_data_loader  # Import directly from utils.services.data_loader
+from utils.services.api_client import api_client
+from utils.services.update_scope import open_update_scope
+from utils.services.session_store import stores as session_stores, format_store_stats
+from utils.services.profile_writer import profile_writer
+
+
+
+async def refresh_catalog_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Periodically rebuild the product catalog and swap it in"""
+    await initialize_product_data_async()
+    print(api_client.format_metrics())
+    if session_stores:
+        print(format_store_stats())
+    if profile_writer.stats['queued']:
+        print(profile_writer.format_stats())
+
+async def prewarm_connections_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Pay DNS, TCP and TLS setup to the API and image hosts before the first user does"""
+    started = time.perf_counter()
+    warmed = await api_client.warm_up([API_BASE_URL, API_BASE_URL_IMG])
+    hosts = ', '.join(f"{origin} x{count}" for origin, count in warmed.items())
+    print(f"🔥 Pre-warmed connections in {(time.perf_counter() - started) * 1000:.0f}ms: {hosts}")
+    print(api_client.format_connections())
 
+async def keepalive_ping_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Cheap HEAD pings so pooled connections are reused instead of timing out while idle"""
+    await api_client.warm_up([API_BASE_URL, API_BASE_URL_IMG])
 
+async def post_init(application: Application) -> None:
+    """Open the shared HTTP session and schedule catalog loading once the bot is polling"""
+    await api_client.start()
+    
+    # Test mode: report or fail on blocking network calls made from handlers and jobs
+    if BLOCKING_IO_CHECK in ('warn', 'raise'):
+        from utils.services.blocking_io import install_blocking_io_guard
+        install_blocking_io_guard(BLOCKING_IO_CHECK)
+        print(f"🧪 Blocking I/O guard installed ({BLOCKING_IO_CHECK} mode)")
+    
+    # The first run starts right away in the background; handlers reply "warming up" until it lands
+    if application.job_queue:
+        application.job_queue.run_repeating(
+            refresh_catalog_job,
+            interval=CATALOG_REFRESH_INTERVAL,
+            first=0,
+            name='catalog_refresh'
+        )
+        application.job_queue.run_once(prewarm_connections_job, when=0, name='connection_prewarm')
+        if HTTP_KEEPALIVE_PING_INTERVAL > 0:
+            application.job_queue.run_repeating(
+                keepalive_ping_job,
+                interval=HTTP_KEEPALIVE_PING_INTERVAL,
+                first=HTTP_KEEPALIVE_PING_INTERVAL,
+                name='keepalive_ping'
+            )
+    else:
+        print("⚠️ JobQueue unavailable (install python-telegram-bot[job-queue]); catalog refreshes disabled")
+        application.create_task(initialize_product_data_async())
+        application.create_task(api_client.warm_up([API_BASE_URL, API_BASE_URL_IMG]))
+
+async def post_shutdown(application: Application) -> None:
+    """Send queued user updates, then close the shared HTTP session and its pooled connections"""
+    await profile_writer.close()
+    await api_client.close()
 
 # Add these CallbackQueryHandlers in the main() function
 def main():
+    startup_phases = {'imports': time.perf_counter() - _startup_started}
+    
     # Validate required environment variables
     validate_required_env_vars()
     
-    # Initialize car data before starting bot
-    print("🚗 Initializing car data from external files...")
-    initialize_product_data()  # Changed from initialize_car_data
+    # Warm-start from the on-disk snapshot when possible; the API load always runs in the background
+    print("🚗 Initializing car data...")
+    phase_started = time.perf_counter()
+    if load_product_snapshot():
+        print("📦 Loaded catalog snapshot, refreshing from API in the background")
+    else:
+        print("⏳ No catalog snapshot, loading from API in the background")
+    startup_phases['catalog snapshot'] = time.perf_counter() - phase_started
     
     # Initialize user data
     print("👤 Initializing user data...")
     initialize_user_data()
     
+    phase_started = time.perf_counter()
     # Increase timeout values to handle slow connections
     application = Application.builder()\
         .token(TELEGRAM_TOKEN)\
@@ -109,8 +182,15 @@ def main():
         .read_timeout(30.0)\
         .write_timeout(30.0)\
         .pool_timeout(30.0)\
+        .post_init(post_init)\
+        .post_shutdown(post_shutdown)\
         .build()
     
+    # Pre-handlers run before the feature handlers: open the per-update scope (one user lookup
+    # per update, shared by all handlers), then resolve the user's language so get_text stays offline
+    application.add_handler(TypeHandler(Update, open_update_scope), group=-2)
+    application.add_handler(TypeHandler(Update, lazy_handler('utils.ui.language', 'resolve_update_language')), group=-1)
+    
     # Command handlers
     application.add_handler(CommandHandler("start", start))
     application.add_handler(CommandHandler("main_menu", main_menu))
@@ -333,17 +413,13 @@ def main():
     application.add_handler(CallbackQueryHandler(start, pattern="^back_to_main$"))
     application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, unknown_message))
     
-
-    
+    startup_phases['application setup'] = time.perf_counter() - phase_started
+    startup_phases['total'] = time.perf_counter() - _startup_started
+    print(format_startup_report(startup_phases))
     
-    pass
     application.run_polling()
 
 if __name__ == '__main__':
-    # Clear all user cache on startup for fresh language detection
-    from handlers.base import clear_user_cache
-    clear_user_cache()
-    
     main()
 
 
@@ -1,5 +1,4 @@
 from typing import List, Optional, Dict, Any
-from utils.ui.language import language_handler
 
 class Accessory:
     """Accessory model for EV accessories"""
@@ -1,3 +1,4 @@
+import asyncio
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
@@ -71,56 +72,107 @@ sell_requests = []
 reviews = []
 transactions = []
 
+# Serializes catalog refreshes (startup load and the periodic job)
+_refresh_lock = asyncio.Lock()
+
+# False until the first catalog load (snapshot or API) has finished
+catalog_ready = False
+
+def is_catalog_ready() -> bool:
+    """Whether the catalog has been loaded at least once"""
+    return catalog_ready
+
+def _build_products(rows: List[dict]) -> List[Product]:
+    """Validate snapshot rows back into Product objects, skipping invalid rows"""
+    built = []
+    
+    for row in rows:
+        try:
+            built.append(Product.model_validate(row))
+        except Exception as e:
+            pass
+    
+    return built
+
+def _dump_products(catalog: List[Product]) -> List[dict]:
+    """Serialize products into JSON-ready rows for the snapshot"""
+    return [product.model_dump(mode='json') for product in catalog]
+
 # Initialize product data from external files
 def initialize_product_data():
-    """Load product data from external CSV/JSON files"""
-    global products, product_listings
-    
+    """Load product data from the API (blocking)"""
+    # Use a private loop so the default loop is left untouched for the bot's run_polling()
+    loop = asyncio.new_event_loop()
     try:
-        # Import here to avoid circular imports
-        from utils.services.data_loader import car_data_loader
-        
-        # Load data from external files
-        product_listings = car_data_loader.load_all_data()
-        
-        # Clear existing products and convert to Product objects
-        products.clear()
-        
-        for listing in product_listings:
-            try:
-                product = Product(
-                    id=listing["id"],
-                    user_id=listing.get("user_id"),
-                    brand=listing["brand"],
-                    model=listing["model"],
-                    year=listing.get("year"),
-                    price=Decimal(str(listing["price"])),
-                    currency=listing.get("currency", "USD"),
-                    description=listing.get("description"),
-                    image_url=listing.get("image_url"),
-                    gallery=listing.get("gallery", []),
-                    location=listing.get("location"),
-                    color=listing.get("color"),
-                    condition=listing.get("condition"),
-                    phone_number=listing.get("phone_number"),
-                    category=listing.get("category"),
-                    is_featured=listing.get("is_featured", False),
-                    sku=listing.get("sku"),
-                    status=listing.get("status", "available"),
-                    created_at=datetime.fromisoformat(listing["created_at"]),
-                    source=listing.get("source")
+        loop.run_until_complete(initialize_product_data_async())
+    finally:
+        loop.close()
+
+async def initialize_product_data_async():
+    """Load product data from the API, swap it in atomically and persist the warm-start snapshot"""
+    global catalog_ready
+    
+    # A refresh that is still running makes a second one pointless
+    if _refresh_lock.locked():
+        return
+    
+    async with _refresh_lock:
+        try:
+            # Import here to avoid circular imports
+            from utils.services.data_loader import car_data_loader
+            from utils.services.catalog_snapshot import save_snapshot
+            
+            # The loader validates rows into Product objects in a single pass
+            new_products = await car_data_loader.load_all_data_async()
+            if not new_products and products:
+                print("Catalog refresh returned no products, keeping the current catalog")
+                return
+            if not car_data_loader.catalog_changed and products:
+                print("Catalog not modified since the last refresh")
+                return
+            
+            # Publish the fully built catalog and the lookups it was built with in one step
+            _swap_catalog(new_products)
+            car_data_loader.publish(new_products)
+            
+            # Only persist a snapshot worth warm-starting from
+            if new_products:
+                rows = await asyncio.to_thread(_dump_products, new_products)
+                await asyncio.to_thread(
+                    save_snapshot, rows, car_data_loader.brands_cache, car_data_loader.categories_cache
                 )
-                products.append(product)
-            except Exception as e:
-                pass
-        
-        pass
-        
-    except Exception as e:
-        pass
-        # Fallback to empty list
-        products.clear()
-        product_listings = []
+            
+        except Exception as e:
+            print(f"Error initializing product data: {e}")
+        finally:
+            # Even a failed first load ends the warm-up; handlers then report what they have
+            catalog_ready = True
+
+def _swap_catalog(new_products: List[Product]) -> None:
+    """Publish a fully built catalog without readers ever seeing a partial list"""
+    global product_listings, catalog_ready
+    
+    # Handlers hold a reference to `products` itself, so replace its contents with a
+    # single slice assignment instead of clear() followed by appends
+    products[:] = new_products
+    product_listings = new_products
+    catalog_ready = True
+
+def load_product_snapshot() -> bool:
+    """Warm-start the catalog from the on-disk snapshot; returns True if products were loaded"""
+    from utils.services.data_loader import car_data_loader
+    from utils.services.catalog_snapshot import load_snapshot
+    
+    snapshot = load_snapshot()
+    if not snapshot or not snapshot['cars']:
+        return False
+    
+    snapshot_products = _build_products(snapshot['cars'])
+    car_data_loader._staged_lookups = (snapshot['brands'], snapshot['categories'])
+    car_data_loader.publish(snapshot_products)
+    
+    _swap_catalog(snapshot_products)
+    return bool(products)
 
 # Global product listings (will be populated by initialize_product_data)
-product_listings = []
\ No newline at end of file
+product_listings = []
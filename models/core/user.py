@@ -20,9 +20,6 @@ class User(BaseModel):
 # Initialize empty list to store data
 users = []
 
-# Import user_api_service for data loading
-from utils.services.user_api_service import user_api_service
-
 def initialize_user_data():
     """Initialize user data from API service"""
     global users
@@ -39,7 +36,4 @@ def initialize_user_data():
     except Exception as e:
         pass
         # Keep empty list as fallback
-        users = []
-
-# Initialize user data when module is imported
-initialize_user_data()
\ No newline at end of file
+        users = []
\ No newline at end of file
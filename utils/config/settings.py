@@ -43,6 +43,61 @@ else:  # development
 API_BASE_URL = os.getenv('API_BASE_URL', 'https://inventoryapiv1-367404119922.asia-southeast1.run.app')
 API_BASE_URL_IMG = os.getenv('API_BASE_URL_IMG', 'https://pub-133f8593b35749f28fa090bc33925b31.r2.dev')
 
+# Catalog Configuration
+CATALOG_REFRESH_INTERVAL = int(os.getenv('CATALOG_REFRESH_INTERVAL', '900'))  # 15 minutes
+# Station/garage/accessory lists: served from cache until the soft TTL, served stale while
+# refreshing in the background until the hard TTL, fetched synchronously after that
+CATALOG_CACHE_SOFT_TTL = int(os.getenv('CATALOG_CACHE_SOFT_TTL', '300'))  # 5 minutes
+CATALOG_CACHE_HARD_TTL = int(os.getenv('CATALOG_CACHE_HARD_TTL', '3600'))  # 1 hour
 
+# HTTP Client Configuration (shared connection pool for API and image requests)
+API_TIMEOUT = int(os.getenv('API_TIMEOUT', '30'))
+HTTP_POOL_LIMIT = int(os.getenv('HTTP_POOL_LIMIT', '100'))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv('HTTP_POOL_LIMIT_PER_HOST', '30'))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv('HTTP_KEEPALIVE_TIMEOUT', '60'))
+HTTP_DNS_CACHE_TTL = int(os.getenv('HTTP_DNS_CACHE_TTL', '300'))
+# Startup warm-up: keep-alive connections opened per API / image host, re-pinged so they stay
+# pooled (keep the interval below HTTP_KEEPALIVE_TIMEOUT; 0 disables the pings)
+HTTP_WARMUP_CONNECTIONS = int(os.getenv('HTTP_WARMUP_CONNECTIONS', '2'))
+HTTP_KEEPALIVE_PING_INTERVAL = int(os.getenv('HTTP_KEEPALIVE_PING_INTERVAL', '45'))
 
-pass
\ No newline at end of file
+# Resilience: per-endpoint deadlines (seconds, retries included; each try gets an even share) as "Endpoint=seconds,..."
+API_ENDPOINT_TIMEOUTS = {
+    name.strip(): float(seconds)
+    for name, seconds in (
+        item.split('=', 1)
+        for item in os.getenv('API_ENDPOINT_TIMEOUTS', 'Product=30,Category=5,Brand=5,Garage=10,ChargingStation=10,Accessory=10,User=5').split(',')
+        if '=' in item
+    )
+}
+API_MAX_RETRIES = int(os.getenv('API_MAX_RETRIES', '2'))
+API_RETRY_BACKOFF = float(os.getenv('API_RETRY_BACKOFF', '0.3'))  # base delay, doubled per attempt
+API_RETRY_BACKOFF_MAX = float(os.getenv('API_RETRY_BACKOFF_MAX', '3'))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', '5'))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv('CIRCUIT_RESET_TIMEOUT', '30'))
+
+# Per-user session data (user records, languages): LRU-bounded, refreshed from the API after the TTL
+SESSION_STORE_MAX_USERS = int(os.getenv('SESSION_STORE_MAX_USERS', '50000'))
+SESSION_STORE_TTL = float(os.getenv('SESSION_STORE_TTL', '3600'))  # 1 hour
+# Seconds a "user not found" answer is remembered, so unregistered users don't repeat the lookup
+USER_NOT_FOUND_TTL = float(os.getenv('USER_NOT_FOUND_TTL', '30'))
+
+# Write-behind user updates (language, location): applied locally at once and sent to the API
+# after USER_WRITE_DELAY seconds (changes within that window are merged), retried with backoff
+USER_WRITE_DELAY = float(os.getenv('USER_WRITE_DELAY', '1'))
+USER_WRITE_MAX_ATTEMPTS = int(os.getenv('USER_WRITE_MAX_ATTEMPTS', '5'))
+USER_WRITE_RETRY_DELAY = float(os.getenv('USER_WRITE_RETRY_DELAY', '2'))  # doubled per failed round
+
+# Optional on-disk cache of inventory GET responses, shared across restarts and workers
+HTTP_CACHE_ENABLED = os.getenv('HTTP_CACHE_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+HTTP_CACHE_DIR = os.getenv('HTTP_CACHE_DIR', 'data/http_cache')
+HTTP_CACHE_TTL = float(os.getenv('HTTP_CACHE_TTL', '300'))  # served without a request while younger
+HTTP_CACHE_MAX_STALE = float(os.getenv('HTTP_CACHE_MAX_STALE', '86400'))  # served while the API is unreachable
+HTTP_CACHE_MAX_MB = int(os.getenv('HTTP_CACHE_MAX_MB', '200'))
+
+# Debug: flag blocking socket I/O on the event loop thread ('', 'warn' or 'raise')
+BLOCKING_IO_CHECK = os.getenv('BLOCKING_IO_CHECK', '').lower()
+
+
+
+pass
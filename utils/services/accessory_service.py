@@ -1,11 +1,13 @@
 import asyncio
+import math
 import aiohttp
 import os
 import time
-import requests
 from typing import List, Optional, Dict, Any
 from models.core.accessory import Accessory
-from utils.config.settings import API_BASE_URL, API_BASE_URL_IMG
+from utils.config.settings import API_BASE_URL, API_BASE_URL_IMG, CATALOG_CACHE_SOFT_TTL, CATALOG_CACHE_HARD_TTL
+from utils.services.api_client import api_client
+from utils.services.single_flight import SingleFlight
 
 class AccessoryService:
     """Service for handling accessory data from API"""
@@ -18,64 +20,92 @@ class AccessoryService:
         self.r2_image_base_url = API_BASE_URL_IMG if API_BASE_URL_IMG.endswith('/') else f"{API_BASE_URL_IMG}/"
         self.accessories_cache = []
         self.cache_timestamp = 0
-        self.cache_duration = 300  # 5 minutes
+        # Stale-while-revalidate: fresh until the soft TTL, served stale until the hard TTL
+        self.cache_duration = CATALOG_CACHE_SOFT_TTL
+        self.cache_hard_ttl = max(CATALOG_CACHE_HARD_TTL, CATALOG_CACHE_SOFT_TTL)
         # Image URL validation cache
         self.image_url_cache = {}
         self.image_cache_duration = 1800  # 30 minutes
         # Pagination support
         self.total_items = 0
         self.items_per_page = 10
+        # Coalesces concurrent full-list fetches after a cache miss
+        self.refresh_flight = SingleFlight()
         
     async def fetch_all_accessories(self) -> List[Accessory]:
         """Fetch all accessories from API with caching"""
-        current_time = time.time()
+        cache_age = time.time() - self.cache_timestamp
+        
+        # Check if cache is still fresh
+        if self.accessories_cache and cache_age < self.cache_duration:
+            return self.accessories_cache
         
-        # Check if cache is still valid
-        if (self.accessories_cache and 
-            current_time - self.cache_timestamp < self.cache_duration):
+        # Stale but within the hard TTL: answer now and refresh in the background
+        if self.accessories_cache and cache_age < self.cache_hard_ttl:
+            self.refresh_flight.start('accessories', self._refresh_accessories)
             return self.accessories_cache
         
+        # Missing or too old: wait, sharing a single upstream fetch with concurrent misses
+        return await self.refresh_flight.do('accessories', self._refresh_accessories)
+    
+    async def _refresh_accessories(self) -> List[Accessory]:
+        """Download the full accessory list and rebuild the cache"""
+        current_time = time.time()
+        
         # Fetch fresh data from API
         try:
-            # First, get the total count
-            self._update_total_count()
-            
             # Since API pagination might be broken, request all items in one go
             # Use a large page size to get all accessories
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
+            # Rounded up to a whole thousand so the request, and with it the stored
+            # validators, stays the same while the catalog grows
+            page_size = max(1, math.ceil(self.total_items / 1000)) * 1000
+            async with api_client.session() as session:
+                # Revalidate with ETag / Last-Modified; a 304 keeps the parsed cache as is
+                response = await api_client.get_json(
+                    session,
                     f"{self.base_url}/Accessory",
-                    params={'page': 1, 'pageSize': max(self.total_items, 1000)}
-                ) as response:
-                    if response.status == 200:
-                        response_data = await response.json()
-                        
-                        # Handle different response formats
-                        if isinstance(response_data, dict) and 'data' in response_data:
-                            accessories_data = response_data['data']
-                        elif isinstance(response_data, list):
-                            accessories_data = response_data
-                        else:
-                            print("Unexpected response format")
-                            return self.accessories_cache if self.accessories_cache else []
-                        
-                        # Convert to Accessory objects
-                        self.accessories_cache = [Accessory.from_api_data(acc_data) for acc_data in accessories_data]
-                        self.cache_timestamp = current_time
-                        return self.accessories_cache
+                    params={'page': 1, 'pageSize': page_size},
+                    keep_payload=False,
+                    conditional=bool(self.accessories_cache)
+                )
+                if response.not_modified:
+                    self.cache_timestamp = current_time
+                    return self.accessories_cache
+                if response.status == 200:
+                    response_data = response.data
+                    
+                    # Handle different response formats
+                    if isinstance(response_data, dict) and 'data' in response_data:
+                        accessories_data = response_data['data']
+                    elif isinstance(response_data, list):
+                        accessories_data = response_data
                     else:
-                        print(f"Error fetching accessories: HTTP {response.status}")
+                        print("Unexpected response format")
                         return self.accessories_cache if self.accessories_cache else []
-                        
+                    
+                    # Convert to Accessory objects
+                    self.accessories_cache = [Accessory.from_api_data(acc_data) for acc_data in accessories_data]
+                    self.cache_timestamp = current_time
+                    
+                    # The count comes with the list (totalItems), so no separate count request
+                    self._set_total_count(response_data)
+                    if self.total_items > page_size:
+                        # More than fit in the page asked for: ask again with room for all of them
+                        return await self._refresh_accessories()
+                    return self.accessories_cache
+                else:
+                    print(f"Error fetching accessories: HTTP {response.status}")
+                    return self.accessories_cache if self.accessories_cache else []
+                    
         except Exception as e:
             print(f"Error fetching all accessories: {e}")
             # Fallback: try without pagination parameters
             try:
                 print("Falling back to simple API call...")
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(f"{self.base_url}/Accessory") as response:
+                async with api_client.session() as session:
+                    async with api_client.request(session, 'GET', f"{self.base_url}/Accessory") as response:
                         if response.status == 200:
-                            response_data = await response.json()
+                            response_data = await api_client.read_json(response)
                             
                             # Handle different response formats
                             if isinstance(response_data, dict) and 'data' in response_data:
@@ -101,13 +131,14 @@ class AccessoryService:
             page_size = self.items_per_page
             
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
+            async with api_client.session() as session:
+                async with api_client.request(
+                    session, 'GET',
                     f"{self.base_url}/Accessory",
                     params={'page': page, 'pageSize': page_size}
                 ) as response:
                     if response.status == 200:
-                        data = await response.json()
+                        data = await api_client.read_json(response)
                         accessories_data = data.get('data', [])
                         return [Accessory.from_api_data(acc_data) for acc_data in accessories_data]
                     else:
@@ -117,39 +148,26 @@ class AccessoryService:
             print(f"Error fetching page {page}: {e}")
             return []
     
-    def _update_total_count(self) -> None:
-        """Update the total count of accessories"""
-        try:
-            # Use synchronous request for initialization
-            response = requests.get(
-                f"{self.base_url}/Accessory",
-                params={'page': 1, 'pageSize': 1},
-                timeout=self.api_timeout
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            self.total_items = data.get('totalItems', 0)
-            print(f"Total accessories: {self.total_items}")
-            
-        except Exception as e:
-            print(f"Error getting total accessory count: {e}")
-            # Keep previous count if available
-            if not self.total_items:
-                self.total_items = 0
+    def _set_total_count(self, response_data: Any) -> None:
+        """Take the total count of accessories from a list response (totalItems, else the rows received)"""
+        if isinstance(response_data, dict) and response_data.get('totalItems') is not None:
+            self.total_items = response_data['totalItems']
+        else:
+            self.total_items = len(self.accessories_cache)
     
-    def get_total_count(self) -> int:
+    async def get_total_count(self) -> int:
         """Get the total number of accessories"""
         if not self.total_items:
-            self._update_total_count()
+            # Loading the (cached) list sets the count
+            await self.fetch_all_accessories()
         return self.total_items
     
-    def get_total_pages(self, page_size: int = None) -> int:
+    async def get_total_pages(self, page_size: int = None) -> int:
         """Get the total number of pages"""
         if page_size is None:
             page_size = self.items_per_page
             
-        total_count = self.get_total_count()
+        total_count = await self.get_total_count()
         if total_count == 0 or page_size == 0:
             return 0
             
@@ -207,14 +225,14 @@ class AccessoryService:
     async def fetch_accessory_by_id(self, accessory_id: int) -> Optional[Accessory]:
         """Get specific accessory by ID from API"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.base_url}/Accessory/{accessory_id}") as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return Accessory.from_api_data(data)
-                    else:
-                        print(f"Error fetching accessory {accessory_id}: HTTP {response.status}")
-                        return None
+            async with api_client.session() as session:
+                # Revalidated, and served from the on-disk response cache when that is enabled
+                response = await api_client.get_json(session, f"{self.base_url}/Accessory/{accessory_id}")
+                if response.ok:
+                    return Accessory.from_api_data(response.data)
+                else:
+                    print(f"Error fetching accessory {accessory_id}: HTTP {response.status}")
+                    return None
         except Exception as e:
             print(f"Error fetching accessory {accessory_id}: {e}")
             return None
@@ -305,4 +323,7 @@ class AccessoryService:
         if image_filename.startswith(('http://', 'https://')):
             return image_filename
             
-        return f"{self.image_base_url}{image_filename}"
\ No newline at end of file
+        return f"{self.image_base_url}{image_filename}"
+
+# Global instance
+accessory_service = AccessoryService()
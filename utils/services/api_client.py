@@ -0,0 +1,451 @@
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, Optional
+from urllib.parse import urlencode, urlsplit
+import aiohttp
+from utils.services.json_codec import json_codec
+from utils.services.response_cache import CachedEntry, response_cache
+from utils.config.settings import (
+    API_TIMEOUT, HTTP_POOL_LIMIT, HTTP_POOL_LIMIT_PER_HOST, HTTP_KEEPALIVE_TIMEOUT, HTTP_DNS_CACHE_TTL,
+    HTTP_WARMUP_CONNECTIONS,
+    API_ENDPOINT_TIMEOUTS, API_MAX_RETRIES, API_RETRY_BACKOFF, API_RETRY_BACKOFF_MAX,
+    CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT
+)
+
+# Only safe-to-repeat requests are retried
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS')
+# Upstream statuses that mean "try again later" rather than "your request is wrong"
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+class CircuitOpenError(aiohttp.ClientError):
+    """Raised instead of calling an endpoint whose circuit breaker is open"""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"Circuit open for {endpoint}, retrying in {retry_in:.0f}s")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open (fail fast) -> half-open (one trial call)"""
+
+    def __init__(self, endpoint: str, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 reset_timeout: float = CIRCUIT_RESET_TIMEOUT):
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now; an expired open breaker lets one trial through.
+
+        A trial that has been out for longer than the reset timeout without reporting
+        back is given up on and another one is let through.
+        """
+        if self.state == 'closed':
+            return True
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = 'half_open'
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+    def retry_in(self) -> float:
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def record_success(self) -> None:
+        if self.state != 'closed':
+            print(f"✅ Circuit closed for {self.endpoint}")
+        self.state = 'closed'
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == 'half_open' or self.failures >= self.failure_threshold:
+            if self.state != 'open':
+                self.trips += 1
+                print(f"⚠️ Circuit opened for {self.endpoint} after {self.failures} failures")
+            self.state = 'open'
+            self.opened_at = time.monotonic()
+
+class CachedValidators:
+    """Validators (and optionally the decoded body) from the last 200 response for a URL"""
+
+    def __init__(self, etag: Optional[str], last_modified: Optional[str], payload: Any = None):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.payload = payload
+        self.stored_at = time.time()
+
+class ApiResponse:
+    """Result of an API GET: the status, the decoded body and whether it was a 304 revalidation"""
+
+    def __init__(self, status: int, data: Any = None, not_modified: bool = False):
+        self.status = status
+        self.data = data
+        self.not_modified = not_modified
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 200 or self.not_modified
+
+class ApiClient:
+    """Shared pooled HTTP session plus validator-aware GETs (ETag / Last-Modified revalidation)"""
+
+    def __init__(self):
+        # cache key (URL plus sorted query) -> validators of the last full response
+        self.validators: Dict[str, CachedValidators] = {}
+        self.stats = {'full': 0, 'not_modified': 0, 'errors': 0}
+        # Resilience counters; per-endpoint breaker state is added by metrics()
+        self.counters = {'requests': 0, 'retries': 0, 'failures': 0, 'short_circuited': 0}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        # Keep-alive pool shared by every service; opened in post_init, closed in post_shutdown
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Connection setup cost seen through aiohttp tracing (seconds are cumulative)
+        self.connections = {
+            'new': 0, 'reused': 0, 'connect_seconds': 0.0,
+            'dns_lookups': 0, 'dns_cache_hits': 0, 'dns_seconds': 0.0,
+            'warm_pings': 0, 'warm_failures': 0
+        }
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        """Count new vs. reused connections and time DNS lookups and TCP/TLS handshakes"""
+        trace = aiohttp.TraceConfig()
+
+        async def on_connection_create_start(session, ctx, params):
+            ctx.connect_started = time.perf_counter()
+
+        async def on_connection_create_end(session, ctx, params):
+            self.connections['new'] += 1
+            self.connections['connect_seconds'] += time.perf_counter() - ctx.connect_started
+
+        async def on_connection_reuseconn(session, ctx, params):
+            self.connections['reused'] += 1
+
+        async def on_dns_resolvehost_start(session, ctx, params):
+            ctx.dns_started = time.perf_counter()
+
+        async def on_dns_resolvehost_end(session, ctx, params):
+            self.connections['dns_lookups'] += 1
+            self.connections['dns_seconds'] += time.perf_counter() - ctx.dns_started
+
+        async def on_dns_cache_hit(session, ctx, params):
+            self.connections['dns_cache_hits'] += 1
+
+        trace.on_connection_create_start.append(on_connection_create_start)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+        trace.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+        trace.on_dns_cache_hit.append(on_dns_cache_hit)
+        return trace
+
+    def _new_session(self) -> aiohttp.ClientSession:
+        """Create a keep-alive session with the configured connection limits"""
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_LIMIT,
+            limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=HTTP_DNS_CACHE_TTL
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=API_TIMEOUT),
+            trace_configs=[self._trace_config()]
+        )
+
+    async def start(self) -> None:
+        """Open the shared session on the running event loop"""
+        if self._session is None or self._session.closed:
+            self._session = self._new_session()
+            self._loop = asyncio.get_running_loop()
+            print(f"🌐 Shared HTTP session ready (pool {HTTP_POOL_LIMIT}, {HTTP_POOL_LIMIT_PER_HOST} per host)")
+
+    async def close(self) -> None:
+        """Close the shared session and its pooled connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+    async def warm_up(self, urls: Iterable[str], connections: int = HTTP_WARMUP_CONNECTIONS) -> Dict[str, int]:
+        """Open keep-alive connections to the hosts of `urls` (DNS, TCP and TLS) with HEAD requests.
+
+        Any answer counts, even an error status: the point is a pooled connection, not
+        the response. Returns the number of connections that succeeded per origin. Run
+        again every HTTP_KEEPALIVE_PING_INTERVAL so idle connections are not dropped.
+        """
+        origins = []
+        for url in urls:
+            parts = urlsplit(url)
+            origin = f"{parts.scheme}://{parts.netloc}"
+            if parts.netloc and origin not in origins:
+                origins.append(origin)
+
+        async with self.session() as session:
+            async def ping(origin: str) -> bool:
+                self.connections['warm_pings'] += 1
+                try:
+                    async with session.head(f"{origin}/", allow_redirects=False,
+                                            timeout=aiohttp.ClientTimeout(total=10)):
+                        return True
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    self.connections['warm_failures'] += 1
+                    return False
+
+            # All pings to one origin run at once, so each ends up on its own pooled connection
+            outcomes = await asyncio.gather(*(ping(origin) for origin in origins for _ in range(connections)))
+
+        return {
+            origin: sum(outcomes[index * connections:(index + 1) * connections])
+            for index, origin in enumerate(origins)
+        }
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[aiohttp.ClientSession]:
+        """Yield the shared session without closing it.
+
+        Code running outside the bot's loop (startup wrappers, scripts) gets a
+        short-lived session of its own instead.
+        """
+        shared = self._session
+        if shared is not None and not shared.closed and self._loop is asyncio.get_running_loop():
+            yield shared
+            return
+
+        temporary = self._new_session()
+        try:
+            yield temporary
+        finally:
+            await temporary.close()
+
+    @staticmethod
+    def endpoint_of(url: str) -> str:
+        """Endpoint name used for timeouts and breakers: the host plus the first path segment"""
+        parts = urlsplit(url)
+        segment = parts.path.strip('/').split('/', 1)[0]
+        return f"{parts.netloc}/{segment}"
+
+    @staticmethod
+    def deadline_for(endpoint: str) -> float:
+        """Total time budget for one call to an endpoint, retries included"""
+        return API_ENDPOINT_TIMEOUTS.get(endpoint.split('/', 1)[-1], API_TIMEOUT)
+
+    def breaker_for(self, endpoint: str) -> CircuitBreaker:
+        if endpoint not in self.breakers:
+            self.breakers[endpoint] = CircuitBreaker(endpoint)
+        return self.breakers[endpoint]
+
+    def metrics(self) -> Dict[str, Any]:
+        """Counters for requests, retries, breaker trips and revalidation"""
+        return {
+            **self.counters,
+            'trips': sum(breaker.trips for breaker in self.breakers.values()),
+            'open_circuits': [endpoint for endpoint, breaker in self.breakers.items() if breaker.state != 'closed'],
+            'connections': dict(self.connections),
+            'revalidation': dict(self.stats),
+            'disk_cache': dict(response_cache.stats) if response_cache.enabled else None
+        }
+
+    def format_metrics(self) -> str:
+        metrics = self.metrics()
+        open_circuits = ', '.join(metrics['open_circuits']) or 'none'
+        return (f"📈 API: {metrics['requests']} requests, {metrics['retries']} retries, "
+                f"{metrics['failures']} failures, {metrics['short_circuited']} short-circuited, "
+                f"{metrics['trips']} breaker trips (open: {open_circuits}), "
+                f"{metrics['revalidation']['not_modified']} not modified, "
+                f"{self.format_connections()}"
+                + (f", disk cache {metrics['disk_cache']}" if metrics['disk_cache'] else ""))
+
+    def format_connections(self) -> str:
+        connections = self.connections
+        average = connections['connect_seconds'] / connections['new'] * 1000 if connections['new'] else 0
+        return (f"{connections['new']} new connections ({connections['connect_seconds']:.2f}s connecting, "
+                f"{average:.0f}ms avg), {connections['reused']} reused, "
+                f"{connections['dns_lookups']} DNS lookups ({connections['dns_seconds']:.2f}s)")
+
+    @asynccontextmanager
+    async def request(self, session: aiohttp.ClientSession, method: str, url: str,
+                      deadline: Optional[float] = None, **kwargs) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Send a request through the endpoint's circuit breaker, within its deadline.
+
+        Idempotent requests are retried with jittered exponential backoff on connection
+        errors, timeouts and 429/5xx answers while the deadline allows. Each try gets an even
+        share of the deadline (the last one whatever is left), so a try that times out leaves
+        time for the next. The final response
+        is yielded whatever its status; CircuitOpenError is raised while the breaker is open
+        so callers fall back to cached data straight away.
+        """
+        endpoint = self.endpoint_of(url)
+        breaker = self.breaker_for(endpoint)
+        if not breaker.allow():
+            self.counters['short_circuited'] += 1
+            raise CircuitOpenError(endpoint, breaker.retry_in())
+
+        max_attempts = 1 + (API_MAX_RETRIES if method.upper() in IDEMPOTENT_METHODS else 0)
+        budget = deadline or self.deadline_for(endpoint)
+        budget_ends = time.monotonic() + budget
+        per_try = budget / max_attempts
+        
+        # Any way out that is not a recorded success counts as a failure, including
+        # cancellation and unexpected errors, so a half-open trial always reports back
+        succeeded = False
+        try:
+            for attempt in range(max_attempts):
+                remaining = budget_ends - time.monotonic()
+                try_timeout = remaining if attempt + 1 == max_attempts else min(per_try, remaining)
+                self.counters['requests'] += 1
+                try:
+                    response = await session.request(
+                        method, url, timeout=aiohttp.ClientTimeout(total=max(try_timeout, 0.1)), **kwargs
+                    )
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    response, error = None, e
+                else:
+                    error = None
+                    if response.status not in RETRYABLE_STATUSES:
+                        succeeded = True
+                        breaker.record_success()
+                        try:
+                            yield response
+                        finally:
+                            response.release()
+                        return
+                
+                # Full jitter: sleep a random slice of the exponential backoff window
+                backoff = random.uniform(0, min(API_RETRY_BACKOFF_MAX, API_RETRY_BACKOFF * 2 ** attempt))
+                can_retry = attempt + 1 < max_attempts and budget_ends - time.monotonic() > backoff
+                if can_retry:
+                    if response is not None:
+                        response.release()
+                    self.counters['retries'] += 1
+                    await asyncio.sleep(backoff)
+                    continue
+                
+                self.counters['failures'] += 1
+                if response is None:
+                    raise error
+                try:
+                    yield response
+                finally:
+                    response.release()
+                return
+        finally:
+            if not succeeded:
+                breaker.record_failure()
+
+    @staticmethod
+    async def read_json(response: aiohttp.ClientResponse) -> Any:
+        """Decode a response body with the configured JSON codec (orjson when installed)"""
+        return json_codec.loads(await response.read())
+
+    @staticmethod
+    def cache_key(url: str, params: Optional[Dict] = None) -> str:
+        """Stable key for a URL and its query parameters"""
+        if not params:
+            return url
+        return f"{url}?{urlencode(sorted((str(k), str(v)) for k, v in params.items()))}"
+
+    def conditional_headers(self, key: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for a previously fetched resource"""
+        cached = self.validators.get(key)
+        if cached is None:
+            return {}
+
+        headers = {}
+        if cached.etag:
+            headers['If-None-Match'] = cached.etag
+        if cached.last_modified:
+            headers['If-Modified-Since'] = cached.last_modified
+        return headers
+
+    def remember(self, key: str, response: aiohttp.ClientResponse, payload: Any = None) -> None:
+        """Store the validators of a 200 response; responses without validators are forgotten"""
+        self.store_validators(key, response.headers.get('ETag'), response.headers.get('Last-Modified'), payload)
+
+    def store_validators(self, key: str, etag: Optional[str], last_modified: Optional[str], payload: Any = None) -> None:
+        if etag or last_modified:
+            self.validators[key] = CachedValidators(etag, last_modified, payload)
+        else:
+            self.validators.pop(key, None)
+
+    def record(self, response: aiohttp.ClientResponse) -> None:
+        """Count a response in the revalidation stats"""
+        if response.status == 304:
+            self.stats['not_modified'] += 1
+        elif response.status == 200:
+            self.stats['full'] += 1
+        else:
+            self.stats['errors'] += 1
+
+    async def get_json(self, session: aiohttp.ClientSession, url: str, params: Optional[Dict] = None,
+                       keep_payload: bool = True, conditional: bool = True) -> ApiResponse:
+        """GET a JSON resource, revalidating with stored validators when possible.
+
+        On a 304 the body is not downloaded or parsed; `data` is the payload stored with the
+        validators when `keep_payload` was set, otherwise None and the caller reuses what it
+        built from the earlier response. Pass `conditional=False` when that copy is gone.
+
+        Inventory endpoints also go through the on-disk response cache when it is enabled:
+        a fresh entry is returned without a request, a stale one is revalidated, and one
+        within HTTP_CACHE_MAX_STALE is served if the API cannot be reached.
+        """
+        key = self.cache_key(url, params)
+        cached = self.validators.get(key)
+        disk_entry = await response_cache.get(url, key)
+
+        if disk_entry is not None and disk_entry.is_fresh:
+            response_cache.stats['fresh_hits'] += 1
+            return ApiResponse(200, json_codec.loads(disk_entry.body))
+
+        headers = self.conditional_headers(key) if conditional else {}
+        if not headers and disk_entry is not None:
+            cached = None
+            headers = disk_entry.conditional_headers()
+
+        try:
+            async with self.request(session, 'GET', url, params=params, headers=headers) as response:
+                self.record(response)
+
+                if response.status == 304 and cached is not None:
+                    if disk_entry is not None:
+                        await response_cache.refresh(disk_entry)
+                    return ApiResponse(304, cached.payload, not_modified=True)
+                if response.status == 304 and disk_entry is not None:
+                    # Revalidated the copy on disk (e.g. after a restart): parse it instead of downloading
+                    await response_cache.refresh(disk_entry)
+                    data = json_codec.loads(disk_entry.body)
+                    self.store_validators(key, disk_entry.etag, disk_entry.last_modified, data if keep_payload else None)
+                    return ApiResponse(200, data)
+                if response.status != 200:
+                    if response.status >= 500:
+                        return self._serve_stale(url, disk_entry) or ApiResponse(response.status)
+                    return ApiResponse(response.status)
+
+                body = await response.read()
+                data = json_codec.loads(body)
+                self.remember(key, response, data if keep_payload else None)
+                await response_cache.put(url, key, body, response.headers)
+                return ApiResponse(200, data)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            stale = self._serve_stale(url, disk_entry)
+            if stale is None:
+                raise
+            return stale
+
+    @staticmethod
+    def _serve_stale(url: str, disk_entry: Optional[CachedEntry]) -> Optional[ApiResponse]:
+        """The on-disk copy of a resource while the API is failing, if one is recent enough"""
+        if disk_entry is None or not disk_entry.usable_offline:
+            return None
+        response_cache.stats['stale_served'] += 1
+        print(f"⚠️ API unavailable, serving {url} from the response cache ({disk_entry.age:.0f}s old)")
+        return ApiResponse(200, json_codec.loads(disk_entry.body))
+
+# Global instance shared by the data loader, the API services and the handlers
+api_client = ApiClient()
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import socket
+import traceback
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List
+
+# Socket methods that wait on the network when the socket is in blocking mode
+_GUARDED_SOCKET_METHODS = ('connect', 'connect_ex', 'send', 'sendall', 'sendto', 'recv', 'recv_into', 'recvfrom')
+
+# Messages for every blocking call seen on the event loop thread while the guard was installed
+violations: List[str] = []
+_originals: Dict[str, Callable] = {}
+_mode = 'warn'
+
+class BlockingCallOnLoopError(RuntimeError):
+    """Raised in 'raise' mode when blocking network I/O runs on the event loop thread"""
+
+def _on_loop_thread() -> bool:
+    """Whether the caller is running inside an event loop (as opposed to a worker thread)"""
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+def _caller_location() -> str:
+    """The innermost stack frame that belongs to the bot rather than a library"""
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    for frame in reversed(traceback.extract_stack()[:-3]):
+        if frame.filename.startswith(root) and frame.filename != __file__ and 'site-packages' not in frame.filename:
+            return f"{os.path.relpath(frame.filename, root)}:{frame.lineno} in {frame.name}"
+    return "unknown location"
+
+def _report(call: str) -> None:
+    message = f"Blocking {call} on the event loop thread at {_caller_location()}"
+    violations.append(message)
+    if _mode == 'raise':
+        raise BlockingCallOnLoopError(message)
+    print(f"⚠️ {message}")
+
+def _guard_socket_method(name: str) -> Callable:
+    original = _originals[name]
+
+    def guarded(sock, *args, **kwargs):
+        # Sockets owned by asyncio are non-blocking (timeout 0) and are fine
+        if sock.gettimeout() != 0 and _on_loop_thread():
+            _report(f"socket.{name}()")
+        return original(sock, *args, **kwargs)
+
+    guarded.__name__ = name
+    return guarded
+
+def _guarded_getaddrinfo(*args, **kwargs):
+    # asyncio resolves names in its executor; a direct call on the loop thread blocks it
+    if _on_loop_thread():
+        _report("socket.getaddrinfo()")
+    return _originals['getaddrinfo'](*args, **kwargs)
+
+def install_blocking_io_guard(mode: str = 'warn') -> None:
+    """Flag blocking socket I/O and DNS lookups made from the event loop thread.
+
+    `mode` is 'warn' (print and record) or 'raise' (raise BlockingCallOnLoopError).
+    """
+    global _mode
+    _mode = mode
+    if _originals:
+        return
+
+    for name in _GUARDED_SOCKET_METHODS:
+        _originals[name] = getattr(socket.socket, name)
+    _originals['getaddrinfo'] = socket.getaddrinfo
+
+    for name in _GUARDED_SOCKET_METHODS:
+        setattr(socket.socket, name, _guard_socket_method(name))
+    socket.getaddrinfo = _guarded_getaddrinfo
+
+def uninstall_blocking_io_guard() -> None:
+    """Restore the original socket functions"""
+    if not _originals:
+        return
+
+    socket.getaddrinfo = _originals.pop('getaddrinfo')
+    for name in _GUARDED_SOCKET_METHODS:
+        setattr(socket.socket, name, _originals.pop(name))
+
+@contextmanager
+def blocking_io_guard(mode: str = 'raise') -> Iterator[List[str]]:
+    """Install the guard for the duration of a block and yield the violations list"""
+    violations.clear()
+    install_blocking_io_guard(mode)
+    try:
+        yield violations
+    finally:
+        uninstall_blocking_io_guard()
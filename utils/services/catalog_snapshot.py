@@ -0,0 +1,67 @@
+import gzip
+import os
+import tempfile
+import time
+from typing import List, Dict, Optional, Any
+from utils.services.json_codec import json_codec
+
+# Bump whenever the shape of the serialized products changes
+SNAPSHOT_VERSION = 2
+SNAPSHOT_PATH = os.getenv('CATALOG_SNAPSHOT_PATH', os.path.join('data', 'catalog_snapshot.json.gz'))
+
+def _restore_id(key: str) -> Any:
+    """Convert a JSON object key back to an integer ID when it looks like one"""
+    return int(key) if key.lstrip('-').isdigit() else key
+
+def save_snapshot(cars: List[Dict], brands: Dict[int, str], categories: Dict[int, str],
+                  path: str = SNAPSHOT_PATH) -> bool:
+    """Persist the converted catalog and lookup maps as a compact gzipped JSON snapshot"""
+    snapshot = {
+        'version': SNAPSHOT_VERSION,
+        'saved_at': time.time(),
+        'brands': brands,
+        'categories': categories,
+        'cars': cars
+    }
+
+    try:
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok=True)
+
+        # Write to a temp file and rename so readers never see a partial snapshot
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.catalog_snapshot_')
+        try:
+            with os.fdopen(fd, 'wb') as raw_file, gzip.GzipFile(fileobj=raw_file, mode='wb', compresslevel=6) as gz_file:
+                gz_file.write(json_codec.dumps(snapshot))
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return True
+    except Exception as e:
+        print(f"Error saving catalog snapshot: {e}")
+        return False
+
+def load_snapshot(path: str = SNAPSHOT_PATH) -> Optional[Dict[str, Any]]:
+    """Load a catalog snapshot, returning None if it is missing, corrupt or from another version"""
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with gzip.open(path, 'rb') as gz_file:
+            snapshot = json_codec.loads(gz_file.read())
+    except Exception as e:
+        print(f"Error reading catalog snapshot: {e}")
+        return None
+
+    if not isinstance(snapshot, dict) or snapshot.get('version') != SNAPSHOT_VERSION:
+        print("Ignoring catalog snapshot from an incompatible version")
+        return None
+
+    # JSON object keys are always strings; restore the integer IDs used by the loader
+    snapshot['brands'] = {_restore_id(k): v for k, v in snapshot.get('brands', {}).items()}
+    snapshot['categories'] = {_restore_id(k): v for k, v in snapshot.get('categories', {}).items()}
+    snapshot['cars'] = snapshot.get('cars', [])
+    return snapshot
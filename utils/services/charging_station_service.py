@@ -1,13 +1,14 @@
+import asyncio
 import aiohttp
 import math
 import os
 import re
 import time
-import aiohttp
-import requests
 from typing import List, Optional, Dict, Any, Tuple
 from models.core.charging_station import ChargingStation
-from utils.config.settings import API_BASE_URL_IMG
+from utils.config.settings import API_BASE_URL, API_BASE_URL_IMG, CATALOG_CACHE_SOFT_TTL, CATALOG_CACHE_HARD_TTL
+from utils.services.api_client import api_client
+from utils.services.single_flight import SingleFlight
 
 # Get API timeout from environment variables
 api_timeout = int(os.getenv('API_TIMEOUT', '30'))
@@ -15,72 +16,103 @@ api_timeout = int(os.getenv('API_TIMEOUT', '30'))
 class ChargingStationService:
     """Service class for handling charging station API operations"""
 
-    def __init__(self, api_url: str = "https://inventoryapiv1-367404119922.asia-southeast1.run.app/ChargingStation"):
-        self.api_url = api_url
+    def __init__(self, api_url: Optional[str] = None):
+        self.api_url = api_url or f"{API_BASE_URL}/ChargingStation"
         self.image_base_url = API_BASE_URL_IMG
-        self.r2_image_base_url = "https://pub-133f8593b35749f28fa090bc33925b31.r2.dev/"
+        self.r2_image_base_url = API_BASE_URL_IMG if API_BASE_URL_IMG.endswith('/') else f"{API_BASE_URL_IMG}/"
         # Add caching
         self.stations_cache = []
         self.cache_timestamp = 0
-        self.cache_duration = 300  # 5 minutes
+        # Stale-while-revalidate: fresh until the soft TTL, served stale until the hard TTL
+        self.cache_duration = CATALOG_CACHE_SOFT_TTL
+        self.cache_hard_ttl = max(CATALOG_CACHE_HARD_TTL, CATALOG_CACHE_SOFT_TTL)
         # Pagination attributes
         self.total_items = 0
         self.items_per_page = 10
+        # Coalesces concurrent full-list fetches after a cache miss
+        self.refresh_flight = SingleFlight()
+        # Shortened map links never change, so each one is expanded only once
+        self.expanded_map_links = {}
+        self.map_link_concurrency = max(1, int(os.getenv('MAP_LINK_CONCURRENCY', '10')))
         self.api_timeout = api_timeout
     
     async def fetch_all_stations(self) -> List[ChargingStation]:
         """Fetch all charging stations from API with caching"""
-        current_time = time.time()
+        cache_age = time.time() - self.cache_timestamp
+        
+        # Check if cache is still fresh
+        if self.stations_cache and cache_age < self.cache_duration:
+            return self.stations_cache
         
-        # Check if cache is still valid
-        if (self.stations_cache and 
-            current_time - self.cache_timestamp < self.cache_duration):
+        # Stale but within the hard TTL: answer now and refresh in the background
+        if self.stations_cache and cache_age < self.cache_hard_ttl:
+            self.refresh_flight.start('stations', self._refresh_stations)
             return self.stations_cache
         
+        # Missing or too old: wait, sharing a single upstream fetch with concurrent misses
+        return await self.refresh_flight.do('stations', self._refresh_stations)
+    
+    async def _refresh_stations(self) -> List[ChargingStation]:
+        """Download the full charging station list and rebuild the cache"""
+        current_time = time.time()
+        
         # Fetch fresh data from API
         try:
-            # First, get the total count
-            self._update_total_count()
-            
             # Since API pagination might be broken, request all items in one go
             # Use a large page size to get all stations
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
+            # Rounded up to a whole thousand so the request, and with it the stored
+            # validators, stays the same while the catalog grows
+            page_size = max(1, math.ceil(self.total_items / 1000)) * 1000
+            async with api_client.session() as session:
+                # Revalidate with ETag / Last-Modified; a 304 keeps the parsed cache as is
+                response = await api_client.get_json(
+                    session,
                     self.api_url,
-                    params={'page': 1, 'pageSize': max(self.total_items, 1000)}
-                ) as response:
-                    if response.status == 200:
-                        response_data = await response.json()
-                        
-                        # Check if response_data is a list
-                        if isinstance(response_data, list):
-                            self.stations_cache = [ChargingStation.from_api_data(station_data) for station_data in response_data]
-                        elif isinstance(response_data, dict):
-                            # If it's a dict, check for 'data' property (pagination response)
-                            if 'data' in response_data and isinstance(response_data['data'], list):
-                                self.stations_cache = [ChargingStation.from_api_data(station_data) for station_data in response_data['data']]
-                            else:
-                                # Single station object
-                                self.stations_cache = [ChargingStation.from_api_data(response_data)]
+                    params={'page': 1, 'pageSize': page_size},
+                    keep_payload=False,
+                    conditional=bool(self.stations_cache)
+                )
+                if response.not_modified:
+                    self.cache_timestamp = current_time
+                    return self.stations_cache
+                if response.status == 200:
+                    response_data = response.data
+                    
+                    # Check if response_data is a list
+                    if isinstance(response_data, list):
+                        self.stations_cache = [ChargingStation.from_api_data(station_data) for station_data in response_data]
+                    elif isinstance(response_data, dict):
+                        # If it's a dict, check for 'data' property (pagination response)
+                        if 'data' in response_data and isinstance(response_data['data'], list):
+                            self.stations_cache = [ChargingStation.from_api_data(station_data) for station_data in response_data['data']]
                         else:
-                            print("Unexpected response format")
-                            return self.stations_cache if self.stations_cache else []
-                        
-                        self.cache_timestamp = current_time
-                        return self.stations_cache
+                            # Single station object
+                            self.stations_cache = [ChargingStation.from_api_data(response_data)]
                     else:
-                        print(f"Error fetching charging stations: HTTP {response.status}")
+                        print("Unexpected response format")
                         return self.stations_cache if self.stations_cache else []
-                        
+                    
+                    self.cache_timestamp = current_time
+                    
+                    # The count comes with the list (totalItems), so no separate count request
+                    self._set_total_count(response_data)
+                    if self.total_items > page_size:
+                        # More than fit in the page asked for: ask again with room for all of them
+                        return await self._refresh_stations()
+                    return self.stations_cache
+                else:
+                    print(f"Error fetching charging stations: HTTP {response.status}")
+                    return self.stations_cache if self.stations_cache else []
+                    
         except Exception as e:
             print(f"Error fetching all charging stations: {e}")
             # Fallback: try without pagination parameters
             try:
                 print("Falling back to simple API call...")
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(self.api_url) as response:
+                async with api_client.session() as session:
+                    async with api_client.request(session, 'GET', self.api_url) as response:
                         if response.status == 200:
-                            response_data = await response.json()
+                            response_data = await api_client.read_json(response)
                             
                             # Check if response_data is a list
                             if isinstance(response_data, list):
@@ -107,13 +139,14 @@ class ChargingStationService:
             page_size = self.items_per_page
             
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
+            async with api_client.session() as session:
+                async with api_client.request(
+                    session, 'GET',
                     self.api_url,
                     params={'page': page, 'pageSize': page_size}
                 ) as response:
                     if response.status == 200:
-                        response_data = await response.json()
+                        response_data = await api_client.read_json(response)
                         
                         # Check if response_data is a list
                         if isinstance(response_data, list):
@@ -134,39 +167,26 @@ class ChargingStationService:
             print(f"Error fetching charging station page {page}: {e}")
             return []
     
-    def _update_total_count(self) -> None:
-        """Update the total count of charging stations"""
-        try:
-            # Use synchronous request for initialization
-            response = requests.get(
-                self.api_url,
-                params={'page': 1, 'pageSize': 1},
-                timeout=self.api_timeout
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            self.total_items = data.get('totalItems', 0)
-            print(f"Total charging stations: {self.total_items}")
-            
-        except Exception as e:
-            print(f"Error getting total charging station count: {e}")
-            # Keep previous count if available
-            if not self.total_items:
-                self.total_items = 0
+    def _set_total_count(self, response_data: Any) -> None:
+        """Take the total count of charging stations from a list response (totalItems, else the rows received)"""
+        if isinstance(response_data, dict) and response_data.get('totalItems') is not None:
+            self.total_items = response_data['totalItems']
+        else:
+            self.total_items = len(self.stations_cache)
     
-    def get_total_count(self) -> int:
+    async def get_total_count(self) -> int:
         """Get the total number of charging stations"""
         if not self.total_items:
-            self._update_total_count()
+            # Loading the (cached) list sets the count
+            await self.fetch_all_stations()
         return self.total_items
     
-    def get_total_pages(self, page_size: int = None) -> int:
+    async def get_total_pages(self, page_size: int = None) -> int:
         """Get the total number of pages"""
         if page_size is None:
             page_size = self.items_per_page
             
-        total_count = self.get_total_count()
+        total_count = await self.get_total_count()
         if total_count == 0 or page_size == 0:
             return 0
             
@@ -182,7 +202,15 @@ class ChargingStationService:
         locations = list(set(station.location for station in stations if station.location))
         return sorted(locations)
     
-    def extract_coordinates_from_map_link(self, map_link: str) -> Optional[Tuple[float, float]]:
+    async def _expand_short_link(self, short_link: str) -> str:
+        """Follow a maps.app.goo.gl redirect chain without blocking the event loop"""
+        if short_link not in self.expanded_map_links:
+            async with api_client.session() as session:
+                async with session.head(short_link, allow_redirects=True, timeout=aiohttp.ClientTimeout(total=5)) as response:
+                    self.expanded_map_links[short_link] = str(response.url)
+        return self.expanded_map_links[short_link]
+    
+    async def extract_coordinates_from_map_link(self, map_link: str) -> Optional[Tuple[float, float]]:
         """Extract latitude and longitude from Google Maps link"""
         if not map_link:
             return None
@@ -199,11 +227,7 @@ class ChargingStationService:
             if 'maps.app.goo.gl' in cleaned_link:
                 pass
                 try:
-                    import requests
-                    response = requests.head(cleaned_link, allow_redirects=True, timeout=5)
-                    expanded_url = response.url
-                    pass
-                    cleaned_link = expanded_url
+                    cleaned_link = await self._expand_short_link(cleaned_link)
                 except Exception as e:
                     pass
                     # For Canadia Tower, return known coordinates
@@ -253,15 +277,24 @@ class ChargingStationService:
         stations = await self.fetch_all_stations()
         stations_with_distance = []
         
-        for station in stations:
-            if station.map_link:
-                coords = self.extract_coordinates_from_map_link(station.map_link)
-                if coords:
-                    station_lat, station_lng = coords
-                    distance = self.calculate_distance(user_lat, user_lng, station_lat, station_lng)
-                    # Update the station's distance_in_km field
-                    station.distance_in_km = round(distance, 2)
-                    stations_with_distance.append(station)
+        # Short links are expanded concurrently instead of one redirect chain at a time,
+        # a bounded number at once
+        mapped_stations = [station for station in stations if station.map_link]
+        semaphore = asyncio.Semaphore(self.map_link_concurrency)
+        
+        async def locate(map_link: str) -> Optional[Tuple[float, float]]:
+            async with semaphore:
+                return await self.extract_coordinates_from_map_link(map_link)
+        
+        all_coords = await asyncio.gather(*(locate(station.map_link) for station in mapped_stations))
+        
+        for station, coords in zip(mapped_stations, all_coords):
+            if coords:
+                station_lat, station_lng = coords
+                distance = self.calculate_distance(user_lat, user_lng, station_lat, station_lng)
+                # Update the station's distance_in_km field
+                station.distance_in_km = round(distance, 2)
+                stations_with_distance.append(station)
         
         # Sort by distance and return limited results
         stations_with_distance.sort(key=lambda x: x.distance_in_km)
@@ -303,7 +336,7 @@ class ChargingStationService:
             if '.' in cleaned_filename and len(cleaned_filename) > 10:
                 # Test if the URL is accessible
                 try:
-                    async with aiohttp.ClientSession() as session:
+                    async with api_client.session() as session:
                         async with session.head(cleaned_filename, timeout=aiohttp.ClientTimeout(total=3)) as response:
                             if response.status == 200:
                                 return cleaned_filename
@@ -314,7 +347,7 @@ class ChargingStationService:
         # Try R2 storage first (newer images) and validate
         r2_url = f"{self.r2_image_base_url}{cleaned_filename}"
         try:
-            async with aiohttp.ClientSession() as session:
+            async with api_client.session() as session:
                 async with session.head(r2_url, timeout=aiohttp.ClientTimeout(total=3)) as response:
                     if response.status == 200:
                         return r2_url
@@ -324,7 +357,7 @@ class ChargingStationService:
         # Try API storage as fallback and validate
         api_url = f"{self.image_base_url}{cleaned_filename}"
         try:
-            async with aiohttp.ClientSession() as session:
+            async with api_client.session() as session:
                 async with session.head(api_url, timeout=aiohttp.ClientTimeout(total=3)) as response:
                     if response.status == 200:
                         return api_url
@@ -1,10 +1,21 @@
+import asyncio
 import os
 import re
-import requests
-from typing import List, Dict, Optional, Any
+import time
+import aiohttp
+from collections import Counter
+from typing import List, Dict, Optional, Any, AsyncIterator, Awaitable, Tuple
 from datetime import datetime
-from decimal import Decimal
+from pydantic import ValidationError
+from models.core.product import Product
 from utils.config.settings import API_BASE_URL, API_BASE_URL_IMG
+from utils.services.json_stream import iter_json_array_items
+from utils.services.api_client import api_client
+from utils.services.json_codec import json_codec
+from utils.services.response_cache import CachedEntry, response_cache
+
+# Read size for streamed API bodies
+STREAM_CHUNK_SIZE = 64 * 1024
 
 class CarDataLoader:
     """Handles loading car data from API with dynamic images"""
@@ -13,110 +24,328 @@ class CarDataLoader:
         self.api_base_url = API_BASE_URL
         self.api_timeout = int(os.getenv('API_TIMEOUT', '30'))
         self.image_base_url = API_BASE_URL_IMG
+        # The published catalog and its lookups; replaced together by publish()
         self.loaded_cars = []
         self.categories_cache = {}
         self.brands_cache = {}
+        # (brands, categories) the load in progress converts with, published with its products
+        self._staged_lookups = ({}, {})
+        # Product pagination: 'paginated', 'single_request', 'single_page' or 'failed'
+        self.product_page_size = max(1, int(os.getenv('PRODUCT_PAGE_SIZE', '100')))
+        self.product_page_concurrency = max(1, int(os.getenv('PRODUCT_PAGE_CONCURRENCY', '4')))
+        self.last_fetch_mode = None
+        # Per-load conversion counters: accepted/rejected rows and rejection reasons
+        self.ingest_stats = {'accepted': 0, 'rejected': 0, 'reasons': Counter()}
+        self._ingest_started_at = datetime.now()
+        # Image validation stage: url -> (is_valid, checked_at)
+        self.image_validation_results = {}
+        self.image_validation_ttl = int(os.getenv('IMAGE_VALIDATION_TTL', '1800'))  # 30 minutes
+        self.image_validation_concurrency = max(1, int(os.getenv('IMAGE_VALIDATION_CONCURRENCY', '20')))
+        # Image URLs blanked out by the last validation, to notice when one comes back
+        self.missing_images = set()
+        # Conditional GET: request key -> (products, rows received, response meta) of the last 200,
+        # so a 304 page reuses its converted products instead of being downloaded and parsed again
+        self.product_pages = {}
+        self._fresh_pages = {}
+        # False when every product request of the last load came back 304 Not Modified
+        self.catalog_changed = True
         
         if not self.api_base_url:
             raise ValueError("API_BASE_URL must be set in .env file")
     
-    def load_all_data(self) -> List[Dict]:
-        """Load data from API only"""
-        # Load categories and brands first
-        self._load_categories()
-        self._load_brands()
-        
-        # Load cars from API
-        api_cars = self._load_from_api()
-        self.loaded_cars = api_cars
-        return api_cars
+    def load_all_data(self) -> List[Product]:
+        """Load data from API only (blocking wrapper around the async bootstrap)"""
+        # Use a private loop so the default loop is left untouched for the bot's run_polling()
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self.load_all_data_async())
+        finally:
+            loop.close()
     
-    def _load_from_api(self) -> List[Dict]:
-        """Load and process data from API with pagination workaround"""
-        all_products = []
+    async def load_all_data_async(self) -> List[Product]:
+        """Load categories, brands and products concurrently over the shared pooled session"""
+        self._reset_ingest_stats()
+        self._fresh_pages = {}
+        self.catalog_changed = False
         
-        try:
-            # First, try to get total count with a small request
-            print("Getting total product count...")
-            response = requests.get(
-                f"{self.api_base_url}/Product",
-                params={'page': 1, 'pageSize': 1},
-                timeout=self.api_timeout
+        # The bot's shared keep-alive pool (a short-lived one when called outside the bot loop)
+        async with api_client.session() as session:
+            lookups = asyncio.gather(
+                self._load_categories(session),
+                self._load_brands(session)
             )
-            response.raise_for_status()
-            api_data = response.json()
-            total_items = api_data.get('totalItems', 0)
             
-            if total_items == 0:
-                print("No products found in API")
-                return []
+            # Products stream in concurrently with the lookups and are converted as they arrive
+            api_cars = await self._load_from_api(session, lookups)
+            await self._apply_lookups(lookups)
             
-            # Load all products in single request
-            
-            # Since API pagination is broken, request all items in one go
-            # Use a large page size to get all products
-            response = requests.get(
-                f"{self.api_base_url}/Product",
-                params={'page': 1, 'pageSize': total_items},
-                timeout=self.api_timeout
+            # Image existence checks run as their own bounded stage after conversion
+            await self._validate_images(session, api_cars)
+        
+        # Pages not requested this time (e.g. after a mode change) are dropped
+        self.product_pages = self._fresh_pages
+        
+        # Nothing is published here: the caller installs the products and lookups
+        # with publish() only once it has decided to swap the catalog
+        return api_cars
+    
+    def publish(self, cars: List[Product]) -> None:
+        """Install a loaded catalog together with the brand/category names it was converted with"""
+        self.brands_cache, self.categories_cache = self._staged_lookups
+        self.loaded_cars = cars
+    
+    async def _apply_lookups(self, lookups: Awaitable) -> None:
+        """Wait for the category and brand lookups and stage them for conversion"""
+        categories, brands = await lookups
+        self._staged_lookups = (brands, categories)
+    
+    async def _get_json(self, session: aiohttp.ClientSession, path: str, params: Optional[Dict] = None) -> Any:
+        """GET an API path and return the decoded JSON body (revalidated with ETag / Last-Modified)"""
+        result = await api_client.get_json(session, f"{self.api_base_url}{path}", params)
+        if not result.ok:
+            raise aiohttp.ClientError(f"HTTP {result.status} for {path}")
+        return result.data
+    
+    async def _stream_products(self, session: aiohttp.ClientSession, params: Dict, lookups: Awaitable,
+                               meta: Optional[Dict] = None, allow_retry: bool = True) -> Tuple[List[Product], int]:
+        """Stream a /Product response and convert each item as soon as it is parsed.
+
+        Returns the accepted products and the number of rows the API sent. A request that
+        was seen before is revalidated, and a 304 reuses the products converted last time.
+        With the on-disk response cache enabled, a fresh copy on disk skips the request and
+        a recent one stands in while the API is unreachable.
+        """
+        url = f"{self.api_base_url}/Product"
+        key = api_client.cache_key(url, params)
+        # The unconditional refetch of a page whose cached copy could not be reused skips both caches
+        cached_page = self.product_pages.get(key) if allow_retry else None
+        disk_entry = await response_cache.get(url, key) if allow_retry else None
+        
+        # Saved by an earlier run or another worker and still fresh: no request at all
+        if disk_entry is not None and disk_entry.is_fresh:
+            response_cache.stats['fresh_hits'] += 1
+            await self._apply_lookups(lookups)
+            return self._products_from_disk(key, disk_entry, meta)
+        
+        headers = api_client.conditional_headers(key) if cached_page else {}
+        if not headers and disk_entry is not None:
+            cached_page = None
+            headers = disk_entry.conditional_headers()
+        converted_products = []
+        received = 0
+        page_meta = {}
+        
+        try:
+            async with api_client.request(session, 'GET', url, params=params, headers=headers) as response:
+                api_client.record(response)
+                
+                # Brand and category names can only be resolved once both lookups have arrived
+                await self._apply_lookups(lookups)
+                
+                if response.status == 304 and disk_entry is not None:
+                    await response_cache.refresh(disk_entry)
+                
+                if response.status == 304 and cached_page is not None:
+                    page_products, received, page_meta, page_lookups = cached_page
+                    # Rows converted with different brand/category names must be converted again
+                    if page_lookups == self._staged_lookups:
+                        if meta is not None:
+                            meta.update(page_meta)
+                        self._fresh_pages[key] = cached_page
+                        self.ingest_stats['accepted'] += len(page_products)
+                        return list(page_products), received
+                
+                if response.status == 304 and disk_entry is not None:
+                    return self._products_from_disk(key, disk_entry, meta)
+                elif response.status == 304:
+                    self.product_pages.pop(key, None)
+                else:
+                    response.raise_for_status()
+                    self.catalog_changed = True
+                    
+                    body_chunks = [] if response_cache.accepts(url) else None
+                    async for product in self._iter_product_rows(response, page_meta, body_chunks):
+                        received += 1
+                        car = self._convert_product_to_car(product)
+                        if car is not None:
+                            converted_products.append(car)
+                    
+                    api_client.remember(key, response)
+                    if key in api_client.validators:
+                        self._fresh_pages[key] = (
+                            converted_products, received, page_meta, self._staged_lookups
+                        )
+                    if body_chunks is not None:
+                        await response_cache.put(url, key, b''.join(body_chunks), response.headers)
+                    if meta is not None:
+                        meta.update(page_meta)
+                    return list(converted_products), received
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            api_down = not isinstance(e, aiohttp.ClientResponseError) or e.status >= 500
+            if not api_down or disk_entry is None or not disk_entry.usable_offline:
+                raise
+            response_cache.stats['stale_served'] += 1
+            print(f"⚠️ API unavailable ({e}), serving products from the response cache ({disk_entry.age:.0f}s old)")
+            await self._apply_lookups(lookups)
+            return self._products_from_disk(key, disk_entry, meta)
+        
+        # The cached page was converted with stale lookups: refetch it unconditionally, once
+        if not allow_retry:
+            raise aiohttp.ClientError(f"/Product answered 304 to an unconditional request ({key})")
+        return await self._stream_products(session, params, lookups, meta, allow_retry=False)
+    
+    def _products_from_disk(self, key: str, entry: CachedEntry, meta: Optional[Dict]) -> Tuple[List[Product], int]:
+        """Convert a /Product response body kept in the on-disk response cache"""
+        # The same body (by its validators) converted with the same lookups last time: reuse it,
+        # so a refresh served from disk does not count as a catalog change
+        cached_page = self.product_pages.get(key)
+        previous = api_client.validators.get(key)
+        if (
+            cached_page is not None and previous is not None
+            and (entry.etag or entry.last_modified)
+            and (previous.etag, previous.last_modified) == (entry.etag, entry.last_modified)
+            and cached_page[3] == self._staged_lookups
+        ):
+            page_products, received, page_meta, _ = cached_page
+            if meta is not None:
+                meta.update(page_meta)
+            self._fresh_pages[key] = cached_page
+            self.ingest_stats['accepted'] += len(page_products)
+            return list(page_products), received
+        
+        page_meta = {}
+        rows = self._split_product_payload(json_codec.loads(entry.body), page_meta)
+        converted_products = [car for car in map(self._convert_product_to_car, rows) if car is not None]
+        self.catalog_changed = True
+        
+        api_client.store_validators(key, entry.etag, entry.last_modified)
+        if key in api_client.validators:
+            self._fresh_pages[key] = (
+                converted_products, len(rows), page_meta, self._staged_lookups
             )
-            response.raise_for_status()
-            
-            api_data = response.json()
-            products_data = api_data.get('data', [])
-            
-            # Successfully loaded products from API
-            
-            if products_data:
-                # Convert and add products
-                converted_products = [self._convert_product_to_car(product) for product in products_data]
-                all_products.extend(converted_products)
+        if meta is not None:
+            meta.update(page_meta)
+        return list(converted_products), len(rows)
+    
+    @staticmethod
+    def _split_product_payload(payload: Any, meta: Dict) -> List[Dict]:
+        """The product rows of a decoded /Product body; other top-level keys go to `meta`"""
+        if isinstance(payload, dict):
+            meta.update({name: value for name, value in payload.items() if name != 'data'})
+            payload = payload.get('data') or []
+        return payload if isinstance(payload, list) else []
+    
+    async def _iter_product_rows(self, response: aiohttp.ClientResponse, meta: Dict,
+                                 body_chunks: Optional[List[bytes]] = None) -> AsyncIterator[Dict]:
+        """Yield the product rows of a /Product response, storing other top-level keys in `meta`.
+
+        Without a fast codec the body is parsed while it streams in; a fast codec
+        decodes the whole body in one call, which beats the incremental stdlib
+        parser by a wide margin. The raw body is collected in `body_chunks` if given.
+        """
+        if not json_codec.is_fast:
+            async def chunks() -> AsyncIterator[bytes]:
+                async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                    if body_chunks is not None:
+                        body_chunks.append(chunk)
+                    yield chunk
             
+            async for product in iter_json_array_items(chunks(), 'data', meta):
+                yield product
+            return
+        
+        body = await response.read()
+        if body_chunks is not None:
+            body_chunks.append(body)
+        for product in self._split_product_payload(json_codec.loads(body), meta):
+            yield product
+    
+    async def _load_from_api(self, session: aiohttp.ClientSession, lookups: Awaitable) -> List[Product]:
+        """Load and convert product data, using real pagination when the API supports it"""
+        try:
+            all_products, mode = await self._load_pages(session, lookups)
         except Exception as e:
             print(f"Error loading from API: {e}")
-            # Fallback: try with standard pagination (first page only)
+            all_products, mode = [], 'failed'
+        
+        self.last_fetch_mode = mode
+        print(f"Loaded {len(all_products)} products ({mode})")
+        if self.ingest_stats['rejected']:
+            reasons = ', '.join(f"{reason} x{count}" for reason, count in self.ingest_stats['reasons'].most_common())
+            print(f"Rejected {self.ingest_stats['rejected']} product rows: {reasons}")
+        return all_products
+    
+    async def _load_pages(self, session: aiohttp.ClientSession, lookups: Awaitable) -> Tuple[List[Product], str]:
+        """Fetch products page by page concurrently, or in one request if pagination is broken"""
+        page_size = self.product_page_size
+        
+        # The first page doubles as the total count request
+        meta = {}
+        first_page, first_received = await self._stream_products(session, {'page': 1, 'pageSize': page_size}, lookups, meta)
+        total_items = meta.get('totalItems', first_received) or 0
+        
+        if total_items <= first_received:
+            return first_page, 'single_page'
+        
+        # Pagination works if page 2 is a different, correctly sized slice of the catalog
+        try:
+            second_page, second_received = await self._stream_products(session, {'page': 2, 'pageSize': page_size}, lookups)
+        except Exception as e:
+            print(f"Page 2 probe failed: {e}")
+            second_page, second_received = [], 0
+        
+        first_ids = {product.id for product in first_page}
+        pagination_works = (
+            first_received == page_size
+            and 0 < second_received <= page_size
+            and not any(product.id in first_ids for product in second_page)
+        )
+        
+        if pagination_works:
+            total_pages = (total_items + page_size - 1) // page_size
+            semaphore = asyncio.Semaphore(self.product_page_concurrency)
+            
+            async def fetch_page(page: int) -> Tuple[List[Product], int]:
+                async with semaphore:
+                    return await self._stream_products(session, {'page': page, 'pageSize': page_size}, lookups)
+            
             try:
-                print("Falling back to single page load...")
-                response = requests.get(
-                    f"{self.api_base_url}/Product",
-                    params={'page': 1, 'pageSize': 50},
-                    timeout=self.api_timeout
-                )
-                response.raise_for_status()
-                api_data = response.json()
-                products_data = api_data.get('data', [])
+                remaining_pages = await asyncio.gather(*(fetch_page(page) for page in range(3, total_pages + 1)))
+                all_products = first_page + second_page
+                received = first_received + second_received
+                for page_products, page_received in remaining_pages:
+                    all_products.extend(page_products)
+                    received += page_received
                 
-                if products_data:
-                    converted_products = [self._convert_product_to_car(product) for product in products_data]
-                    all_products.extend(converted_products)
-                    # Fallback: loaded products from first page
-                    
-            except Exception as fallback_error:
-                print(f"Fallback also failed: {fallback_error}")
+                if received >= total_items:
+                    return all_products, 'paginated'
+                print(f"Paginated fetch returned {received} of {total_items} products")
+            except Exception as e:
+                print(f"Paginated fetch failed: {e}")
         
-        # Total products loaded successfully
-        return all_products
+        # Pagination is broken or incomplete: request the whole inventory in one go
+        self._reset_ingest_stats()
+        all_products, _ = await self._stream_products(session, {'page': 1, 'pageSize': total_items}, lookups)
+        return all_products, 'single_request'
     
-    def _load_categories(self) -> None:
+    async def _load_categories(self, session: aiohttp.ClientSession) -> Dict[int, str]:
         """Load categories from separate API endpoint"""
         try:
-            response = requests.get(
-                f"{self.api_base_url}/Category",
-                timeout=self.api_timeout
-            )
-            response.raise_for_status()
-            
-            categories_data = response.json()
+            categories_data = await self._get_json(session, "/Category")
             categories = categories_data.get('data', []) if isinstance(categories_data, dict) else categories_data
             
             # Cache categories by ID
-            for category in categories:
-                if isinstance(category, dict) and 'id' in category:
-                    self.categories_cache[category['id']] = category.get('name', 'Unknown Category')
+            return {
+                category['id']: category.get('name', 'Unknown Category')
+                for category in categories
+                if isinstance(category, dict) and 'id' in category
+            }
                     
         except Exception as e:
-            # Fallback categories
-            self.categories_cache = {
+            # Keep the names already published; the hard-coded ones only before the first load
+            if self.categories_cache:
+                return self.categories_cache
+            return {
                 1: 'Sedan',
                 2: 'SUV', 
                 3: 'Hatchback',
@@ -125,26 +354,24 @@ class CarDataLoader:
                 6: 'Truck'
             }
     
-    def _load_brands(self) -> None:
+    async def _load_brands(self, session: aiohttp.ClientSession) -> Dict[int, str]:
         """Load brands from separate API endpoint"""
         try:
-            response = requests.get(
-                f"{self.api_base_url}/Brand",
-                timeout=self.api_timeout
-            )
-            response.raise_for_status()
-            
-            brands_data = response.json()
+            brands_data = await self._get_json(session, "/Brand")
             brands = brands_data.get('data', []) if isinstance(brands_data, dict) else brands_data
             
             # Cache brands by ID
-            for brand in brands:
-                if isinstance(brand, dict) and 'id' in brand:
-                    self.brands_cache[brand['id']] = brand.get('name', 'Unknown Brand')
+            return {
+                brand['id']: brand.get('name', 'Unknown Brand')
+                for brand in brands
+                if isinstance(brand, dict) and 'id' in brand
+            }
                     
         except Exception as e:
-            # Fallback brands
-            self.brands_cache = {
+            # Keep the names already published; the hard-coded ones only before the first load
+            if self.brands_cache:
+                return self.brands_cache
+            return {
                 1: 'Toyota',
                 2: 'Honda',
                 3: 'BMW',
@@ -155,40 +382,64 @@ class CarDataLoader:
                 8: 'Nissan'
             }
     
-    def _convert_product_to_car(self, product: Dict) -> Dict:
-        """Convert API product to standardized car format"""
-        # Get brand name from cache using brand_id
-        brand_id = product.get('brandId') or product.get('brand_id')
-        brand_name = self.brands_cache.get(brand_id, product.get('brand', 'Unknown'))
-        
-        # Get category name from cache using category_id
-        category_id = product.get('categoryId') or product.get('category_id')
-        category_name = self.categories_cache.get(category_id, product.get('category', 'Sedan'))
-        
-        return {
-            'id': product.get('id', hash(str(product)) % 100000),
-            'user_id': None,
-            'brand': brand_name,
-            'model': product.get('model', product.get('title', 'Unknown Model')),
-            'year': self._extract_year(product.get('model', '')),
-            'price': float(product.get('price', 0)),
-            'currency': product.get('eCurrencyType', 'USD'),
-            'description': self._get_description(product),
-            'image_url': self._get_dynamic_image_url(product.get('image')),
-            'gallery': self._process_gallery(product.get('gallery')),
-            'location': product.get('location', 'Phnom Penh'),
-            'color': product.get('color', 'Unknown'),
-            'condition': product.get('condition', 'Good'),
-            'phone_number': product.get('phoneNumber', '097 80 24 246'),
-            'category': category_name,
-            'is_featured': product.get('isFeatured', False),
-            'sku': product.get('sku', ''),
-            'status': 'available',
-            'created_at': datetime.now().isoformat(),
-            'source': 'api',
-            'brand_id': brand_id,
-            'category_id': category_id
-        }
+    def _convert_product_to_car(self, product: Dict) -> Optional[Product]:
+        """Convert an API product straight into a validated Product, or None if the row is rejected"""
+        try:
+            brands, categories = self._staged_lookups
+            
+            # Get brand name from the load's lookups using brand_id
+            brand_id = product.get('brandId') or product.get('brand_id')
+            brand_name = brands.get(brand_id, product.get('brand', 'Unknown'))
+            
+            # Get category name from the load's lookups using category_id
+            category_id = product.get('categoryId') or product.get('category_id')
+            category_name = categories.get(category_id, product.get('category', 'Sedan'))
+            
+            car = Product(
+                id=product.get('id', hash(str(product)) % 100000),
+                user_id=None,
+                brand=brand_name,
+                model=product.get('model', product.get('title', 'Unknown Model')),
+                year=self._extract_year(product.get('model') or ''),
+                price=product.get('price', 0),
+                currency=product.get('eCurrencyType', 'USD'),
+                description=self._get_description(product),
+                image_url=self._get_dynamic_image_url(product.get('image')),
+                gallery=self._process_gallery(product.get('gallery')),
+                location=product.get('location', 'Phnom Penh'),
+                color=product.get('color', 'Unknown'),
+                condition=product.get('condition', 'Good'),
+                phone_number=product.get('phoneNumber', '097 80 24 246'),
+                category=category_name,
+                is_featured=product.get('isFeatured', False),
+                sku=product.get('sku', ''),
+                status='available',
+                created_at=self._ingest_started_at,
+                source='api',
+                brand_id=brand_id,
+                category_id=category_id
+            )
+        except ValidationError as e:
+            error = e.errors()[0]
+            field = error['loc'][0] if error['loc'] else 'product'
+            self._reject_row(f"{field}: {error['type']}")
+            return None
+        except Exception as e:
+            self._reject_row(type(e).__name__)
+            return None
+        
+        self.ingest_stats['accepted'] += 1
+        return car
+    
+    def _reject_row(self, reason: str) -> None:
+        """Count a product row that could not be converted"""
+        self.ingest_stats['rejected'] += 1
+        self.ingest_stats['reasons'][reason] += 1
+    
+    def _reset_ingest_stats(self) -> None:
+        """Start a fresh ingest run"""
+        self._ingest_started_at = datetime.now()
+        self.ingest_stats = {'accepted': 0, 'rejected': 0, 'reasons': Counter()}
     
     def _get_dynamic_image_url(self, image_filename: str) -> str:
         """Get dynamic image URL from R2 bucket or API data"""
@@ -205,19 +456,59 @@ class CarDataLoader:
             else:
                 return ""
         
-        # Construct dynamic image URL from R2 bucket
-        dynamic_url = f"{self.image_base_url}/{clean_filename}"
+        # Construct dynamic image URL from R2 bucket; existence is checked later
+        # by the image validation stage so conversion never waits on the network
+        return f"{self.image_base_url}/{clean_filename}"
+    
+    async def _validate_images(self, session: aiohttp.ClientSession, cars: List[Product]) -> None:
+        """Probe R2 image URLs concurrently and blank out the ones that don't exist.
+
+        A car with a missing image is replaced in `cars` by a copy without it; the
+        original keeps its URL, so a page reused after a 304 is validated afresh.
+        """
+        if not cars:
+            return
+        current_time = time.time()
+        bucket_prefix = f"{self.image_base_url}/"
         
-        # Test if the dynamic image exists (simplified)
-        try:
-            response = requests.head(dynamic_url, timeout=3)
-            if response.status_code == 200:
-                return dynamic_url
-        except Exception:
-            pass
+        # Identical filenames across listings are probed only once
+        pending_urls = {
+            car.image_url for car in cars
+            if car.image_url and car.image_url.startswith(bucket_prefix)
+        }
+        pending_urls = {
+            url for url in pending_urls
+            if url not in self.image_validation_results
+            or current_time - self.image_validation_results[url][1] >= self.image_validation_ttl
+        }
+        
+        if pending_urls:
+            semaphore = asyncio.Semaphore(self.image_validation_concurrency)
+            
+            async def probe(url: str) -> None:
+                async with semaphore:
+                    try:
+                        async with session.head(url, timeout=aiohttp.ClientTimeout(total=3)) as response:
+                            is_valid = response.status == 200
+                    except Exception:
+                        is_valid = False
+                    self.image_validation_results[url] = (is_valid, time.time())
+            
+            await asyncio.gather(*(probe(url) for url in pending_urls))
+            valid_count = sum(1 for url in pending_urls if self.image_validation_results[url][0])
+            print(f"Validated {len(pending_urls)} product images ({valid_count} available)")
+        
+        missing_images = set()
+        for index, car in enumerate(cars):
+            result = self.image_validation_results.get(car.image_url)
+            if result is not None and not result[0]:
+                missing_images.add(car.image_url)
+                cars[index] = car.model_copy(update={'image_url': ""})
         
-        # Return empty string if no valid image found
-        return ""
+        # Unchanged pages still make a new catalog when an image appeared or disappeared
+        if missing_images != self.missing_images:
+            self.catalog_changed = True
+        self.missing_images = missing_images
     
 
     
@@ -286,7 +577,7 @@ class CarDataLoader:
         if not self.loaded_cars:
             return []
         
-        brands = {car.get('brand') for car in self.loaded_cars if car.get('brand')}
+        brands = {car.brand for car in self.loaded_cars if car.brand}
         return sorted(list(brands))
     
     def get_unique_locations(self) -> List[str]:
@@ -296,7 +587,7 @@ class CarDataLoader:
         
         locations = set()
         for car in self.loaded_cars:
-            location = car.get('location', '').strip()
+            location = (car.location or '').strip()
             if location:
                 locations.add(location)
         
@@ -317,7 +608,7 @@ class CarDataLoader:
         if not self.loaded_cars:
             return ['Sedan', 'SUV', 'Hatchback', 'Coupe', 'Convertible', 'Truck']
         
-        categories = {car.get('category') for car in self.loaded_cars if car.get('category')}
+        categories = {car.category for car in self.loaded_cars if car.category}
         return sorted(list(categories))
     
     def get_colors_list(self) -> List[str]:
@@ -325,7 +616,7 @@ class CarDataLoader:
         if not self.loaded_cars:
             return ['Red', 'Blue', 'Black', 'White', 'Silver', 'Gray']
         
-        colors = {car.get('color') for car in self.loaded_cars if car.get('color')}
+        colors = {car.color for car in self.loaded_cars if car.color}
         return sorted(list(colors))
     
     def get_brands_with_emojis(self) -> Dict[str, str]:
@@ -1,84 +1,116 @@
+import asyncio
 import aiohttp
 import math
 import os
 import re
 import time
-import aiohttp
-import requests
 from typing import List, Optional, Dict, Any, Tuple
 from models.core.garage import Garage
-from utils.config.settings import API_BASE_URL_IMG
+from utils.config.settings import API_BASE_URL, API_BASE_URL_IMG, CATALOG_CACHE_SOFT_TTL, CATALOG_CACHE_HARD_TTL
+from utils.services.api_client import api_client
+from utils.services.single_flight import SingleFlight
 
 class GarageService:
     """Service class for handling garage API operations"""
     
-    def __init__(self, api_url: str = "https://inventoryapiv1-367404119922.asia-southeast1.run.app/Garage"):
-        self.api_url = api_url
+    def __init__(self, api_url: Optional[str] = None):
+        self.api_url = api_url or f"{API_BASE_URL}/Garage"
         self.api_timeout = int(os.getenv('API_TIMEOUT', '30'))
         self.image_base_url = API_BASE_URL_IMG
         # Remove trailing slash from R2 URL to avoid double slashes
-        self.r2_image_base_url = "https://pub-133f8593b35749f28fa090bc33925b31.r2.dev"
+        self.r2_image_base_url = API_BASE_URL_IMG.rstrip('/')
         # Add caching
         self.garages_cache = []
         self.cache_timestamp = 0
-        self.cache_duration = 300  # 5 minutes
+        # Stale-while-revalidate: fresh until the soft TTL, served stale until the hard TTL
+        self.cache_duration = CATALOG_CACHE_SOFT_TTL
+        self.cache_hard_ttl = max(CATALOG_CACHE_HARD_TTL, CATALOG_CACHE_SOFT_TTL)
         # Pagination support
         self.total_items = 0
         self.items_per_page = 10
+        # Coalesces concurrent full-list fetches after a cache miss
+        self.refresh_flight = SingleFlight()
+        # Shortened map links never change, so each one is expanded only once
+        self.expanded_map_links = {}
+        self.map_link_concurrency = max(1, int(os.getenv('MAP_LINK_CONCURRENCY', '10')))
     
     async def fetch_all_garages(self) -> List[Garage]:
         """Fetch all garages from API with caching"""
-        current_time = time.time()
+        cache_age = time.time() - self.cache_timestamp
+        
+        # Check if cache is still fresh
+        if self.garages_cache and cache_age < self.cache_duration:
+            return self.garages_cache
         
-        # Check if cache is still valid
-        if (self.garages_cache and 
-            current_time - self.cache_timestamp < self.cache_duration):
+        # Stale but within the hard TTL: answer now and refresh in the background
+        if self.garages_cache and cache_age < self.cache_hard_ttl:
+            self.refresh_flight.start('garages', self._refresh_garages)
             return self.garages_cache
         
+        # Missing or too old: wait, sharing a single upstream fetch with concurrent misses
+        return await self.refresh_flight.do('garages', self._refresh_garages)
+    
+    async def _refresh_garages(self) -> List[Garage]:
+        """Download the full garage list and rebuild the cache"""
+        current_time = time.time()
+        
         # Fetch fresh data from API
         try:
-            # First, get the total count
-            self._update_total_count()
-            
             # Since API pagination might be broken, request all items in one go
             # Use a large page size to get all garages
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
+            # Rounded up to a whole thousand so the request, and with it the stored
+            # validators, stays the same while the catalog grows
+            page_size = max(1, math.ceil(self.total_items / 1000)) * 1000
+            async with api_client.session() as session:
+                # Revalidate with ETag / Last-Modified; a 304 keeps the parsed cache as is
+                response = await api_client.get_json(
+                    session,
                     self.api_url,
-                    params={'page': 1, 'pageSize': max(self.total_items, 1000)}
-                ) as response:
-                    if response.status == 200:
-                        response_data = await response.json()
-                        
-                        # Check if response_data is a list
-                        if isinstance(response_data, list):
-                            self.garages_cache = [Garage.from_api_data(garage_data) for garage_data in response_data]
-                        elif isinstance(response_data, dict):
-                            # If it's a dict, check for 'data' property (pagination response)
-                            if 'data' in response_data and isinstance(response_data['data'], list):
-                                self.garages_cache = [Garage.from_api_data(garage_data) for garage_data in response_data['data']]
-                            else:
-                                # Single garage object
-                                self.garages_cache = [Garage.from_api_data(response_data)]
+                    params={'page': 1, 'pageSize': page_size},
+                    keep_payload=False,
+                    conditional=bool(self.garages_cache)
+                )
+                if response.not_modified:
+                    self.cache_timestamp = current_time
+                    return self.garages_cache
+                if response.status == 200:
+                    response_data = response.data
+                    
+                    # Check if response_data is a list
+                    if isinstance(response_data, list):
+                        self.garages_cache = [Garage.from_api_data(garage_data) for garage_data in response_data]
+                    elif isinstance(response_data, dict):
+                        # If it's a dict, check for 'data' property (pagination response)
+                        if 'data' in response_data and isinstance(response_data['data'], list):
+                            self.garages_cache = [Garage.from_api_data(garage_data) for garage_data in response_data['data']]
                         else:
-                            print("Unexpected response format")
-                            return self.garages_cache if self.garages_cache else []
-                        
-                        self.cache_timestamp = current_time
-                        return self.garages_cache
+                            # Single garage object
+                            self.garages_cache = [Garage.from_api_data(response_data)]
                     else:
-                        print(f"Error fetching garages: HTTP {response.status}")
+                        print("Unexpected response format")
                         return self.garages_cache if self.garages_cache else []
-                        
+                    
+                    self.cache_timestamp = current_time
+                    
+                    # The count comes with the list (totalItems), so no separate count request
+                    self._set_total_count(response_data)
+                    if self.total_items > page_size:
+                        # More than fit in the page asked for: ask again with room for all of them
+                        return await self._refresh_garages()
+                    return self.garages_cache
+                else:
+                    print(f"Error fetching garages: HTTP {response.status}")
+                    return self.garages_cache if self.garages_cache else []
+                    
         except Exception as e:
             print(f"Error fetching all garages: {e}")
             # Fallback: try without pagination parameters
             try:
                 print("Falling back to simple API call...")
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(self.api_url) as response:
+                async with api_client.session() as session:
+                    async with api_client.request(session, 'GET', self.api_url) as response:
                         if response.status == 200:
-                            response_data = await response.json()
+                            response_data = await api_client.read_json(response)
                             
                             # Check if response_data is a list
                             if isinstance(response_data, list):
@@ -105,13 +137,14 @@ class GarageService:
             page_size = self.items_per_page
             
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
+            async with api_client.session() as session:
+                async with api_client.request(
+                    session, 'GET',
                     self.api_url,
                     params={'page': page, 'pageSize': page_size}
                 ) as response:
                     if response.status == 200:
-                        response_data = await response.json()
+                        response_data = await api_client.read_json(response)
                         
                         # Check if response_data is a list
                         if isinstance(response_data, list):
@@ -132,39 +165,26 @@ class GarageService:
             print(f"Error fetching garage page {page}: {e}")
             return []
     
-    def _update_total_count(self) -> None:
-        """Update the total count of garages"""
-        try:
-            # Use synchronous request for initialization
-            response = requests.get(
-                self.api_url,
-                params={'page': 1, 'pageSize': 1},
-                timeout=self.api_timeout
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            self.total_items = data.get('totalItems', 0)
-            print(f"Total garages: {self.total_items}")
-            
-        except Exception as e:
-            print(f"Error getting total garage count: {e}")
-            # Keep previous count if available
-            if not self.total_items:
-                self.total_items = 0
+    def _set_total_count(self, response_data: Any) -> None:
+        """Take the total count of garages from a list response (totalItems, else the rows received)"""
+        if isinstance(response_data, dict) and response_data.get('totalItems') is not None:
+            self.total_items = response_data['totalItems']
+        else:
+            self.total_items = len(self.garages_cache)
     
-    def get_total_count(self) -> int:
+    async def get_total_count(self) -> int:
         """Get the total number of garages"""
         if not self.total_items:
-            self._update_total_count()
+            # Loading the (cached) list sets the count
+            await self.fetch_all_garages()
         return self.total_items
     
-    def get_total_pages(self, page_size: int = None) -> int:
+    async def get_total_pages(self, page_size: int = None) -> int:
         """Get the total number of pages"""
         if page_size is None:
             page_size = self.items_per_page
             
-        total_count = self.get_total_count()
+        total_count = await self.get_total_count()
         if total_count == 0 or page_size == 0:
             return 0
             
@@ -200,7 +220,15 @@ class GarageService:
                 return garage
         return None
     
-    def extract_coordinates_from_map_link(self, map_link: str) -> Optional[Tuple[float, float]]:
+    async def _expand_short_link(self, short_link: str) -> str:
+        """Follow a maps.app.goo.gl redirect chain without blocking the event loop"""
+        if short_link not in self.expanded_map_links:
+            async with api_client.session() as session:
+                async with session.head(short_link, allow_redirects=True, timeout=aiohttp.ClientTimeout(total=5)) as response:
+                    self.expanded_map_links[short_link] = str(response.url)
+        return self.expanded_map_links[short_link]
+    
+    async def extract_coordinates_from_map_link(self, map_link: str) -> Optional[Tuple[float, float]]:
         """Extract latitude and longitude from Google Maps link"""
         if not map_link:
             return None
@@ -217,11 +245,7 @@ class GarageService:
             if 'maps.app.goo.gl' in cleaned_link:
                 pass
                 try:
-                    import requests
-                    response = requests.head(cleaned_link, allow_redirects=True, timeout=5)
-                    expanded_url = response.url
-                    pass
-                    cleaned_link = expanded_url
+                    cleaned_link = await self._expand_short_link(cleaned_link)
                 except Exception as e:
                     pass
                     return None
@@ -267,15 +291,24 @@ class GarageService:
         garages = await self.fetch_all_garages()
         garages_with_distance = []
         
-        for garage in garages:
-            if garage.map_link:
-                coords = self.extract_coordinates_from_map_link(garage.map_link)
-                if coords:
-                    garage_lat, garage_lng = coords
-                    distance = self.calculate_distance(user_lat, user_lng, garage_lat, garage_lng)
-                    # Update the garage's distance_in_km field
-                    garage.distance_in_km = round(distance, 2)
-                    garages_with_distance.append(garage)
+        # Short links are expanded concurrently instead of one redirect chain at a time,
+        # a bounded number at once
+        mapped_garages = [garage for garage in garages if garage.map_link]
+        semaphore = asyncio.Semaphore(self.map_link_concurrency)
+        
+        async def locate(map_link: str) -> Optional[Tuple[float, float]]:
+            async with semaphore:
+                return await self.extract_coordinates_from_map_link(map_link)
+        
+        all_coords = await asyncio.gather(*(locate(garage.map_link) for garage in mapped_garages))
+        
+        for garage, coords in zip(mapped_garages, all_coords):
+            if coords:
+                garage_lat, garage_lng = coords
+                distance = self.calculate_distance(user_lat, user_lng, garage_lat, garage_lng)
+                # Update the garage's distance_in_km field
+                garage.distance_in_km = round(distance, 2)
+                garages_with_distance.append(garage)
         
         # Sort by distance and return limited results
         garages_with_distance.sort(key=lambda x: x.distance_in_km)
@@ -295,7 +328,7 @@ class GarageService:
             if '.' in cleaned_filename and len(cleaned_filename) > 10:
                 # Test if the URL is accessible
                 try:
-                    async with aiohttp.ClientSession() as session:
+                    async with api_client.session() as session:
                         async with session.head(cleaned_filename, timeout=aiohttp.ClientTimeout(total=3)) as response:
                             if response.status == 200:
                                 return cleaned_filename
@@ -306,7 +339,7 @@ class GarageService:
         # Try R2 storage first (newer images) and validate
         r2_url = f"{self.r2_image_base_url}/{cleaned_filename}"
         try:
-            async with aiohttp.ClientSession() as session:
+            async with api_client.session() as session:
                 async with session.head(r2_url, timeout=aiohttp.ClientTimeout(total=3)) as response:
                     if response.status == 200:
                         return r2_url
@@ -316,7 +349,7 @@ class GarageService:
         # Try API storage as fallback and validate
         api_url = f"{self.image_base_url}{cleaned_filename}"
         try:
-            async with aiohttp.ClientSession() as session:
+            async with api_client.session() as session:
                 async with session.head(api_url, timeout=aiohttp.ClientTimeout(total=3)) as response:
                     if response.status == 200:
                         return api_url
@@ -350,7 +383,7 @@ class GarageService:
             if '.' in cleaned_filename and len(cleaned_filename) > 10:
                 # Test if the URL is accessible
                 try:
-                    async with aiohttp.ClientSession() as session:
+                    async with api_client.session() as session:
                         async with session.head(cleaned_filename, timeout=aiohttp.ClientTimeout(total=3)) as response:
                             if response.status == 200:
                                 return cleaned_filename
@@ -361,7 +394,7 @@ class GarageService:
         # Construct R2 storage URL and validate
         r2_url = f"{self.r2_image_base_url}/{cleaned_filename}"
         try:
-            async with aiohttp.ClientSession() as session:
+            async with api_client.session() as session:
                 async with session.head(r2_url, timeout=aiohttp.ClientTimeout(total=3)) as response:
                     if response.status == 200:
                         return r2_url
@@ -378,4 +411,7 @@ class GarageService:
         if image_filename.startswith(('http://', 'https://')):
             return image_filename
             
-        return f"{self.image_base_url}{image_filename}"
\ No newline at end of file
+        return f"{self.image_base_url}{image_filename}"
+
+# Global instance
+garage_service = GarageService()
@@ -0,0 +1,40 @@
+import json
+import os
+from typing import Any, Callable, Union
+
+try:
+    import orjson
+except ImportError:  # optional speed-up, commented out in requirements.txt
+    orjson = None
+
+class JsonCodec:
+    """A named pair of JSON decode/encode functions working on bytes"""
+
+    def __init__(self, name: str, loads: Callable[[Union[bytes, str]], Any], dumps: Callable[[Any], bytes]):
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+    @property
+    def is_fast(self) -> bool:
+        return self.name != 'stdlib'
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False, default=str).encode('utf-8')
+
+def _orjson_dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+STDLIB_CODEC = JsonCodec('stdlib', json.loads, _stdlib_dumps)
+ORJSON_CODEC = JsonCodec('orjson', orjson.loads, _orjson_dumps) if orjson is not None else None
+
+def select_codec(preference: str = 'auto') -> JsonCodec:
+    """Pick the JSON codec: 'auto' prefers orjson when installed, 'stdlib' forces the json module"""
+    if preference in ('auto', 'orjson') and ORJSON_CODEC is not None:
+        return ORJSON_CODEC
+    if preference == 'orjson':
+        print("JSON_CODEC=orjson but orjson is not installed, using the stdlib json module")
+    return STDLIB_CODEC
+
+# Codec used for API payloads and the catalog snapshot
+json_codec = select_codec(os.getenv('JSON_CODEC', 'auto').lower())
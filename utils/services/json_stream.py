@@ -0,0 +1,124 @@
+import codecs
+import json
+import re
+from typing import Any, AsyncIterator, Dict, Optional
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# Once this much of the buffer has been consumed it is trimmed
+_COMPACT_THRESHOLD = 64 * 1024
+
+class _StreamBuffer:
+    """Text buffer fed from an async byte-chunk iterator"""
+
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self.chunks = chunks
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.json_decoder = json.JSONDecoder()
+        self.text = ''
+        self.pos = 0
+        self.eof = False
+
+    async def fill(self) -> bool:
+        """Append the next chunk to the buffer; returns False once the stream is exhausted"""
+        if self.eof:
+            return False
+
+        try:
+            chunk = await self.chunks.__anext__()
+        except StopAsyncIteration:
+            self.eof = True
+            self.text += self.decoder.decode(b'', final=True)
+            return False
+
+        if self.pos >= _COMPACT_THRESHOLD:
+            self.text = self.text[self.pos:]
+            self.pos = 0
+        self.text += self.decoder.decode(chunk)
+        return True
+
+    async def peek(self) -> str:
+        """Skip whitespace and return the next character without consuming it"""
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not await self.fill():
+                raise ValueError("Unexpected end of JSON stream")
+
+    async def expect(self, char: str) -> None:
+        """Consume the given structural character"""
+        found = await self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' in JSON stream, found '{found}'")
+        self.pos += 1
+
+    async def value(self) -> Any:
+        """Decode one complete JSON value, reading more chunks as needed"""
+        await self.peek()
+        while True:
+            try:
+                obj, end = self.json_decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not await self.fill():
+                    raise
+                continue
+
+            # A number or literal ending exactly at the buffer edge may be cut short
+            if end == len(self.text) and not self.eof:
+                await self.fill()
+                continue
+
+            self.pos = end
+            return obj
+
+async def iter_json_array_items(chunks: AsyncIterator[bytes], key: str = 'data',
+                                meta: Optional[Dict[str, Any]] = None) -> AsyncIterator[Any]:
+    """Yield the items of a JSON array one by one while the body is still downloading.
+
+    Handles both a bare top-level array and an object whose `key` property holds the
+    array. Other top-level properties of the object (e.g. totalItems) are stored in
+    `meta` when given.
+    """
+    buffer = _StreamBuffer(chunks)
+
+    async def array_items() -> AsyncIterator[Any]:
+        await buffer.expect('[')
+        if await buffer.peek() == ']':
+            buffer.pos += 1
+            return
+        while True:
+            yield await buffer.value()
+            separator = await buffer.peek()
+            buffer.pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise ValueError(f"Expected ',' or ']' in JSON array, found '{separator}'")
+
+    if await buffer.peek() == '[':
+        async for item in array_items():
+            yield item
+        return
+
+    await buffer.expect('{')
+    if await buffer.peek() == '}':
+        return
+
+    while True:
+        name = await buffer.value()
+        await buffer.expect(':')
+
+        if name == key and await buffer.peek() == '[':
+            async for item in array_items():
+                yield item
+        else:
+            value = await buffer.value()
+            if meta is not None:
+                meta[name] = value
+
+        separator = await buffer.peek()
+        buffer.pos += 1
+        if separator == '}':
+            return
+        if separator != ',':
+            raise ValueError(f"Expected ',' or '}}' in JSON object, found '{separator}'")
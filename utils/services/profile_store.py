@@ -0,0 +1,86 @@
+from typing import Any, Dict, List, Optional, Tuple
+from utils.services.session_store import SessionStore
+
+class ProfileStore:
+    """The one in-memory copy of each user's profile, keyed by telegram_id.
+
+    A profile is the local user dict (see UserAPIService._convert_api_user_to_local)
+    plus whatever else has been learned about the user: 'latitude'/'longitude' once
+    the location is known and 'favorites' once they have been fetched. A profile
+    that only holds a few fields (e.g. a language picked before the user record was
+    loaded) is partial; is_complete() tells the two apart.
+    """
+
+    def __init__(self):
+        self._profiles = SessionStore('user_profiles')
+
+    def get(self, telegram_id: int) -> Optional[Dict[str, Any]]:
+        return self._profiles.get(telegram_id)
+
+    def get_complete(self, telegram_id: int) -> Optional[Dict[str, Any]]:
+        """The profile if it holds the full user record (from the API or the local fallback).
+
+        This is the lookup counted in the store's hit rate, once per get_or_create_user;
+        the field accessors below peek without counting.
+        """
+        profile = self._profiles.get(telegram_id)
+        return profile if profile is not None and 'source' in profile else None
+
+    def is_complete(self, telegram_id: int) -> bool:
+        profile = self._profiles.peek(telegram_id)
+        return profile is not None and 'source' in profile
+
+    def put(self, telegram_id: int, user: Dict[str, Any]) -> Dict[str, Any]:
+        """Store a user record, keeping locally known fields it does not carry.
+
+        The entry is stored again, so its TTL and LRU position start over.
+        """
+        profile = self._profiles.peek(telegram_id) or {'telegram_id': telegram_id}
+        profile.update(user)
+        self._profiles[telegram_id] = profile
+        return profile
+
+    def update(self, telegram_id: int, **fields: Any) -> Dict[str, Any]:
+        """Set individual profile fields, creating a partial profile if needed.
+
+        Unlike put() this keeps the entry's TTL: a few local fields don't make the
+        rest of the record any fresher.
+        """
+        profile = self._profiles.peek(telegram_id)
+        if profile is None:
+            return self.put(telegram_id, fields)
+        profile.update(fields)
+        return profile
+
+    def forget(self, telegram_id: Optional[int] = None) -> None:
+        """Drop one user's profile, or every profile"""
+        if telegram_id is None:
+            self._profiles.clear()
+        else:
+            self._profiles.pop(telegram_id, None)
+
+    def language(self, telegram_id: int) -> Optional[str]:
+        """The user's language; read for every rendered string, so not counted in the hit rate"""
+        profile = self._profiles.peek(telegram_id)
+        return profile.get('language') if profile else None
+
+    def knows_location(self, telegram_id: int) -> bool:
+        profile = self._profiles.peek(telegram_id)
+        return profile is not None and 'latitude' in profile
+
+    def location(self, telegram_id: int) -> Optional[Tuple[float, float]]:
+        profile = self._profiles.peek(telegram_id) or {}
+        if profile.get('latitude') and profile.get('longitude'):
+            return (profile['latitude'], profile['longitude'])
+        return None
+
+    def favorites(self, telegram_id: int) -> Optional[List[Dict]]:
+        """The user's favorites if they have been fetched, else None"""
+        profile = self._profiles.peek(telegram_id)
+        return profile.get('favorites') if profile else None
+
+    def stats(self) -> Dict[str, Any]:
+        return self._profiles.stats()
+
+# Global instance
+profile_store = ProfileStore()
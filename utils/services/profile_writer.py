@@ -0,0 +1,142 @@
+import asyncio
+import contextvars
+from typing import Any, Dict, Optional
+from utils.config.settings import USER_WRITE_DELAY, USER_WRITE_MAX_ATTEMPTS, USER_WRITE_RETRY_DELAY
+from utils.services.profile_store import profile_store
+
+# Update fields that are also profile fields (see UserAPIService._convert_api_user_to_local)
+PROFILE_FIELDS = ('language', 'latitude', 'longitude')
+
+class ProfileWriter:
+    """Write-behind queue for user updates sent to /User/UpdateTelegramUser.
+
+    A change is applied to the user's profile at once, so the handler can reply
+    straight away. Changes waiting to be sent are merged per user (the newest value
+    of each field wins), so e.g. several location shares in a row become one PUT.
+    A background task sends them after `delay` seconds and retries failed PUTs
+    with backoff, up to `max_attempts` per user.
+    """
+
+    def __init__(self, delay: float = USER_WRITE_DELAY, max_attempts: int = USER_WRITE_MAX_ATTEMPTS,
+                 retry_delay: float = USER_WRITE_RETRY_DELAY):
+        self.delay = delay
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = retry_delay
+        # telegram_id -> fields not yet sent
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._attempts: Dict[int, int] = {}
+        self._worker: Optional[asyncio.Task] = None
+        # Whether the worker is sending a batch (rather than waiting), and whether close() was called
+        self._flushing = False
+        self._stopping = False
+        self.stats = {'queued': 0, 'coalesced': 0, 'writes': 0, 'retries': 0, 'dropped': 0}
+
+    def submit(self, telegram_id: int, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply `fields` to the profile now and queue them for the API; returns the profile"""
+        profile = profile_store.update(telegram_id, **self._profile_fields(fields))
+
+        pending = self._pending.setdefault(telegram_id, {})
+        if pending:
+            self.stats['coalesced'] += 1
+        pending.update(fields)
+        self.stats['queued'] += 1
+
+        if self._worker is None or self._worker.done():
+            # A fresh context: the worker outlives the update that started it (see update_scope)
+            self._worker = asyncio.get_running_loop().create_task(self._run(), context=contextvars.Context())
+        return profile
+
+    def pending(self, telegram_id: int) -> Optional[Dict[str, Any]]:
+        """Fields queued for the user but not sent yet, if any"""
+        return self._pending.get(telegram_id)
+
+    async def flush(self) -> int:
+        """Send every queued update now; returns how many users' updates failed"""
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+        try:
+            results = await asyncio.gather(*(self._write(telegram_id, fields) for telegram_id, fields in batch.items()))
+        except asyncio.CancelledError:
+            # Cancelled mid-batch (e.g. the loop shutting down): queue the batch again, under
+            # anything newer, so it is not lost; a PUT that already went through is just repeated
+            for telegram_id, fields in batch.items():
+                self._pending[telegram_id] = {**fields, **self._pending.get(telegram_id, {})}
+            raise
+        return results.count(False)
+
+    async def close(self) -> None:
+        """Stop the background task and make a last attempt at everything still queued"""
+        self._stopping = True
+        worker = self._worker
+        if worker is not None and not worker.done():
+            if not self._flushing:
+                # Only waiting for the next round: nothing is in flight
+                worker.cancel()
+            # A batch being sent is allowed to finish; the worker stops after it
+            try:
+                await worker
+            except asyncio.CancelledError:
+                pass
+        failed = await self.flush()
+        if failed:
+            print(f"⚠️ {failed} user update(s) could not be sent before shutdown")
+
+    async def _run(self) -> None:
+        failed_rounds = 0
+        while self._pending and not self._stopping:
+            if failed_rounds:
+                await asyncio.sleep(min(self.retry_delay * 2 ** (failed_rounds - 1), 60))
+            else:
+                await asyncio.sleep(self.delay)
+            self._flushing = True
+            try:
+                failed_rounds = failed_rounds + 1 if await self.flush() else 0
+            finally:
+                self._flushing = False
+
+    async def _write(self, telegram_id: int, fields: Dict[str, Any]) -> bool:
+        from utils.services.user_api_service import user_api_service
+
+        try:
+            # Returns None when the PUT was applied but the API sent no user back: still a write
+            await user_api_service.send_user_update(telegram_id, fields)
+            sent = True
+        except Exception as e:
+            print(f"⚠️ User {telegram_id} update failed: {e}")
+            sent = False
+        newer = self._pending.get(telegram_id)
+        if sent:
+            self._attempts.pop(telegram_id, None)
+            self.stats['writes'] += 1
+            if newer:
+                # The API's answer predates changes queued while the PUT was in flight
+                profile_store.update(telegram_id, **self._profile_fields(newer))
+            return True
+
+        attempts = self._attempts.get(telegram_id, 0) + 1
+        if attempts >= self.max_attempts:
+            self._attempts.pop(telegram_id, None)
+            self.stats['dropped'] += 1
+            print(f"❌ Giving up on user {telegram_id} update after {attempts} attempts: {fields}")
+            return False
+
+        # Queue it again, under anything newer that arrived meanwhile
+        self._attempts[telegram_id] = attempts
+        self._pending[telegram_id] = {**fields, **(newer or {})}
+        self.stats['retries'] += 1
+        return False
+
+    @staticmethod
+    def _profile_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+        return {field: value for field, value in fields.items() if field in PROFILE_FIELDS}
+
+    def format_stats(self) -> str:
+        return (
+            f"✍️ User updates: {self.stats['queued']} queued, {self.stats['coalesced']} merged, "
+            f"{self.stats['writes']} sent, {self.stats['retries']} retried, "
+            f"{self.stats['dropped']} dropped, {len(self._pending)} pending"
+        )
+
+# Global instance
+profile_writer = ProfileWriter()
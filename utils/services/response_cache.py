@@ -0,0 +1,168 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Mapping, Optional
+from urllib.parse import urlsplit
+from utils.services.json_codec import json_codec
+from utils.config.settings import (
+    HTTP_CACHE_ENABLED, HTTP_CACHE_DIR, HTTP_CACHE_TTL, HTTP_CACHE_MAX_STALE, HTTP_CACHE_MAX_MB
+)
+
+# Read-only inventory endpoints whose GET responses may be shared across restarts and workers
+CACHEABLE_ENDPOINTS = ('Product', 'Category', 'Brand', 'Garage', 'ChargingStation', 'Accessory')
+
+class CachedEntry:
+    """A response body stored on disk; the file's mtime is when it was last known to be current"""
+
+    def __init__(self, path: str, stored_at: float, etag: Optional[str], last_modified: Optional[str],
+                 body: bytes, ttl: float, max_stale: float):
+        self.path = path
+        self.stored_at = stored_at
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+        self.ttl = ttl
+        self.max_stale = max_stale
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+    @property
+    def is_fresh(self) -> bool:
+        """Young enough to use without asking the API"""
+        return self.age < self.ttl
+
+    @property
+    def usable_offline(self) -> bool:
+        """Young enough to serve when the API cannot be reached"""
+        return self.age < self.max_stale
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+class ResponseCache:
+    """Size-bounded on-disk cache of GET response bodies, shared by restarts and workers on one host"""
+
+    def __init__(self, directory: str = HTTP_CACHE_DIR, ttl: float = HTTP_CACHE_TTL,
+                 max_stale: float = HTTP_CACHE_MAX_STALE, max_bytes: int = HTTP_CACHE_MAX_MB * 1024 * 1024,
+                 enabled: bool = HTTP_CACHE_ENABLED):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_stale = max(max_stale, ttl)
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.stats = {'fresh_hits': 0, 'revalidated': 0, 'stale_served': 0, 'writes': 0, 'evictions': 0}
+        # Bytes written since the directory size was last checked against max_bytes; writes
+        # run in worker threads, so the counter is only touched under the lock
+        self._written_since_scan = None
+        self._scan_lock = threading.Lock()
+
+    def accepts(self, url: str) -> bool:
+        """Whether responses for this URL are cached on disk"""
+        if not self.enabled:
+            return False
+        segment = urlsplit(url).path.strip('/').split('/', 1)[0]
+        return segment in CACHEABLE_ENDPOINTS
+
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.cache')
+
+    async def get(self, url: str, key: str) -> Optional[CachedEntry]:
+        """The stored response for a cache key, or None if missing, unreadable or too old to ever use"""
+        if not self.accepts(url):
+            return None
+        return await asyncio.to_thread(self._read, self._path_for(key))
+
+    def _read(self, path: str) -> Optional[CachedEntry]:
+        try:
+            stored_at = os.path.getmtime(path)
+            with open(path, 'rb') as cache_file:
+                header = json_codec.loads(cache_file.readline())
+                body = cache_file.read()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Ignoring unreadable response cache entry {path}: {e}")
+            return None
+
+        entry = CachedEntry(path, stored_at, header.get('etag'), header.get('last_modified'),
+                            body, self.ttl, self.max_stale)
+        return entry if entry.usable_offline else None
+
+    async def put(self, url: str, key: str, body: bytes, headers: Mapping[str, str]) -> None:
+        """Store a 200 response body together with its validators"""
+        if not self.accepts(url):
+            return
+        header = {'url': key, 'etag': headers.get('ETag'), 'last_modified': headers.get('Last-Modified')}
+        try:
+            await asyncio.to_thread(self._write, self._path_for(key), json_codec.dumps(header), body)
+            self.stats['writes'] += 1
+        except Exception as e:
+            print(f"Error writing response cache entry for {key}: {e}")
+
+    def _write(self, path: str, header: bytes, body: bytes) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+
+        # Write to a temp file and rename so other workers never read a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.response_')
+        try:
+            with os.fdopen(fd, 'wb') as cache_file:
+                cache_file.write(header + b'\n')
+                cache_file.write(body)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        # Checking the directory size on every write would be wasteful; do it every ~10% of the budget
+        with self._scan_lock:
+            scan_due = self._written_since_scan is None or self._written_since_scan >= self.max_bytes // 10
+            if scan_due:
+                self._written_since_scan = 0
+            self._written_since_scan += len(header) + len(body)
+        if scan_due:
+            self._evict()
+
+    async def refresh(self, entry: CachedEntry) -> None:
+        """Mark an entry as current again after the API answered 304 Not Modified"""
+        self.stats['revalidated'] += 1
+        try:
+            await asyncio.to_thread(os.utime, entry.path)
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """Delete the least recently stored entries until the cache fits in max_bytes"""
+        try:
+            entries = []
+            with os.scandir(self.directory) as scan:
+                for item in scan:
+                    if item.name.endswith('.cache'):
+                        stat = item.stat()
+                        entries.append((stat.st_mtime, stat.st_size, item.path))
+        except FileNotFoundError:
+            return
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                self.stats['evictions'] += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+
+# Global instance
+response_cache = ResponseCache()
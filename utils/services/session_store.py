@@ -0,0 +1,121 @@
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Dict, Hashable, Iterator, Tuple
+from utils.config.settings import SESSION_STORE_MAX_USERS, SESSION_STORE_TTL
+
+# Every store created, by name, so their counters can be reported together
+stores: Dict[str, 'SessionStore'] = {}
+
+def _deep_size(value: Any) -> int:
+    """Approximate memory of a value, following dict/list/tuple/set containers one level at a time"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_deep_size(key) + _deep_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_deep_size(item) for item in value)
+    return size
+
+class SessionStore(MutableMapping):
+    """Bounded per-user store: least recently used entries are evicted and entries expire after a TTL.
+
+    Behaves like a dict. An expired entry is dropped when it is looked up, so the
+    caller fetches a fresh copy. Hits and misses are counted by `in` and get().
+    """
+
+    def __init__(self, name: str, max_entries: int = SESSION_STORE_MAX_USERS, ttl: float = SESSION_STORE_TTL):
+        self.name = name
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        # key -> (stored_at, value), least recently used first
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self.counters = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+        stores[name] = self
+
+    def _expired(self, entry: Tuple[float, Any]) -> bool:
+        return bool(self.ttl) and time.monotonic() - entry[0] > self.ttl
+
+    def _live(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False
+        if self._expired(entry):
+            del self._entries[key]
+            self.counters['expirations'] += 1
+            return False
+        self._entries.move_to_end(key)
+        return True
+
+    def __contains__(self, key: Hashable) -> bool:
+        live = self._live(key)
+        self.counters['hits' if live else 'misses'] += 1
+        return live
+
+    def __getitem__(self, key: Hashable) -> Any:
+        if not self._live(key):
+            raise KeyError(key)
+        return self._entries[key][1]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        # `in` has already expired or refreshed the entry (and counted the lookup)
+        return self._entries[key][1] if key in self else default
+    
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Like get(), but not counted as a hit or miss and without refreshing the LRU position"""
+        entry = self._entries.get(key)
+        if entry is None or self._expired(entry):
+            return default
+        return entry[1]
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.counters['evictions'] += 1
+
+    def __delitem__(self, key: Hashable) -> None:
+        del self._entries[key]
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def memory_estimate(self, sample_size: int = 200) -> int:
+        """Approximate bytes held, extrapolated from the most recently used entries"""
+        if not self._entries:
+            return sys.getsizeof(self._entries)
+        sample = []
+        for key in reversed(self._entries):
+            sample.append(_deep_size(key) + _deep_size(self._entries[key]))
+            if len(sample) >= sample_size:
+                break
+        return sys.getsizeof(self._entries) + int(sum(sample) / len(sample) * len(self._entries))
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.counters['hits'] + self.counters['misses']
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            **self.counters,
+            'hit_rate': self.counters['hits'] / lookups if lookups else 0.0,
+            'memory_bytes': self.memory_estimate()
+        }
+
+def format_store_stats() -> str:
+    """One line per store for the periodic metrics output"""
+    lines = []
+    for name, store in stores.items():
+        stats = store.stats()
+        lines.append(
+            f"🗂️ {name}: {stats['entries']}/{stats['max_entries']} entries, "
+            f"~{stats['memory_bytes'] / 1024:.0f} KB, hit rate {stats['hit_rate']:.0%}, "
+            f"{stats['evictions']} evicted, {stats['expirations']} expired"
+        )
+    return '\n'.join(lines)
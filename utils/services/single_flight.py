@@ -0,0 +1,35 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one shared in-flight task"""
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        # 'leaders' started an upstream call, 'followers' joined one already running
+        self.stats = {'leaders': 0, 'followers': 0}
+
+    def in_flight(self, key: str) -> bool:
+        """Whether a call for `key` is currently running"""
+        return key in self._in_flight
+
+    def start(self, key: str, func: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """Start `func` for `key` unless a call is already running, and return the shared task"""
+        task = self._in_flight.get(key)
+        if task is None:
+            self.stats['leaders'] += 1
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda finished: self._forget(key, finished))
+        else:
+            self.stats['followers'] += 1
+        return task
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run `func` once for all concurrent callers of `key` and give each the same result"""
+        # A caller that gives up (e.g. a cancelled handler) must not cancel the shared fetch
+        return await asyncio.shield(self.start(key, func))
+
+    def _forget(self, key: str, finished: asyncio.Task) -> None:
+        if self._in_flight.get(key) is finished:
+            del self._in_flight[key]
@@ -0,0 +1,84 @@
+import asyncio
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+# 'scopes' opened, upstream 'lookups' made and 'deduplicated' lookups answered from a scope
+stats = {'scopes': 0, 'lookups': 0, 'deduplicated': 0}
+
+class UpdateScope:
+    """Lookups memoized for the duration of one Telegram update.
+
+    Every handler, keyboard and text lookup that runs while the update is being
+    processed shares the same results, so e.g. the user record is fetched once.
+    """
+
+    def __init__(self, update_id: Optional[int] = None):
+        self.update_id = update_id
+        self._memo: Dict[Hashable, asyncio.Future] = {}
+
+    async def memoize(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run `func` the first time `key` is asked for in this update; later calls share its result"""
+        future = self._memo.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self._memo[key] = future
+            stats['lookups'] += 1
+        else:
+            stats['deduplicated'] += 1
+        return await asyncio.shield(future)
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """The result for `key` if it has already been resolved in this update, without waiting"""
+        future = self._memo.get(key)
+        if future is None or not future.done() or future.cancelled() or future.exception() is not None:
+            return default
+        return future.result()
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Record a value that is known to be current (e.g. the API's answer to a write)"""
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(value)
+        self._memo[key] = future
+
+    def forget(self, key: Hashable) -> None:
+        """Drop a memoized result so the next lookup goes upstream again"""
+        self._memo.pop(key, None)
+
+# The scope of the update being processed; PTB runs all handler groups of an update in one task
+_current_scope: ContextVar[Optional[UpdateScope]] = ContextVar('update_scope', default=None)
+
+def begin_update_scope(update_id: Optional[int] = None) -> UpdateScope:
+    """Start a fresh scope for the current task, replacing the previous update's"""
+    scope = UpdateScope(update_id)
+    _current_scope.set(scope)
+    stats['scopes'] += 1
+    return scope
+
+def current_update_scope() -> Optional[UpdateScope]:
+    return _current_scope.get()
+
+async def memoize(key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+    """Memoize `func` in the current update's scope; outside an update it simply runs"""
+    scope = _current_scope.get()
+    if scope is None:
+        return await func()
+    return await scope.memoize(key, func)
+
+def remember(key: Hashable, value: Any) -> None:
+    """Store a fresh value in the current update's scope, if there is one"""
+    scope = _current_scope.get()
+    if scope is not None:
+        scope.set(key, value)
+
+def forget(key: Hashable) -> None:
+    scope = _current_scope.get()
+    if scope is not None:
+        scope.forget(key)
+
+def peek(key: Hashable, default: Any = None) -> Any:
+    scope = _current_scope.get()
+    return scope.peek(key, default) if scope is not None else default
+
+async def open_update_scope(update: object, context: Any) -> None:
+    """Pre-handler (group -1) that gives each incoming update its own scope"""
+    begin_update_scope(getattr(update, 'update_id', None))
@@ -1,10 +1,14 @@
 import os
 import aiohttp
 import asyncio
-import os
 from typing import Dict, Optional, List
 from datetime import datetime
-from utils.config.settings import API_BASE_URL
+from utils.config.settings import API_BASE_URL, USER_NOT_FOUND_TTL
+from utils.services.api_client import api_client
+from utils.services import update_scope
+from utils.services.profile_store import profile_store
+from utils.services.profile_writer import profile_writer
+from utils.services.session_store import SessionStore
 
 class UserAPIService:
     """Handles user management operations with external API"""
@@ -12,36 +16,35 @@ class UserAPIService:
     def __init__(self):
         self.api_base_url = API_BASE_URL
         self.api_timeout = int(os.getenv('API_TIMEOUT', '30'))
+        # telegram_ids the API answered 404 for, remembered briefly (negative cache)
+        self.not_found = SessionStore('user_not_found', ttl=USER_NOT_FOUND_TTL)
     
     async def get_user(self, telegram_id: int) -> Optional[Dict]:
-        """Get user data from API by telegram ID"""
+        """Get user data from API by telegram ID (fetched at most once per update)"""
+        return await update_scope.memoize(('user', telegram_id), lambda: self._fetch_user(telegram_id))
+    
+    async def _fetch_user(self, telegram_id: int) -> Optional[Dict]:
+        """GET /User/GetTelegramUser for one user"""
+        if telegram_id in self.not_found:
+            return None
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.api_base_url}/User/GetTelegramUser/{telegram_id}",
-                    timeout=aiohttp.ClientTimeout(total=self.api_timeout)
+            async with api_client.session() as session:
+                async with api_client.request(
+                    session, 'GET',
+                    f"{self.api_base_url}/User/GetTelegramUser/{telegram_id}"
                 ) as response:
                     if response.status == 200:
-                        data = await response.json()
-                        print(f"DEBUG: Raw API response for user {telegram_id}: {data}")
+                        data = await api_client.read_json(response)
                         
                         # The API returns user data directly, not wrapped in a 'data' field
-                        user_data = data if isinstance(data, dict) and data.get('telegramId') else None
-                        if user_data:
-                            print(f"DEBUG: Extracted user data for {telegram_id}: {user_data}")
-                            print(f"DEBUG: Language field from API for user {telegram_id}: {user_data.get('language', 'FIELD_NOT_FOUND')}")
-                        else:
-                            print(f"DEBUG: No valid user data found in response for {telegram_id}")
-                        
-                        return user_data
+                        return data if isinstance(data, dict) and data.get('telegramId') else None
                     elif response.status == 404:
-                        print(f"DEBUG: User {telegram_id} not found in API (404)")
+                        self.not_found[telegram_id] = True
                         return None
                     else:
-                        print(f"DEBUG: API error for user {telegram_id}, status: {response.status}")
                         response.raise_for_status()
         except Exception as e:
-            pass
+            print(f"User API get_user failed: {e}")
             return None
     
     async def create_user(self, user_data: Dict) -> Optional[Dict]:
@@ -56,97 +59,110 @@ class UserAPIService:
                 "language": user_data.get('language', 'en')
             }
             
-            print(f"DEBUG: Creating user with data: {api_user_data}")
-            print(f"DEBUG: Language being sent to API: {api_user_data.get('language')}")
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
+            async with api_client.session() as session:
+                async with api_client.request(
+                    session, 'POST',
                     f"{self.api_base_url}/User/CreateTelegramUser",
-                    json=api_user_data,
-                    timeout=aiohttp.ClientTimeout(total=self.api_timeout)
+                    json=api_user_data
                 ) as response:
                     if response.status in [200, 201]:
-                        data = await response.json()
-                        print(f"DEBUG: Create user API response: {data}")
+                        data = await api_client.read_json(response)
                         
                         created_user = data.get('data') if isinstance(data, dict) else data
                         if created_user:
-                            print(f"DEBUG: Created user data: {created_user}")
-                            print(f"DEBUG: Language field in created user: {created_user.get('language', 'FIELD_NOT_FOUND')}")
+                            self.not_found.pop(int(api_user_data['telegramId']), None)
+                            update_scope.remember(('user', int(api_user_data['telegramId'])), created_user)
                         
                         return created_user
                     elif response.status == 409:
-                        # User already exists, return None to trigger get_user in get_or_create_user
-                        print(f"User {user_data.get('telegram_id')} already exists (409 Conflict)")
+                        # User already exists: use the record if the conflict response carries
+                        # one, otherwise return None to trigger get_user in get_or_create_user
+                        print(f"User {api_user_data.get('telegramId')} already exists (409 Conflict)")
+                        self.not_found.pop(int(api_user_data['telegramId']), None)
+                        try:
+                            data = await api_client.read_json(response)
+                        except ValueError:
+                            data = None
+                        existing_user = data.get('data', data) if isinstance(data, dict) else None
+                        if isinstance(existing_user, dict) and existing_user.get('telegramId'):
+                            update_scope.remember(('user', int(api_user_data['telegramId'])), existing_user)
+                            return existing_user
                         return None
                     else:
                         response.raise_for_status()
         except Exception as e:
-            pass
+            print(f"User API create_user failed: {e}")
             return None
     
     async def update_user(self, telegram_id: int, update_data: Dict) -> Optional[Dict]:
-        """Update user data via API"""
+        """Update user data via API (None if the update failed or the API sent no user back)"""
         try:
-            # Prepare update data for API
-            api_update_data = {
-                "language": update_data.get('language'),
-                "settings": update_data.get('settings'),
-                "latitude": update_data.get('latitude'),
-                "longitude": update_data.get('longitude'),
-                "locationUpdatedAt": update_data.get('locationUpdatedAt')
-            }
-            
-            # Remove None values
-            api_update_data = {k: v for k, v in api_update_data.items() if v is not None}
-            
-            pass
-            if 'language' in api_update_data:
-                pass
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.put(
-                    f"{self.api_base_url}/User/UpdateTelegramUser/{telegram_id}",
-                    json=api_update_data,
-                    timeout=aiohttp.ClientTimeout(total=self.api_timeout)
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        print(f"DEBUG: Update user API response: {data}")
-                        
-                        # The API returns the user object directly, not wrapped in 'data'
-                        updated_user = data if isinstance(data, dict) and data.get('telegramId') else None
-                        if updated_user:
-                            print(f"DEBUG: Updated user data: {updated_user}")
-                            print(f"DEBUG: Language field in updated user: {updated_user.get('language', 'FIELD_NOT_FOUND')}")
-                        else:
-                            print(f"DEBUG: No valid user data found in API response")
-                        
-                        return updated_user
-                    else:
-                        print(f"DEBUG: API update failed for user {telegram_id}, status: {response.status}")
-                        response.raise_for_status()
+            return await self.send_user_update(telegram_id, update_data)
         except Exception as e:
-            pass
+            print(f"User API update_user failed: {e}")
             return None
     
+    async def send_user_update(self, telegram_id: int, update_data: Dict) -> Optional[Dict]:
+        """PUT an update to /User/UpdateTelegramUser; raises if the API did not apply it.
+
+        Returns the updated user, or None when the update was applied but the API
+        did not answer with a user object.
+        """
+        # Prepare update data for API
+        api_update_data = {
+            "language": update_data.get('language'),
+            "settings": update_data.get('settings'),
+            "latitude": update_data.get('latitude'),
+            "longitude": update_data.get('longitude'),
+            "locationUpdatedAt": update_data.get('locationUpdatedAt')
+        }
+        
+        # Remove None values
+        api_update_data = {k: v for k, v in api_update_data.items() if v is not None}
+        
+        async with api_client.session() as session:
+            async with api_client.request(
+                session, 'PUT',
+                f"{self.api_base_url}/User/UpdateTelegramUser/{telegram_id}",
+                json=api_update_data
+            ) as response:
+                if response.status == 200:
+                    data = await api_client.read_json(response)
+                    
+                    # The API returns the user object directly, not wrapped in 'data'
+                    updated_user = data if isinstance(data, dict) and data.get('telegramId') else None
+                    if updated_user:
+                        update_scope.remember(('user', telegram_id), updated_user)
+                        self._store_profile(telegram_id, updated_user, update_data)
+                    
+                    return updated_user
+                else:
+                    response.raise_for_status()
+                    return None
+    
     async def get_user_favorites(self, telegram_id: int) -> List[Dict]:
-        """Get user's favorite cars from API"""
+        """Get user's favorite cars, from the profile once they have been fetched"""
+        cached = profile_store.favorites(telegram_id)
+        if cached is not None:
+            return list(cached)
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.api_base_url}/User/{telegram_id}/favorites",
-                    timeout=aiohttp.ClientTimeout(total=self.api_timeout)
+            async with api_client.session() as session:
+                async with api_client.request(
+                    session, 'GET',
+                    f"{self.api_base_url}/User/{telegram_id}/favorites"
                 ) as response:
                     if response.status == 200:
-                        data = await response.json()
-                        return data.get('data', []) if isinstance(data, dict) else data
+                        data = await api_client.read_json(response)
+                        favorites = data.get('data', []) if isinstance(data, dict) else data
+                        profile_store.update(telegram_id, favorites=list(favorites or []))
+                        return favorites
                     elif response.status == 404:
+                        profile_store.update(telegram_id, favorites=[])
                         return []
                     else:
                         response.raise_for_status()
         except Exception as e:
-            pass
+            print(f"User API get_user_favorites failed: {e}")
             return []
     
     async def add_favorite(self, telegram_id: int, car_id: int) -> bool:
@@ -158,32 +174,47 @@ class UserAPIService:
                 "addedAt": datetime.now().isoformat()
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
+            async with api_client.session() as session:
+                async with api_client.request(
+                    session, 'POST',
                     f"{self.api_base_url}/User/{telegram_id}/favorites",
-                    json=favorite_data,
-                    timeout=aiohttp.ClientTimeout(total=self.api_timeout)
+                    json=favorite_data
                 ) as response:
-                    return response.status in [200, 201]
+                    added = response.status in [200, 201]
+            
+            # Keep the profile's copy in step instead of refetching the list
+            favorites = profile_store.favorites(telegram_id)
+            if added and favorites is not None:
+                favorites.append(favorite_data)
+            return added
         except Exception as e:
-            pass
+            print(f"User API add_favorite failed: {e}")
             return False
     
     async def remove_favorite(self, telegram_id: int, car_id: int) -> bool:
         """Remove car from user's favorites via API"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.delete(
-                    f"{self.api_base_url}/User/{telegram_id}/favorites/{car_id}",
-                    timeout=aiohttp.ClientTimeout(total=self.api_timeout)
+            async with api_client.session() as session:
+                async with api_client.request(
+                    session, 'DELETE',
+                    f"{self.api_base_url}/User/{telegram_id}/favorites/{car_id}"
                 ) as response:
-                    return response.status in [200, 204]
+                    removed = response.status in [200, 204]
+            
+            favorites = profile_store.favorites(telegram_id)
+            if removed and favorites is not None:
+                favorites[:] = [fav for fav in favorites if fav.get('carId', fav.get('car_id')) != car_id]
+            return removed
         except Exception as e:
-            pass
+            print(f"User API remove_favorite failed: {e}")
             return False
     
+    def queue_user_update(self, telegram_id: int, update_data: Dict) -> Dict:
+        """Apply an update to the user's profile now and send it to the API in the background"""
+        return profile_writer.submit(telegram_id, update_data)
+    
     async def update_user_location(self, telegram_id: int, latitude: float, longitude: float) -> bool:
-        """Update user's location coordinates"""
+        """Update user's location coordinates (saved locally at once, sent to the API in the background)"""
         try:
             from datetime import datetime
             location_data = {
@@ -192,73 +223,56 @@ class UserAPIService:
                 'locationUpdatedAt': datetime.now().isoformat()
             }
             
-            print(f"DEBUG: Sending location data to API: {location_data}")
-            updated_user = await self.update_user(telegram_id, location_data)
-            print(f"DEBUG: API returned user data: {updated_user}")
-            
-            # Consider it successful if we get any user data back (API accepts the update)
-            # The API might not return the location fields in the response
-            success = updated_user is not None and updated_user.get('telegramId') == str(telegram_id)
-            print(f"DEBUG: Location update success determination: {success}")
-            return success
+            self.queue_user_update(telegram_id, location_data)
+            return True
         except Exception as e:
-            pass
+            print(f"User API update_user_location failed: {e}")
             return False
     
     async def get_user_location(self, telegram_id: int) -> tuple[float, float] | None:
         """Get user's stored location coordinates"""
         try:
+            if profile_store.knows_location(telegram_id):
+                return profile_store.location(telegram_id)
+            
             user = await self.get_user(telegram_id)
+            if user:
+                profile_store.update(telegram_id, latitude=user.get('latitude'), longitude=user.get('longitude'))
             if user and user.get('latitude') and user.get('longitude'):
                 return (user['latitude'], user['longitude'])
             return None
         except Exception as e:
-            pass
+            print(f"User API get_user_location failed: {e}")
             return None
     
     async def get_or_create_user(self, telegram_user) -> Dict:
         """Get existing user or create new one with dynamic language detection"""
         telegram_id = telegram_user.id
+        language_code = getattr(telegram_user, 'language_code', None)
+        telegram_language = self._map_telegram_language(language_code)
         
-        # Try to get existing user first
-        user = await self.get_user(telegram_id)
+        # Every module reads the same profile; only a missing or expired one goes to the API
+        profile = profile_store.get_complete(telegram_id)
+        if profile is not None:
+            self._sync_telegram_language(telegram_id, profile, telegram_language)
+            return profile
         
-        if user:
-            # For existing users, check if Telegram language has changed
-            current_language = user.get('language', 'en')
-            telegram_language = getattr(telegram_user, 'language_code', None)
-            
-            # Map Telegram language codes to supported languages
-            detected_language = 'en'  # default
-            if telegram_language:
-                if telegram_language.startswith('km'):
-                    detected_language = 'kh'
-                elif telegram_language.startswith('en'):
-                    detected_language = 'en'
-            
-            print(f"DEBUG: Existing user {telegram_id} - current: {current_language}, telegram: {telegram_language}, detected: {detected_language}")
-            
-            # Update language if it has changed and is different from current
-            if detected_language != current_language:
-                print(f"DEBUG: Language mismatch detected for user {telegram_id}. Updating from {current_language} to {detected_language}")
-                updated_user = await self.update_user(telegram_id, {'language': detected_language})
-                if updated_user:
-                    return self._convert_api_user_to_local(updated_user)
-            
-            return self._convert_api_user_to_local(user)
+        # A language picked in the bot before the user record was loaded (the first-time
+        # language selection); it beats both the stored and the Telegram language
+        chosen_language = profile_store.language(telegram_id)
         
-        # User doesn't exist, create new user
-        # Use telegram user's language_code if available, otherwise default to 'en'
-        telegram_language = getattr(telegram_user, 'language_code', 'en') or 'en'
+        # Try to get existing user first (a recent 404 is remembered, so a new user goes straight to create)
+        user = await self.get_user(telegram_id)
         
-        # Map Telegram language codes to supported languages
-        user_language = 'en'  # default
-        if telegram_language.startswith('km'):
-            user_language = 'kh'
-        elif telegram_language.startswith('en'):
-            user_language = 'en'
+        if user:
+            if chosen_language and chosen_language != user.get('language'):
+                self.queue_user_update(telegram_id, {'language': chosen_language})
+            profile = self._store_profile(telegram_id, user)
+            self._sync_telegram_language(telegram_id, profile, telegram_language)
+            return profile
         
-        print(f"DEBUG: Creating new user {telegram_user.id} - telegram language: {telegram_language}, mapped to: {user_language}")
+        # User doesn't exist, create new user in the language they picked, else their Telegram app's
+        user_language = chosen_language or telegram_language or 'en'
         
         user_data = {
                 'telegramId': str(telegram_user.id),
@@ -268,38 +282,81 @@ class UserAPIService:
                 'language': user_language
             }
         
+        # A 409 that carries the existing user is used as is (one round-trip)
         created_user = await self.create_user(user_data)
         
         if created_user:
-            return self._convert_api_user_to_local(created_user)
+            profile = self._store_profile(telegram_id, created_user)
+            self._sync_telegram_language(telegram_id, profile, telegram_language)
+            return profile
         
         # If creation failed, it might be due to race condition (user created between get and create)
         # Try to get user one more time
+        update_scope.forget(('user', telegram_id))
         user = await self.get_user(telegram_id)
         if user:
-            return self._convert_api_user_to_local(user)
+            if chosen_language and chosen_language != user.get('language'):
+                self.queue_user_update(telegram_id, {'language': chosen_language})
+            profile = self._store_profile(telegram_id, user)
+            self._sync_telegram_language(telegram_id, profile, telegram_language)
+            return profile
         
         # Fallback to local user if API fails completely
-        # Use telegram user's language_code if available, otherwise default to 'en'
-        telegram_language = getattr(telegram_user, 'language_code', 'en') or 'en'
-        
-        # Map Telegram language codes to supported languages
-        fallback_language = 'en'  # default
-        if telegram_language.startswith('km'):
-            fallback_language = 'kh'
-        elif telegram_language.startswith('en'):
-            fallback_language = 'en'
-        
-        print(f"DEBUG: Fallback user {telegram_id} - telegram language: {telegram_language}, mapped to: {fallback_language}")
+        fallback_language = user_language
         
-        return {
+        return profile_store.put(telegram_id, {
             'telegram_id': telegram_id,
             'first_name': telegram_user.first_name or '',
             'last_name': telegram_user.last_name or '',
             'username': telegram_user.username or '',
             'language': fallback_language,
+            'telegram_language': telegram_language,
             'source': 'local_fallback'
-        }
+        })
+    
+    @staticmethod
+    def _map_telegram_language(language_code: Optional[str]) -> Optional[str]:
+        """Map a Telegram language code to a supported language (None when Telegram sent none)"""
+        if not language_code:
+            return None
+        return 'kh' if language_code.startswith('km') else 'en'
+    
+    def _sync_telegram_language(self, telegram_id: int, profile: Dict, telegram_language: Optional[str]) -> None:
+        """Follow a change of the user's Telegram app language, without undoing a choice made in the bot.
+
+        The stored language is only updated when the Telegram language differs from the
+        one seen at the last sync; a stored language that merely differs from Telegram's
+        was picked deliberately (or predates this session) and is left alone.
+
+        The last seen Telegram language lives only in the in-memory profile: the API has
+        no field for it. After a restart or once the profile is evicted or expires there
+        is no baseline, so the next sighting only records one and a Telegram language
+        change made in the meantime is not followed. That errs towards keeping the
+        stored language, which is never overwritten blindly.
+        """
+        if not telegram_language:
+            return
+        last_seen = profile.get('telegram_language')
+        profile['telegram_language'] = telegram_language
+        if last_seen is None or last_seen == telegram_language or profile.get('language') == telegram_language:
+            return
+        
+        self.queue_user_update(telegram_id, {'language': telegram_language})
+    
+    def remember_profile(self, telegram_id: int, api_user: Dict) -> Dict:
+        """Keep a user record fetched from the API as the user's profile; returns the profile"""
+        return self._store_profile(telegram_id, api_user)
+    
+    def _store_profile(self, telegram_id: int, api_user: Dict, sent: Optional[Dict] = None) -> Dict:
+        """Merge an API user (plus the fields just written, if any) into the user's profile"""
+        profile = self._convert_api_user_to_local(api_user)
+        # The API may not echo every field back (e.g. a cleared location), and
+        # changes still waiting in the write-behind queue are newer than its answer
+        sent = {**(sent or {}), **(profile_writer.pending(telegram_id) or {})}
+        for field in ('language', 'latitude', 'longitude'):
+            if field in sent:
+                profile[field] = sent[field]
+        return profile_store.put(telegram_id, profile)
     
     def _convert_api_user_to_local(self, api_user: Dict) -> Dict:
         """Convert API user format to local format"""
@@ -323,9 +380,7 @@ class UserAPIService:
         # The language should be properly set through user settings or API
         language = api_user.get('language', 'en')
         
-        print(f"DEBUG: Converting API user data - telegramId: {api_user.get('telegramId')}, language: {language}")
-        
-        return {
+        local_user = {
             'telegram_id': telegram_id,
             'first_name': first_name,
             'last_name': last_name,
@@ -336,6 +391,12 @@ class UserAPIService:
             'updated_at': api_user.get('updatedAt'),
             'source': 'api'
         }
+        
+        # Only when the API sent them, so a missing location is not mistaken for "no location"
+        if 'latitude' in api_user:
+            local_user['latitude'] = api_user.get('latitude')
+            local_user['longitude'] = api_user.get('longitude')
+        return local_user
 
 # Global instance
 user_api_service = UserAPIService()
\ No newline at end of file
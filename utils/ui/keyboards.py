@@ -6,7 +6,7 @@ from models.core.product import Product  # Changed from Car
 from utils.ui.language import language_handler
 from utils.services.data_loader import car_data_loader
 from utils.services.charging_station_service import charging_station_service
-from utils.services.accessory_service import AccessoryService
+from utils.services.accessory_service import accessory_service
 
 class Keyboards:
     # Class variable to track the current page/offset
@@ -436,6 +436,14 @@ class Keyboards:
             [InlineKeyboardButton(language_handler.get_text("back_to_menu", telegram_id), callback_data="back_to_main")]
         ])
 
+    @staticmethod
+    def get_catalog_warming_keyboard(telegram_id: int, retry_callback: str) -> InlineKeyboardMarkup:
+        """Keyboard shown while the catalog is still loading; retry repeats the original action"""
+        return InlineKeyboardMarkup([
+            [InlineKeyboardButton(language_handler.get_text("refresh", telegram_id), callback_data=retry_callback)],
+            [InlineKeyboardButton(language_handler.get_text("back_to_menu", telegram_id), callback_data="back_to_main")]
+        ])
+
     @staticmethod
     def accessory_type_selection_keyboard(telegram_id: int, accessory_types: List[str]) -> InlineKeyboardMarkup:
         """Create keyboard for accessory type selection"""
@@ -507,7 +515,7 @@ class Keyboards:
         """Create location keyboard for accessory search using API data"""
         try:
             # Get unique locations from accessory API data
-            service = AccessoryService()
+            service = accessory_service
             locations = await service.get_unique_locations()
             
             # Create buttons for locations (2 per row)
@@ -545,7 +553,7 @@ class Keyboards:
         """Create category keyboard for accessory search using API data"""
         try:
             # Get unique categories from accessory API data
-            service = AccessoryService()
+            service = accessory_service
             categories = await service.get_unique_types()
             
             # Create buttons for categories (2 per row)
@@ -1,8 +1,8 @@
 from typing import Dict, Any
+from utils.services.profile_store import profile_store
 
 class LanguageHandler:
     def __init__(self):
-        self.user_languages = {}
         self.translations = {
             "en": {
                 # Main Menu
@@ -293,6 +293,7 @@ class LanguageHandler:
                 # Car-related translations
                 "loading_cars": "Loading available cars... 🚗",
                 "no_cars_available": "No cars available at the moment. We'll notify you when new cars are added! 🔔",
+                "catalog_warming_up": "⏳ We're still loading the latest car listings. Please try again in a few seconds!",
                 "select_car_brand": "Select a car brand to view available cars:",
                 "loading_brand_cars": "Loading {brand} cars... 🚗",
                 "no_brand_cars": "No {brand} cars available at the moment. 😔\n\nWe'll notify you when new cars are added!",
@@ -895,6 +896,7 @@ class LanguageHandler:
                 # Car-related translations
                 "loading_cars": "កំពុងផ្ទុករថយន្តដែលមាន... 🚗",
                 "no_cars_available": "មិនមានរថយន្តនៅពេលនេះទេ។ យើងនឹងជូនដំណឹងអ្នកនៅពេលមានរថយន្តថ្មី! 🔔",
+                "catalog_warming_up": "⏳ យើងកំពុងផ្ទុកបញ្ជីរថយន្តចុងក្រោយ។ សូមព្យាយាមម្តងទៀតក្នុងរយៈពេលប៉ុន្មានវិនាទីទៀត!",
                 "select_car_brand": "ជ្រើសរើសម៉ាករថយន្តដើម្បីមើលរថយន្តដែលមាន:",
                 "loading_brand_cars": "កំពុងផ្ទុករថយន្ត {brand}... 🚗",
                 "no_brand_cars": "មិនមានរថយន្ត {brand} នៅពេលនេះទេ។ 😔\n\nយើងនឹងជូនដំណឹងអ្នកនៅពេលមានរថយន្តថ្មី!",
@@ -1221,57 +1223,44 @@ class LanguageHandler:
 
     
     def get_user_language(self, telegram_id: int) -> str:
-        """Get user's preferred language from cache, API or fallback to local data"""
-        # Check if language is already cached
-        if telegram_id in self.user_languages:
-            return self.user_languages[telegram_id]
+        """Get user's preferred language from their profile; never touches the network.
+
+        The API lookup happens once per user in resolve_user_language(), which the
+        resolve_update_language pre-handler awaits before any feature handler runs.
+        """
+        language = profile_store.language(telegram_id)
+        if language:
+            return language
+        
+        # The user record may already have been fetched while handling this update
+        from utils.services import update_scope
+        scoped_user = update_scope.peek(('user', telegram_id))
+        if scoped_user and scoped_user.get('language'):
+            profile_store.update(telegram_id, language=scoped_user['language'])
+            return scoped_user['language']
         
-        try:
-            import requests
-            from utils.config.settings import API_BASE_URL
-            
-            api_url = f"{API_BASE_URL}/User/GetTelegramUser/{telegram_id}"
-            
-            response = requests.get(api_url, timeout=5)
-            if response.status_code == 200:
-                user_data = response.json()
-                language = user_data.get('language', 'en')
-                # Cache the language to avoid future API calls
-                self.user_languages[telegram_id] = language
-                return language
-                
-        except Exception as e:
-            pass
+        # Not known yet (not stored, so the API answer wins once it is known)
+        return "en"
+    
+    async def resolve_user_language(self, telegram_id: int) -> str:
+        """Load the user's profile from the API once so get_text can read the language from memory"""
+        language = profile_store.language(telegram_id)
+        if language:
+            return language
         
-        # Fallback to local data if API fails
-        from models.core.user import users
-        user = next((user for user in users if user.telegram_id == telegram_id), None)
-        fallback_language = user.language if user else "en"
-        # Cache the fallback language
-        self.user_languages[telegram_id] = fallback_language
-        return fallback_language
+        # Shares the update's user lookup with the handlers (see update_scope)
+        from utils.services.user_api_service import user_api_service
+        api_user = await user_api_service.get_user(telegram_id)
+        if api_user:
+            # Keep the whole record so later get_or_create_user calls need no request
+            user_api_service.remember_profile(telegram_id, api_user)
+        return self.get_user_language(telegram_id)
     
     def set_user_language(self, telegram_id: int, lang_code: str) -> None:
         """Set user's language preference"""
         if lang_code not in self.translations:
             return
-            
-        # Update the cache with new language
-        self.user_languages[telegram_id] = lang_code
-            
-        try:
-            from handlers.base import user_cache
-            if telegram_id in user_cache:
-                user_cache[telegram_id]['language'] = lang_code
-                # Language updated in memory cache only
-        except ImportError:
-            pass
-        
-        # Also update old method for backward compatibility
-        from models.core.user import users
-        user = next((user for user in users if user.telegram_id == telegram_id), None)
-        if user:
-            user.language = lang_code
+        profile_store.update(telegram_id, language=lang_code)
     
 
     
@@ -1299,6 +1288,12 @@ class LanguageHandler:
 # Create a global instance
 language_handler = LanguageHandler()
 
+async def resolve_update_language(update, context) -> None:
+    """Pre-handler: resolve the sender's language before the feature handlers call get_text"""
+    user = getattr(update, 'effective_user', None)
+    if user is not None:
+        await language_handler.resolve_user_language(user.id)
+
 
 
 